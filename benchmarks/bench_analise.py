@@ -0,0 +1,35 @@
+"""
+Curva de inscrições de um evento grande: agregação ao vivo com TruncHour sobre
+todas as inscrições versus InscricoesHora consolidado + horas recentes.
+
+    python -m benchmarks.bench_analise --inscricoes 100000
+"""
+import argparse
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inscricoes', type=int, default=100_000)
+    parser.add_argument('--repeticoes', type=int, default=20)
+    args = parser.parse_args()
+
+    configurar()
+    from eventos.analise import consolidar, serie_inscricoes
+    from eventos.models import Evento
+    from eventos.semeadura import semear
+
+    with banco_temporario():
+        semear(eventos=1, inscricoes=args.inscricoes, passados=0)
+        evento = Evento.objects.get()
+        print(f"1 evento com {args.inscricoes} inscrições")
+        for intervalo in ('hora', 'dia'):
+            imprimir(f"ao vivo ({intervalo})", medir(lambda: serie_inscricoes(evento, intervalo), args.repeticoes, 1))
+        print(f"consolidar(): {consolidar()} horas")
+        for intervalo in ('hora', 'dia'):
+            imprimir(f"consolidado ({intervalo})", medir(lambda: serie_inscricoes(evento, intervalo), args.repeticoes, 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Capacidade sob conexões simultâneas: deploy síncrono (WSGIHandler com as views
+de sempre, limitado a --workers requisições por vez, como os workers sync do
+gunicorn) contra o assíncrono (ASGIHandler com as views de EVENTOS_VIEWS_ASYNC
+num único event loop, como um worker uvicorn).
+
+--clientes conexões disparam requisições sem parar até completar --requisicoes;
+cada consulta SQL espera --latencia-ms a mais, simulando a ida e volta ao banco
+de produção (o SQLite local responde rápido demais para mostrar a diferença).
+A latência inclui a espera por um worker livre.
+
+    python -m benchmarks.bench_asgi --clientes 50 --workers 4 --latencia-ms 5
+"""
+import argparse
+import asyncio
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, percentil
+
+
+def _resumo(amostras, total):
+    return {
+        'requisicoes': len(amostras),
+        'p50_ms': percentil(amostras, 50),
+        'p95_ms': percentil(amostras, 95),
+        'por_segundo': len(amostras) / total,
+    }
+
+
+def rodar_wsgi(caminho, clientes, workers, requisicoes):
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test import RequestFactory
+
+    handler = WSGIHandler()
+    fabrica = RequestFactory()
+    vagas = threading.Semaphore(workers)
+
+    def requisicao(_):
+        environ = fabrica.get(caminho).environ
+        t0 = time.perf_counter()
+        with vagas:
+            status = []
+            resposta = handler(environ, lambda s, h, *a: status.append(s))
+            for _ in resposta:
+                pass
+            resposta.close()
+        assert status[0].startswith('200'), status
+        return (time.perf_counter() - t0) * 1000
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clientes) as pool:
+        amostras = list(pool.map(requisicao, range(requisicoes)))
+    return _resumo(amostras, time.perf_counter() - inicio)
+
+
+async def _chamar_asgi(app, caminho):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': caminho, 'raw_path': caminho.encode(), 'query_string': b'',
+        'root_path': '', 'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+    }
+    concluida = asyncio.Event()
+    corpo_enviado = False
+    status = []
+
+    async def receive():
+        nonlocal corpo_enviado
+        if not corpo_enviado:
+            corpo_enviado = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # O handler fica ouvindo um disconnect enquanto a view roda.
+        await concluida.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(mensagem):
+        if mensagem['type'] == 'http.response.start':
+            status.append(mensagem['status'])
+        elif not mensagem.get('more_body'):
+            concluida.set()
+
+    await app(scope, receive, send)
+    assert status == [200], status
+
+
+def rodar_asgi(caminho, clientes, requisicoes):
+    from django.core.handlers.asgi import ASGIHandler
+
+    app = ASGIHandler()
+    amostras = []
+
+    async def cliente(fila):
+        while fila:
+            fila.pop()
+            t0 = time.perf_counter()
+            await _chamar_asgi(app, caminho)
+            amostras.append((time.perf_counter() - t0) * 1000)
+
+    async def principal():
+        fila = list(range(requisicoes))
+        await asyncio.gather(*(cliente(fila) for _ in range(clientes)))
+
+    inicio = time.perf_counter()
+    asyncio.run(principal())
+    return _resumo(amostras, time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clientes', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requisicoes', type=int, default=1000)
+    parser.add_argument('--latencia-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    configurar()
+    import logging
+
+    from django.db.backends.signals import connection_created
+    from django.test import override_settings
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from eventos import urls
+    from eventos.models import Evento
+    from eventos.semeadura import semear
+
+    logging.getLogger('eventos.perf').setLevel(logging.ERROR)
+
+    def atrasar(execute, sql, params, many, context):
+        time.sleep(args.latencia_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def com_latencia(sender, connection, **kwargs):
+        # No início da lista: a conexão costuma abrir dentro do execute_wrapper()
+        # do InstrumentacaoMiddleware, que ao sair retira o último da lista.
+        connection.execute_wrappers.insert(0, atrasar)
+
+    assincronas = types.ModuleType('urls_assincronas')
+    assincronas.urlpatterns = urls.com_views_assincronas(urls.urlpatterns)
+
+    with banco_temporario():
+        semear(eventos=200, inscricoes=2000, passados=0)
+        evento = Evento.objects.create(
+            titulo="Evento aberto", tipo='PALESTRA', data=timezone.now() + timezone.timedelta(days=30),
+            local="Auditório", descricao="Benchmark", capacidade=10 ** 6,
+        )
+        connection_created.connect(com_latencia)
+        paginas = [
+            ('inscrição (GET)', reverse('evento-inscricao', args=[evento.pk]), {}),
+            # Sem cache da página: cada requisição consulta o banco.
+            ('listagem sem cache', reverse('evento-list'), {'EVENTOS_CACHE_SEGUNDOS': 0}),
+        ]
+        print(f"{args.clientes} clientes, {args.requisicoes} requisições, +{args.latencia_ms} ms por consulta")
+        for nome, caminho, ajustes in paginas:
+            with override_settings(**ajustes):
+                imprimir(f"{nome}: wsgi, {args.workers} workers",
+                         rodar_wsgi(caminho, args.clientes, args.workers, args.requisicoes))
+                with override_settings(ROOT_URLCONF=assincronas):
+                    imprimir(f"{nome}: asgi, 1 event loop", rodar_asgi(caminho, args.clientes, args.requisicoes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Check-in na entrada: latência de uma leitura (UPDATE condicional) e de lotes
+de sincronização offline, direto na função e pelo endpoint JSON (com sessão).
+A meta é p99 abaixo de 20 ms por leitura.
+
+    python -m benchmarks.bench_checkin --inscricoes 20000
+"""
+import argparse
+import itertools
+import json
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inscricoes', type=int, default=20_000)
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    parser.add_argument('--lote', type=int, default=200)
+    args = parser.parse_args()
+
+    configurar()
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.urls import reverse
+
+    from eventos.checkin import registrar_check_in, registrar_lote
+    from eventos.models import Evento, Inscricao
+    from eventos.semeadura import semear
+
+    with banco_temporario():
+        semear(eventos=1, inscricoes=args.inscricoes, passados=0)
+        evento = Evento.objects.get()
+        tokens = [i.token for i in Inscricao.objects.filter(evento=evento).only('pk', 'evento_id')]
+        print(f"1 evento com {len(tokens)} inscrições")
+
+        leituras = itertools.cycle(tokens)
+        imprimir("registrar_check_in()", medir(lambda: registrar_check_in(evento.pk, next(leituras)), args.repeticoes))
+
+        cliente = Client()
+        cliente.force_login(User.objects.create_user('porteiro', password='x'))
+        url = reverse('evento-check-in', args=[evento.pk])
+        imprimir("POST check-in", medir(lambda: cliente.post(
+            url, json.dumps({'token': next(leituras)}), content_type='application/json',
+        ), args.repeticoes))
+
+        lotes = itertools.cycle([tokens[i:i + args.lote] for i in range(0, len(tokens), args.lote)])
+        imprimir(f"registrar_lote() x{args.lote}", medir(
+            lambda: registrar_lote(evento.pk, [(token, None) for token in next(lotes)]), 50, 2,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Latência por requisição com e sem conexões persistentes (DB_CONN_MAX_AGE,
+DB_CONN_HEALTH_CHECKS). As requisições passam pelo WSGIHandler, que fecha ou
+reaproveita a conexão ao fim de cada uma como em produção (o Client de teste
+não faz isso).
+
+Com SQLite, abrir uma conexão é quase de graça: --conexao-ms soma esse tempo a
+cada conexão aberta, simulando o handshake TCP + TLS + autenticação de um
+Postgres remoto. Contra um Postgres de verdade (DB_ENGINE=postgresql) use
+--conexao-ms 0; com DB_POOL=True mede-se o pool do psycopg no lugar das
+variações de CONN_MAX_AGE.
+
+    python -m benchmarks.bench_conexoes --repeticoes 300 --conexao-ms 20
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+VARIACOES = [
+    ('sem conexões persistentes', 0, False),
+    ('CONN_MAX_AGE=60', 60, False),
+    ('CONN_MAX_AGE=60 + health checks', 60, True),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticoes', type=int, default=300)
+    parser.add_argument('--conexao-ms', type=float, default=20.0)
+    args = parser.parse_args()
+
+    configurar()
+    import logging
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+    from django.test import RequestFactory, override_settings
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from eventos.models import Evento
+    from eventos.semeadura import semear
+
+    logging.getLogger('eventos.perf').setLevel(logging.ERROR)
+    pool = 'pool' in connection.settings_dict.get('OPTIONS', {})
+    conexoes = []
+
+    def handshake(sender, connection, **kwargs):
+        conexoes.append(1)
+        if not pool:
+            time.sleep(args.conexao_ms / 1000)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        if connection.vendor == 'sqlite':
+            # Em memória o SQLite de teste nunca fecha a conexão; em arquivo ela fecha de verdade.
+            connection.settings_dict['TEST']['NAME'] = str(Path(pasta) / 'bench.sqlite3')
+        with banco_temporario():
+            semear(eventos=50, inscricoes=500, passados=0)
+            evento = Evento.objects.create(
+                titulo="Evento aberto", tipo='PALESTRA', data=timezone.now() + timezone.timedelta(days=30),
+                local="Auditório", descricao="Benchmark", capacidade=10 ** 6,
+            )
+            handler = WSGIHandler()
+            fabrica = RequestFactory()
+
+            def pedir(caminho):
+                resposta = handler(fabrica.get(caminho).environ, lambda *a: None)
+                for _ in resposta:
+                    pass
+                resposta.close()
+
+            paginas = [
+                ('inscrição (GET)', reverse('evento-inscricao', args=[evento.pk]), {}),
+                ('listagem sem cache', reverse('evento-list'), {'EVENTOS_CACHE_SEGUNDOS': 0}),
+            ]
+            variacoes = [('pool psycopg', 0, connection.settings_dict['CONN_HEALTH_CHECKS'])] if pool else VARIACOES
+            connection_created.connect(handshake)
+            try:
+                for nome, caminho, ajustes in paginas:
+                    with override_settings(**ajustes):
+                        for variacao, max_age, health_checks in variacoes:
+                            connection.close()
+                            connection.settings_dict['CONN_MAX_AGE'] = max_age
+                            connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+                            conexoes.clear()
+                            resultado = medir(lambda: pedir(caminho), args.repeticoes)
+                            resultado['conexoes'] = len(conexoes)
+                            imprimir(f"{nome}: {variacao}", resultado)
+            finally:
+                connection_created.disconnect(handshake)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Latência do POST de inscrição e vazão do worker da fila de e-mails.
+
+Compara o envio síncrono (como era feito dentro da requisição) com o
+enfileiramento, usando o backend locmem com uma latência SMTP simulada.
+
+    python -m benchmarks.bench_emails --latencia-smtp 300
+"""
+import argparse
+import time
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inscricoes', type=int, default=200)
+    parser.add_argument('--latencia-smtp', type=float, default=0.0,
+                        help="Milissegundos simulados por conexão e por mensagem SMTP.")
+    args = parser.parse_args()
+
+    configurar()
+
+    from django.core import mail
+    from django.core.mail import EmailMultiAlternatives
+    from django.core.mail.backends.locmem import EmailBackend
+    from django.test import Client
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from eventos.emails import processar_fila
+    from eventos.models import EmailPendente, Evento
+
+    atraso = args.latencia_smtp / 1000
+
+    class BackendLento(EmailBackend):
+        def open(self):
+            time.sleep(atraso)
+            return super().open()
+
+        def send_messages(self, messages):
+            time.sleep(atraso * len(messages))
+            return super().send_messages(messages)
+
+    with banco_temporario():
+        evento = Evento.objects.create(
+            titulo="Benchmark", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Benchmark de e-mail", capacidade=args.inscricoes * 10,
+        )
+        url = reverse('evento-inscricao', args=[evento.pk])
+        client = Client()
+        contador = iter(range(10 ** 9))
+
+        def inscrever():
+            n = next(contador)
+            client.post(url, {
+                'nome': f'Participante {n}', 'email': f'p{n}@example.com',
+                'telefone': '11999990000', 'assistencia': 'NENHUMA',
+            })
+
+        def envio_sincrono():
+            msg = EmailMultiAlternatives("Assunto", "Corpo", to=["x@example.com"], connection=BackendLento())
+            msg.attach_alternative("<p>Corpo</p>", "text/html")
+            msg.send()
+
+        r_post = medir(inscrever, repeticoes=args.inscricoes)
+        imprimir("POST inscrição (apenas enfileira)", r_post)
+
+        r_sinc = medir(envio_sincrono, repeticoes=min(args.inscricoes, 50), aquecimento=0)
+        imprimir("envio SMTP síncrono (custo evitado)", r_sinc)
+        imprimir("POST estimado com envio síncrono", {
+            'media_ms': r_post['media_ms'] + r_sinc['media_ms'],
+        })
+
+        pendentes = EmailPendente.objects.filter(status='PENDENTE').count()
+        mail.outbox = []
+        inicio = time.perf_counter()
+        while processar_fila(lote=100, connection=BackendLento())[0]:
+            pass
+        duracao = time.perf_counter() - inicio
+        imprimir("worker processar_fila (lote=100)", {
+            'emails': pendentes,
+            'segundos': duracao,
+            'por_segundo': pendentes / duracao if duracao else 0.0,
+        })
+
+
+if __name__ == '__main__':
+    main()
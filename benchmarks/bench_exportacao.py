@@ -0,0 +1,81 @@
+"""
+Memória e tempo da exportação CSV: buffer com instâncias (implementação
+anterior) versus streaming sobre values_list().iterator().
+
+    python -m benchmarks.bench_exportacao --inscricoes 100000
+"""
+import argparse
+import csv
+import time
+import tracemalloc
+
+from benchmarks.comum import banco_temporario, configurar, imprimir
+
+
+def exportar_com_buffer(qs):
+    from django.http import HttpResponse
+    from django.utils.encoding import smart_str
+
+    response = HttpResponse(content_type='text/csv')
+    writer = csv.writer(response)
+    writer.writerow(['Evento', 'Data/Hora', 'Participante', 'Email', 'Telefone', 'Observações', 'Data inscrição'])
+    for ins in qs.select_related('evento', 'participante'):
+        p = ins.participante
+        writer.writerow([
+            smart_str(ins.evento.titulo),
+            ins.evento.data.strftime('%d/%m/%Y %H:%M'),
+            smart_str(p.nome),
+            p.email,
+            smart_str(p.telefone),
+            smart_str(getattr(p, 'assistencia_detalhes', '') or ''),
+            ins.data_inscricao.strftime('%d/%m/%Y %H:%M'),
+        ])
+    return [response.content]
+
+
+def exportar_em_streaming(qs):
+    from eventos.exportacao import resposta_csv
+
+    response = resposta_csv(qs, 'bench.csv')
+    primeiro = None
+    for chunk in response.streaming_content:
+        if primeiro is None:
+            primeiro = time.perf_counter()
+    return primeiro
+
+
+def medir_exportacao(nome, fn, qs):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    retorno = fn(qs)
+    fim = time.perf_counter()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    primeiro_byte = (retorno - inicio) if isinstance(retorno, float) else (fim - inicio)
+    imprimir(nome, {
+        'segundos': fim - inicio,
+        'primeiro_byte_ms': primeiro_byte * 1000,
+        'pico_mb': pico / 1024 / 1024,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inscricoes', type=int, default=100_000)
+    parser.add_argument('--eventos', type=int, default=50)
+    args = parser.parse_args()
+
+    configurar()
+    from eventos.models import Inscricao
+    from eventos.semeadura import semear
+
+    with banco_temporario():
+        semear(eventos=args.eventos, inscricoes=args.inscricoes)
+        qs = Inscricao.objects.order_by('-data_inscricao')
+        print(f"{args.inscricoes} inscrições em {args.eventos} eventos")
+        medir_exportacao("buffer + instâncias (anterior)", exportar_com_buffer, qs)
+        medir_exportacao("streaming + values_list", exportar_em_streaming, qs)
+
+
+if __name__ == '__main__':
+    main()
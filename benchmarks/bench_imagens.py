@@ -0,0 +1,79 @@
+"""
+Custo das imagens dos eventos:
+
+- na requisição do formulário: gravar o upload em staging (receber_upload)
+  comparado a gerar as variantes ali mesmo (trabalho que agora é do worker,
+  sem contar o envio ao storage remoto);
+- na renderização do card: srcset montado pelo Cloudinary a cada render
+  (imagem legada) comparado às URLs já guardadas em imagem_variantes.
+
+    python -m benchmarks.bench_imagens --repeticoes 200
+"""
+import argparse
+import io
+import shutil
+import tempfile
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=200)
+    parser.add_argument('--largura', type=int, default=3000, help="Largura da imagem enviada (px).")
+    args = parser.parse_args()
+
+    configurar()
+    from django.conf import settings
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.test import override_settings
+    from django.utils import timezone
+    from PIL import Image
+
+    from eventos.imagens import gerar_variantes, processar_imagens, receber_upload
+    from eventos.models import Evento
+    from eventos.templatetags.eventos_imagens import imagem_card
+
+    saida = io.BytesIO()
+    Image.effect_mandelbrot((args.largura, args.largura * 2 // 3), (-2, -1, 1, 1), 100).convert('RGB').save(
+        saida, 'JPEG', quality=90,
+    )
+    original = saida.getvalue()
+    raiz = tempfile.mkdtemp()
+    armazenamento = override_settings(
+        IMAGENS_STAGING_ROOT=f'{raiz}/staging',
+        STORAGES={**settings.STORAGES, 'imagens': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+            'OPTIONS': {'location': f'{raiz}/publicadas', 'base_url': '/media/imagens/'},
+        }},
+    )
+
+    try:
+        with banco_temporario(), armazenamento:
+            evento = Evento.objects.create(
+                titulo="Benchmark", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+                descricao="Descrição", capacidade=10, imagem='eventos/capa.jpg',
+            )
+            print(f"upload de {len(original) // 1024} KiB ({args.largura} px de largura)")
+            imprimir("requisição: receber_upload (staging)", medir(
+                lambda: receber_upload(evento, SimpleUploadedFile('capa.jpg', original)), args.repeticoes,
+            ))
+            imprimir("requisição: gerar variantes na hora", medir(
+                lambda: gerar_variantes(io.BytesIO(original)), max(args.repeticoes // 10, 5),
+            ))
+
+            legado = Evento.objects.get(pk=evento.pk)
+            imprimir("card: URLs montadas a cada render", medir(
+                lambda: imagem_card(legado, 'Benchmark'), args.repeticoes * 10,
+            ))
+            processar_imagens()
+            publicado = Evento.objects.get(pk=evento.pk)
+            imprimir("card: URLs guardadas em imagem_variantes", medir(
+                lambda: imagem_card(publicado, 'Benchmark'), args.repeticoes * 10,
+            ))
+    finally:
+        shutil.rmtree(raiz, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Importação de um CSV grande de inscrições (eventos.importacao).
+
+    python -m benchmarks.bench_importacao --linhas 100000
+"""
+import argparse
+import io
+import time
+
+from benchmarks.comum import banco_temporario, configurar, imprimir
+
+
+def gerar_csv(linhas, repetidos=0.05):
+    buffer = io.StringIO()
+    buffer.write("nome,email,telefone,assistencia,assistencia_detalhes\n")
+    for n in range(linhas):
+        # Uma fração dos e-mails repete com outra caixa, para exercitar a deduplicação.
+        email = f"PESSOA{n - 1}@EXAMPLE.COM" if n and n % int(1 / repetidos) == 0 else f"pessoa{n}@example.com"
+        buffer.write(f"Pessoa {n},{email},(11) 9{n:08d},NENHUMA,\n")
+    buffer.seek(0)
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--lote', type=int, default=2000)
+    args = parser.parse_args()
+
+    configurar()
+    from django.utils import timezone
+
+    from eventos.importacao import importar_inscricoes
+    from eventos.models import Evento
+
+    with banco_temporario():
+        evento = Evento.objects.create(
+            titulo="Evento grande", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Benchmark", capacidade=args.linhas,
+        )
+        arquivo = gerar_csv(args.linhas)
+        inicio = time.perf_counter()
+        resultado = importar_inscricoes(evento, arquivo, lote=args.lote)
+        duracao = time.perf_counter() - inicio
+        imprimir(f"importar {args.linhas} linhas", {
+            'segundos': duracao,
+            'linhas_por_segundo': args.linhas / duracao,
+            'inscricoes': resultado.inscricoes_criadas,
+            'erros': len(resultado.erros),
+        })
+
+
+if __name__ == '__main__':
+    main()
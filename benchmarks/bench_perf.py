@@ -0,0 +1,43 @@
+"""
+Custo da instrumentação por requisição (eventos.perf): a mesma página com e
+sem InstrumentacaoMiddleware no MIDDLEWARE, e a geração do texto de /metrics.
+
+    python -m benchmarks.bench_perf --repeticoes 500
+"""
+import argparse
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=500)
+    parser.add_argument('--eventos', type=int, default=50)
+    args = parser.parse_args()
+
+    configurar()
+    from django.contrib.auth.models import User
+    from django.test import Client, modify_settings
+    from django.urls import reverse
+
+    from eventos import perf
+    from eventos.models import Evento
+    from eventos.semeadura import semear
+
+    with banco_temporario():
+        semear(eventos=args.eventos, inscricoes=args.eventos * 20, passados=0)
+        evento = Evento.objects.first()
+        cliente = Client()
+        cliente.force_login(User.objects.create_user('org', password='x'))
+        paginas = [('lista pública', reverse('evento-list')), ('inscritos', reverse('evento-inscritos', args=[evento.pk]))]
+
+        for nome, url in paginas:
+            imprimir(f"{nome}: com instrumentação", medir(lambda: cliente.get(url), args.repeticoes))
+            with modify_settings(MIDDLEWARE={'remove': 'eventos.perf.InstrumentacaoMiddleware'}):
+                imprimir(f"{nome}: sem instrumentação", medir(lambda: cliente.get(url), args.repeticoes))
+
+        imprimir("texto de /metrics", medir(perf.metricas.texto, args.repeticoes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Lista de presença offline: tempo e tamanho da lista completa (gzip) de um
+evento grande versus o delta com as inscrições recentes.
+
+    python -m benchmarks.bench_presenca --inscricoes 20000 --novas 200
+"""
+import argparse
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--inscricoes', type=int, default=20_000)
+    parser.add_argument('--novas', type=int, default=200)
+    parser.add_argument('--repeticoes', type=int, default=10)
+    args = parser.parse_args()
+
+    configurar()
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from eventos.models import Evento, Inscricao
+    from eventos.presenca import compactar, montar_lista
+    from eventos.semeadura import semear
+
+    with banco_temporario():
+        semear(eventos=1, inscricoes=args.inscricoes, passados=0)
+        evento = Evento.objects.get()
+        # As inscrições semeadas ficam "antigas"; as últimas `novas` entram no delta.
+        Inscricao.objects.update(data_inscricao=timezone.now() - timedelta(days=1))
+        recentes = Inscricao.objects.order_by('-pk').values_list('pk', flat=True)[:args.novas]
+        Inscricao.objects.filter(pk__in=list(recentes)).update(data_inscricao=timezone.now())
+        versao = montar_lista(evento.pk)['versao'] - 60 * 1_000_000
+
+        completa = montar_lista(evento.pk)
+        delta = montar_lista(evento.pk, versao)
+        print(f"lista completa: {len(completa['linhas'])} linhas, {len(compactar(completa)) / 1024:.0f} KiB gzip")
+        print(f"delta: {len(delta['linhas'])} linhas, {len(compactar(delta)) / 1024:.1f} KiB gzip")
+        imprimir("completa + gzip", medir(lambda: compactar(montar_lista(evento.pk)), args.repeticoes, 1))
+        imprimir("delta + gzip", medir(lambda: compactar(montar_lista(evento.pk, versao)), args.repeticoes, 1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Custo de renderizar o HTML do e-mail de ingresso, por e-mail:
+
+- sem cache de templates (o arquivo é lido e compilado a cada e-mail);
+- render_to_string completo com o cached.Loader (como era antes);
+- parte do evento em cache + marcadores do participante (html_ingresso).
+
+    python -m benchmarks.bench_templates --repeticoes 2000
+"""
+import argparse
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    args = parser.parse_args()
+
+    configurar()
+    from django.template.backends.django import DjangoTemplates
+    from django.template.loader import render_to_string
+    from django.utils import timezone
+
+    from eventos.emails import html_ingresso
+    from eventos.models import Evento, Inscricao, Participante
+
+    sem_cache = DjangoTemplates({
+        'NAME': 'sem_cache', 'DIRS': [], 'APP_DIRS': False,
+        'OPTIONS': {'loaders': ['django.template.loaders.app_directories.Loader']},
+    })
+
+    with banco_temporario():
+        evento = Evento.objects.create(
+            titulo="Benchmark", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Descrição longa do evento " * 20, capacidade=10,
+        )
+        inscricao = Inscricao.objects.create(
+            evento=evento,
+            participante=Participante.objects.create(nome="Ana", email="ana@example.com", telefone="1"),
+        )
+        contexto = {'evento': evento, 'participante': inscricao.participante, 'url_ingresso': '/ingresso/x/'}
+
+        imprimir("sem cache de templates", medir(
+            lambda: sem_cache.get_template('eventos/ingresso_email.html').render(contexto), args.repeticoes,
+        ))
+        imprimir("render_to_string (cached.Loader)", medir(
+            lambda: render_to_string('eventos/ingresso_email.html', contexto), args.repeticoes,
+        ))
+        imprimir("html_ingresso (evento em cache)", medir(
+            lambda: html_ingresso(inscricao, '/ingresso/x/'), args.repeticoes,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Cada módulo `benchmarks/bench_*.py` é executável com `python -m benchmarks.<nome>`
+a partir da raiz do projeto e roda contra um banco de teste descartável criado a
+partir das configurações em `config.settings` (SQLite ou PostgreSQL, conforme
+as variáveis DB_*).
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def configurar():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+@contextmanager
+def banco_temporario(verbosity=0):
+    from django.test.utils import (
+        setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+    )
+    setup_test_environment()
+    antigos = setup_databases(verbosity=verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(antigos, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    k = (len(ordenados) - 1) * p / 100
+    i = int(k)
+    j = min(i + 1, len(ordenados) - 1)
+    return ordenados[i] + (ordenados[j] - ordenados[i]) * (k - i)
+
+
+def medir(fn, repeticoes=100, aquecimento=5):
+    """Executa `fn` repetidas vezes e devolve as latências (ms) resumidas."""
+    for _ in range(aquecimento):
+        fn()
+    amostras = []
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        amostras.append((time.perf_counter() - t0) * 1000)
+    total = time.perf_counter() - inicio
+    return {
+        'repeticoes': repeticoes,
+        'media_ms': statistics.fmean(amostras),
+        'p50_ms': percentil(amostras, 50),
+        'p95_ms': percentil(amostras, 95),
+        'p99_ms': percentil(amostras, 99),
+        'por_segundo': repeticoes / total if total else 0.0,
+    }
+
+
+def imprimir(nome, resultado):
+    campos = '  '.join(
+        f"{chave}={valor:.2f}" if isinstance(valor, float) else f"{chave}={valor}"
+        for chave, valor in resultado.items()
+    )
+    print(f"{nome:<40} {campos}")
@@ -0,0 +1,230 @@
+"""
+Suíte de benchmarks do fluxo de inscrição, com baseline e limite de regressão.
+
+Semeia um banco descartável com `manage.py semear_dados` (na escala 1: 10 mil
+eventos e 1 milhão de inscrições; --escala reduz tudo proporcionalmente) e
+mede, pela pilha completa de middleware e views:
+
+- inscricao_post: POST de inscrição (latência e vazão);
+- evento_list / evento_list_sem_cache: listagem pública com o cache quente e frio;
+- exportacao_csv: exportação CSV de todas as inscrições, consumindo o streaming;
+- dashboard e inscricoes_admin: páginas do organizador.
+
+Os resultados são comparados com benchmarks/baselines/<banco>.json (sqlite ou
+postgresql, conforme DB_ENGINE). Um cenário regride quando o p95 passa do
+baseline em mais de --limite ou quando executa mais consultas SQL; nesse caso
+a suíte termina com código 1.
+
+    python -m benchmarks.suite                          # compara com o baseline
+    python -m benchmarks.suite --salvar-baseline        # grava os resultados atuais
+    python -m benchmarks.suite --escala 0.01 -k evento_list
+"""
+import argparse
+import itertools
+import json
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks.comum import banco_temporario, configurar, imprimir, medir
+
+BASELINES = Path(__file__).resolve().parent / 'baselines'
+EVENTOS = 10_000
+INSCRICOES = 1_000_000
+
+CENARIOS = {}
+
+
+def cenario(nome, repeticoes):
+    def registrar(preparar):
+        CENARIOS[nome] = (preparar, repeticoes)
+        return preparar
+    return registrar
+
+
+def _ler(resp):
+    if resp.streaming:
+        for _ in resp.streaming_content:
+            pass
+    assert resp.status_code < 400, resp.status_code
+    return resp
+
+
+@cenario('inscricao_post', repeticoes=500)
+def _inscricao_post(ctx):
+    from django.urls import reverse
+
+    url = reverse('evento-inscricao', args=[ctx.evento_aberto.pk])
+    sequencia = itertools.count()
+    return lambda: _ler(ctx.anonimo.post(url, {
+        'nome': 'Carga', 'email': f'carga{next(sequencia)}@example.com', 'telefone': '11999990000',
+        'assistencia': 'NENHUMA',
+    }))
+
+
+@cenario('evento_list', repeticoes=500)
+def _evento_list(ctx):
+    from django.urls import reverse
+
+    url = reverse('evento-list')
+    return lambda: _ler(ctx.anonimo.get(url))
+
+
+@cenario('evento_list_sem_cache', repeticoes=100)
+def _evento_list_sem_cache(ctx):
+    from django.core.cache import cache
+    from django.urls import reverse
+
+    url = reverse('evento-list')
+
+    def executar():
+        cache.clear()
+        return _ler(ctx.anonimo.get(url))
+    return executar
+
+
+@cenario('exportacao_csv', repeticoes=3)
+def _exportacao_csv(ctx):
+    from django.urls import reverse
+
+    url = reverse('inscricoes-exportar')
+    return lambda: _ler(ctx.organizador.get(url))
+
+
+@cenario('dashboard', repeticoes=200)
+def _dashboard(ctx):
+    from django.urls import reverse
+
+    url = reverse('dashboard')
+    return lambda: _ler(ctx.organizador.get(url))
+
+
+@cenario('inscricoes_admin', repeticoes=200)
+def _inscricoes_admin(ctx):
+    from django.urls import reverse
+
+    url = reverse('inscricoes-admin')
+    return lambda: _ler(ctx.organizador.get(url))
+
+
+class Contexto:
+    def __init__(self):
+        from django.contrib.auth.models import User
+        from django.test import Client
+        from django.utils import timezone
+
+        from eventos.models import Evento
+
+        self.anonimo = Client()
+        self.organizador = Client()
+        self.organizador.force_login(User.objects.create_user('bench', password='x'))
+        self.evento_aberto = Evento.objects.create(
+            titulo="Evento aberto", tipo='PALESTRA', data=timezone.now() + timezone.timedelta(days=30),
+            local="Auditório", descricao="Inscrições da suíte", capacidade=10 ** 9,
+        )
+
+
+def executar(nome, ctx, repeticoes):
+    """Primeira execução contando consultas (também aquece caches), depois as medidas."""
+    from django.db import connection
+
+    preparar, _ = CENARIOS[nome]
+    fn = preparar(ctx)
+    # execute_wrapper em vez de CaptureQueriesContext: cada requisição do Client
+    # zera connection.queries, e o streaming da exportação consulta depois da view.
+    consultas = []
+
+    def contar(execute, sql, params, many, context):
+        consultas.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(contar):
+        fn()
+    resultado = medir(fn, repeticoes, aquecimento=min(repeticoes, 4))
+    resultado = {chave: round(valor, 3) if isinstance(valor, float) else valor for chave, valor in resultado.items()}
+    resultado['consultas'] = len(consultas)
+    return resultado
+
+
+def comparar(resultados, baseline, limite):
+    """Devolve as mensagens de regressão de `resultados` em relação a `baseline`."""
+    regressoes = []
+    for nome, atual in resultados.items():
+        base = baseline.get(nome)
+        if base is None:
+            continue
+        if atual['p95_ms'] > base['p95_ms'] * (1 + limite):
+            regressoes.append(
+                f"{nome}: p95 {atual['p95_ms']:.2f} ms > {base['p95_ms']:.2f} ms (+{limite:.0%} permitido)"
+            )
+        if atual['consultas'] > base['consultas']:
+            regressoes.append(f"{nome}: {atual['consultas']} consultas SQL (baseline {base['consultas']})")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--escala', type=float, default=1.0,
+                        help=f"Fração de {EVENTOS} eventos / {INSCRICOES} inscrições semeados.")
+    parser.add_argument('--fator-repeticoes', type=float, default=1.0)
+    parser.add_argument('-k', dest='filtro', default='', help="Roda só os cenários cujo nome contém o texto.")
+    parser.add_argument('--limite', type=float, default=0.25, help="Piora tolerada no p95 (0.25 = 25%%).")
+    parser.add_argument('--baseline', type=Path, help="Arquivo de baseline (padrão: baselines/<banco>.json).")
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--json', type=Path, help="Grava os resultados desta execução neste arquivo.")
+    args = parser.parse_args()
+
+    configurar()
+    from django.core.management import call_command
+    from django.db import connection
+
+    # Os tempos já saem na tabela; o log de requisições lentas só poluiria a saída.
+    logging.getLogger('eventos.perf').setLevel(logging.ERROR)
+
+    nomes = [nome for nome in CENARIOS if args.filtro in nome]
+    eventos = max(int(EVENTOS * args.escala), 1)
+    inscricoes = max(int(INSCRICOES * args.escala), 1)
+    arquivo = args.baseline or BASELINES / f'{connection.vendor}.json'
+
+    resultados = {}
+    with banco_temporario():
+        print(f"Banco {connection.vendor}: semeando {eventos} eventos e {inscricoes} inscrições...")
+        call_command('semear_dados', eventos=eventos, inscricoes=inscricoes, verbosity=0)
+        ctx = Contexto()
+        for nome in nomes:
+            repeticoes = max(int(CENARIOS[nome][1] * args.fator_repeticoes), 1)
+            resultados[nome] = executar(nome, ctx, repeticoes)
+            imprimir(nome, resultados[nome])
+
+    execucao = {'banco': connection.vendor, 'escala': args.escala, 'cenarios': resultados}
+    if args.json:
+        args.json.write_text(json.dumps(execucao, indent=2, sort_keys=True) + '\n')
+
+    if args.salvar_baseline:
+        # Rodar só alguns cenários (-k) atualiza apenas esses no baseline da mesma escala.
+        anterior = json.loads(arquivo.read_text()) if arquivo.exists() else {}
+        anteriores = anterior.get('cenarios', {}) if anterior.get('escala') == args.escala else {}
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        arquivo.write_text(json.dumps(
+            dict(execucao, cenarios={**anteriores, **resultados}), indent=2, sort_keys=True,
+        ) + '\n')
+        print(f"Baseline gravado em {arquivo}")
+        return 0
+
+    if not arquivo.exists():
+        print(f"Sem baseline em {arquivo}; rode com --salvar-baseline.")
+        return 0
+    baseline = json.loads(arquivo.read_text())
+    if baseline['escala'] != args.escala:
+        print(f"Baseline gravado na escala {baseline['escala']}, não {args.escala}: comparação ignorada.")
+        return 0
+    regressoes = comparar(resultados, baseline['cenarios'], args.limite)
+    for mensagem in regressoes:
+        print(f"REGRESSÃO {mensagem}")
+    if not regressoes:
+        print(f"Sem regressões em relação a {arquivo.name} (limite +{args.limite:.0%}).")
+    return 1 if regressoes else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
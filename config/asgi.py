@@ -12,5 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Sob ASGI as páginas públicas mais acessadas usam as views assíncronas de eventos.views.
+os.environ.setdefault('EVENTOS_VIEWS_ASYNC', 'True')
+# Cada requisição ASGI roda numa thread nova, que não reaproveitaria uma conexão persistente;
+# para reaproveitar conexões aqui use DB_POOL.
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    'eventos.perf.InstrumentacaoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -46,9 +47,11 @@ WSGI_APPLICATION = 'config.wsgi.application'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates que mede o tempo de render por requisição (eventos.perf).
+        'BACKEND': 'eventos.perf.TemplatesMedidos',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
+        # Sem 'loaders' explícito o Django já usa o cached.Loader (compila cada template uma vez por processo).
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.request',
@@ -68,9 +71,38 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD'),
         'HOST': config('DB_HOST'),
         'PORT': config('DB_PORT'),
+        # Conexões persistentes: sem elas cada requisição paga o handshake (TCP + TLS + autenticação)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', cast=int, default=60),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', cast=bool, default=True),
     }
 }
 
+# Pool nativo do psycopg 3 (pip install "psycopg[binary,pool]"); substitui as conexões persistentes
+if config('DB_POOL', cast=bool, default=False) and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': config('DB_POOL_MIN', cast=int, default=2),
+            'max_size': config('DB_POOL_MAX', cast=int, default=10),
+            'timeout': config('DB_POOL_TIMEOUT', cast=int, default=10),
+        },
+    }
+
+# Réplica de leitura para a lista de eventos, o dashboard e as exportações (eventos.replica)
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['eventos.replica.RoteadorReplica']
+# Segundos depois de uma alteração em que a lista de eventos ainda lê do principal
+DB_REPLICA_ATRASO = config('DB_REPLICA_ATRASO', cast=int, default=5)
+
 
 if 'test' in sys.argv:
     DATABASES = {
@@ -81,6 +113,8 @@ if 'test' in sys.argv:
     }
     EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
 
+EVENTOS_BANCO_LEITURA = 'replica' if 'replica' in DATABASES else 'default'
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -101,6 +135,56 @@ DEFAULT_FROM_EMAIL = EMAIL_HOST_USER or 'no-reply@example.com'
 
 SEND_ORGANIZER_EMAIL = False
 
+# Fila de e-mails (eventos.emails / manage.py processar_emails)
+EMAIL_FILA_MAX_TENTATIVAS = config('EMAIL_FILA_MAX_TENTATIVAS', cast=int, default=5)
+EMAIL_FILA_BACKOFF_SEGUNDOS = config('EMAIL_FILA_BACKOFF_SEGUNDOS', cast=int, default=30)
+EMAIL_FILA_RESERVA_SEGUNDOS = config('EMAIL_FILA_RESERVA_SEGUNDOS', cast=int, default=300)
+
+# Comunicados aos inscritos (manage.py enviar_comunicados)
+COMUNICADO_MAX_POR_SEGUNDO = config('COMUNICADO_MAX_POR_SEGUNDO', cast=float, default=10)
+# Sem renovação por esse tempo, um comunicado ENVIANDO é considerado abandonado e retomado
+COMUNICADO_RESERVA_SEGUNDOS = config('COMUNICADO_RESERVA_SEGUNDOS', cast=int, default=300)
+
+# Cache (locmem por padrão). Ex.: CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# com CACHE_LOCATION=redis://localhost:6379/1, ou FileBasedCache com um diretório.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='eventos'),
+    }
+}
+EVENTOS_CACHE_SEGUNDOS = config('EVENTOS_CACHE_SEGUNDOS', cast=int, default=600)
+
+# Listagem, inscrição e ingresso em views assíncronas (eventos.urls); config/asgi.py liga por padrão
+EVENTOS_VIEWS_ASYNC = config('EVENTOS_VIEWS_ASYNC', cast=bool, default=False)
+
+# Check-in na entrada (eventos.checkin): leituras aceitas por lote de sincronização offline
+CHECK_IN_LOTE_MAXIMO = config('CHECK_IN_LOTE_MAXIMO', cast=int, default=500)
+# Lista de presença offline (eventos.presenca): margem repetida em cada delta
+PRESENCA_JANELA_SEGUNDOS = config('PRESENCA_JANELA_SEGUNDOS', cast=int, default=300)
+
+# Instrumentação por requisição (eventos.perf): Server-Timing, log de lentas e /metrics.
+# Server-Timing expõe consultas e tempos internos a qualquer visitante: ligue só em desenvolvimento ou homologação.
+PERF_SERVER_TIMING = config('PERF_SERVER_TIMING', cast=bool, default=False)
+PERF_LENTA_MS = config('PERF_LENTA_MS', cast=int, default=500)
+# /metrics exige "Authorization: Bearer <token>"; sem token definido responde 404
+PERF_METRICAS_TOKEN = config('PERF_METRICAS_TOKEN', default='')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simples': {'format': '{asctime} {levelname} {name}: {message}', 'style': '{'},
+    },
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler', 'formatter': 'simples'},
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        'eventos': {'level': config('EVENTOS_LOG_LEVEL', default='INFO')},
+    },
+}
+
 
 LANGUAGE_CODE = 'pt-br'
 TIME_ZONE = 'America/Sao_Paulo'
@@ -111,6 +195,28 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Arquivos gerados pelas exportações em segundo plano (manage.py processar_exportacoes)
+EXPORTACOES_ROOT = config('EXPORTACOES_ROOT', default=str(BASE_DIR / 'exportacoes'))
+# Exportação PROCESSANDO sem conclusão depois desse tempo (worker que caiu) volta para a fila
+EXPORTACOES_RESERVA_SEGUNDOS = config('EXPORTACOES_RESERVA_SEGUNDOS', cast=int, default=1800)
+
+# Imagens dos eventos (eventos.imagens): o upload fica em staging até o worker
+# (manage.py processar_imagens) gerar as variantes e publicá-las no storage 'imagens'.
+# Em desenvolvimento, IMAGENS_STORAGE=django.core.files.storage.FileSystemStorage grava em MEDIA_ROOT.
+IMAGENS_STAGING_ROOT = config('IMAGENS_STAGING_ROOT', default=str(BASE_DIR / 'imagens_staging'))
+# Imagem PROCESSANDO sem conclusão depois desse tempo (worker que caiu) volta para a fila
+IMAGENS_RESERVA_SEGUNDOS = config('IMAGENS_RESERVA_SEGUNDOS', cast=int, default=600)
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'imagens': {
+        'BACKEND': config('IMAGENS_STORAGE', default='cloudinary_storage.storage.MediaCloudinaryStorage'),
+    },
+}
+
 
 CLOUDINARY_URL = config('CLOUDINARY_URL')
 DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
@@ -1,7 +1,7 @@
 from django.contrib import admin
-from .models import Evento, Participante, Inscricao
+from .models import Evento, Participante, Inscricao, ListaEspera
 
 admin.site.register(Evento)
 admin.site.register(Participante)
 admin.site.register(Inscricao)
-
+admin.site.register(ListaEspera)
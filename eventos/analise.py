@@ -0,0 +1,88 @@
+"""
+Curvas de inscrição por evento (inscrições por hora ou por dia).
+
+As horas completas ficam consolidadas em InscricoesHora (manage.py
+consolidar_inscricoes, agendado periodicamente). serie_inscricoes() lê o
+consolidado e agrega ao vivo, com TruncHour, apenas o que veio depois da última
+hora consolidada do evento, então o custo não depende do total de inscrições.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .models import Inscricao, InscricoesHora
+
+INTERVALOS = ('hora', 'dia')
+
+
+def _hora_cheia(momento):
+    return momento.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _por_hora(qs):
+    return (
+        qs.annotate(hora=TruncHour('data_inscricao', tzinfo=dt_timezone.utc))
+        .order_by().values('evento_id', 'hora').annotate(total=Count('pk'))
+    )
+
+
+def consolidar(desde=None, lote=5000):
+    """
+    Refaz as linhas de InscricoesHora das horas completas a partir de `desde`
+    (todas, se None). Devolve o número de linhas gravadas.
+    """
+    ate = _hora_cheia(timezone.now())
+    inscricoes = Inscricao.objects.filter(data_inscricao__lt=ate)
+    consolidadas = InscricoesHora.objects.filter(hora__lt=ate)
+    if desde is not None:
+        desde = _hora_cheia(desde)
+        inscricoes = inscricoes.filter(data_inscricao__gte=desde)
+        consolidadas = consolidadas.filter(hora__gte=desde)
+
+    with transaction.atomic():
+        consolidadas.delete()
+        total, pendentes = 0, []
+        for linha in _por_hora(inscricoes).iterator(chunk_size=lote):
+            pendentes.append(InscricoesHora(**linha))
+            if len(pendentes) >= lote:
+                InscricoesHora.objects.bulk_create(pendentes)
+                total, pendentes = total + len(pendentes), []
+        InscricoesHora.objects.bulk_create(pendentes)
+    return total + len(pendentes)
+
+
+def serie_inscricoes(evento, intervalo='hora'):
+    """
+    Lista de (início do intervalo, inscrições no intervalo, acumulado). Horas em
+    UTC; dias na data local.
+    """
+    horas = {}
+    for hora, total in InscricoesHora.objects.filter(evento=evento).values_list('hora', 'total'):
+        horas[hora] = total
+    recentes = Inscricao.objects.filter(evento=evento)
+    if horas:
+        recentes = recentes.filter(data_inscricao__gte=max(horas) + timedelta(hours=1))
+    for linha in _por_hora(recentes):
+        horas[linha['hora']] = horas.get(linha['hora'], 0) + linha['total']
+
+    passo = timedelta(hours=1)
+    if intervalo == 'dia':
+        dias = {}
+        for hora, total in horas.items():
+            dia = timezone.localdate(hora)
+            dias[dia] = dias.get(dia, 0) + total
+        horas, passo = dias, timedelta(days=1)
+
+    # Intervalos sem inscrições entram com zero, para o gráfico não "pular" períodos.
+    serie, acumulado = [], 0
+    if horas:
+        inicio, fim = min(horas), max(horas)
+        while inicio <= fim:
+            total = horas.get(inicio, 0)
+            acumulado += total
+            serie.append((inicio, total, acumulado))
+            inicio += passo
+    return serie
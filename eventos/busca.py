@@ -0,0 +1,75 @@
+"""
+Busca de participantes por nome, e-mail ou telefone.
+
+- PostgreSQL: `icontains` sobre nome/e-mail, acelerado pelos índices GIN
+  pg_trgm em UPPER(nome) e UPPER(email) criados na migração 0011.
+- SQLite: tabela FTS5 com tokenizer trigram (`eventos_participante_busca`),
+  mantida por triggers; dá a mesma semântica de substring sem diferenciar
+  maiúsculas. Termos com menos de 3 caracteres usam `icontains`, assim como
+  tudo se a migração não conseguiu criar a tabela (SQLite sem FTS5/trigram).
+- Telefones são buscados por prefixo em `telefone_digitos` (B-tree), já
+  normalizado para dígitos na gravação.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import normalizar_telefone
+
+TABELA_FTS = 'eventos_participante_busca'
+
+_APENAS_TELEFONE = re.compile(r'^[\d\s()+.\-]+$')
+
+_fts_por_banco = {}
+
+
+def verificar_fts(using=DEFAULT_DB_ALIAS):
+    """
+    A migração 0011 ignora a falha ao criar a tabela (SQLite sem FTS5 ou sem o
+    tokenizer trigram), então conferimos se ela existe. O resultado fica
+    guardado por banco; o sinal post_migrate refaz a verificação.
+    """
+    conexao = connections[using]
+    _fts_por_banco[using] = conexao.vendor == 'sqlite' and TABELA_FTS in conexao.introspection.table_names()
+    return _fts_por_banco[using]
+
+
+def _tem_fts():
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _fts_por_banco:
+        return verificar_fts(connection.alias)
+    return _fts_por_banco[connection.alias]
+
+
+def _filtro_texto(q, prefixo):
+    if len(q) >= 3 and _tem_fts():
+        termo = '"' + q.replace('"', '""') + '"'
+        ids = RawSQL(f"SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s", [termo])
+        return Q(**{f'{prefixo}pk__in': ids})
+    return Q(**{f'{prefixo}nome__icontains': q}) | Q(**{f'{prefixo}email__icontains': q})
+
+
+def filtro_participante(q, prefixo='participante__'):
+    """Q que casa participantes pelo termo `q`; `prefixo` é o caminho até Participante."""
+    filtro = _filtro_texto(q, prefixo)
+    digitos = normalizar_telefone(q)
+    if digitos and _APENAS_TELEFONE.match(q):
+        filtro |= Q(**{f'{prefixo}telefone_digitos__startswith': digitos})
+    return filtro
+
+
+def filtrar_por_participante(qs, q, prefixo='participante__'):
+    """Filtra `qs` pelo termo `q` no nome, e-mail ou telefone do participante."""
+    q = (q or '').strip()
+    if not q:
+        return qs
+    return qs.filter(filtro_participante(q, prefixo))
+
+
+def filtrar_inscricoes(qs, evento_id=None, q=None):
+    if evento_id:
+        qs = qs.filter(evento_id=evento_id)
+    return filtrar_por_participante(qs, q)
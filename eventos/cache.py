@@ -0,0 +1,98 @@
+"""
+Cache da listagem pública de eventos.
+
+A listagem tem uma versão global (momento da última alteração), usada na chave
+de cada página filtrada, no ETag e no Last-Modified. Como a listagem também
+muda sem escrita nenhuma (um evento que começa sai dos próximos e vai para o
+arquivo), chave e ETag levam ainda a janela de EVENTOS_CACHE_SEGUNDOS em curso
+(janela_listagem). Cada evento tem também uma
+versão própria, usada na chave do fragmento do seu card, para que alterar um
+evento não descarte os cards dos outros. Os sinais de Evento e Inscricao
+chamam marcar_alteracao(); escritas em massa (bulk_create/update) devem
+chamá-la diretamente.
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+CHAVE_ALTERADO_EM = 'eventos:alterado_em'
+
+
+def _chave_evento(pk):
+    return f'eventos:evento:{pk}:versao'
+
+
+def _versao(momento):
+    return int(momento.timestamp() * 1_000_000)
+
+
+def alterado_em():
+    """Momento da última alteração conhecida; com o cache vazio, assume agora."""
+    momento = cache.get(CHAVE_ALTERADO_EM)
+    if momento is None:
+        cache.add(CHAVE_ALTERADO_EM, timezone.now(), None)
+        momento = cache.get(CHAVE_ALTERADO_EM)
+    return momento
+
+
+def versao_listagem():
+    return _versao(alterado_em())
+
+
+def janela_listagem():
+    """Número da janela de EVENTOS_CACHE_SEGUNDOS em curso."""
+    return int(timezone.now().timestamp()) // settings.EVENTOS_CACHE_SEGUNDOS
+
+
+def inicio_janela():
+    return datetime.fromtimestamp(janela_listagem() * settings.EVENTOS_CACHE_SEGUNDOS, tz=dt_timezone.utc)
+
+
+def marcar_alteracao(evento_id=None):
+    agora = timezone.now()
+    cache.set(CHAVE_ALTERADO_EM, agora, None)
+    if evento_id is not None:
+        cache.set(_chave_evento(evento_id), _versao(agora), None)
+
+
+def versao_evento(evento_id):
+    chave = _chave_evento(evento_id)
+    versao = cache.get(chave)
+    if versao is None:
+        cache.add(chave, versao_listagem(), None)
+        versao = cache.get(chave)
+    return versao
+
+
+def anotar_versoes(eventos):
+    """Preenche `evento.versao_cache` (chave do fragmento do card) com um único get_many."""
+    chaves = {_chave_evento(evento.pk): evento for evento in eventos}
+    versoes = cache.get_many(list(chaves))
+    faltando = {chave: versao_listagem() for chave in chaves if chave not in versoes}
+    if faltando:
+        cache.set_many(faltando, None)
+        versoes.update(faltando)
+    for chave, evento in chaves.items():
+        evento.versao_cache = versoes[chave]
+    return eventos
+
+
+def chave_lista(*filtros):
+    resumo = hashlib.md5('|'.join(f or '' for f in filtros).encode()).hexdigest()
+    return f'eventos:lista:{versao_listagem()}:{janela_listagem()}:{resumo}'
+
+
+def em_cache(chave, gerar):
+    return cache.get_or_set(chave, gerar, settings.EVENTOS_CACHE_SEGUNDOS)
+
+
+async def aem_cache(chave, gerar):
+    """em_cache() para as views assíncronas: `gerar` é uma corrotina."""
+    valor = await cache.aget(chave)
+    if valor is None:
+        valor = await gerar()
+        await cache.aset(chave, valor, settings.EVENTOS_CACHE_SEGUNDOS)
+    return valor
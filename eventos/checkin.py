@@ -0,0 +1,85 @@
+"""
+Check-in na entrada do evento a partir do QR code do ingresso (o token assinado).
+
+O token é validado sem consultar o banco e a presença é marcada com um único
+UPDATE condicional (check_in_em IS NULL): ler o mesmo ingresso duas vezes não
+altera o horário registrado e só no caso de falha é feita uma segunda consulta
+para distinguir "já registrado" de "não encontrado". Leitores offline enviam
+os check-ins acumulados em lote, com o horário da leitura.
+"""
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from .ingressos import ler_token
+from .models import Inscricao
+
+OK = 'ok'
+REPETIDO = 'repetido'
+INVALIDO = 'invalido'
+NAO_ENCONTRADO = 'nao_encontrado'
+
+
+def _inscricao_do_token(token, evento_id):
+    ids = ler_token(token or '')
+    if ids is None or ids[1] != evento_id:
+        return None
+    return ids[0]
+
+
+def registrar_check_in(evento_id, token, momento=None):
+    """Devolve (status, inscricao_id, check_in_em)."""
+    inscricao_id = _inscricao_do_token(token, evento_id)
+    if inscricao_id is None:
+        return INVALIDO, None, None
+    momento = momento or timezone.now()
+    marcadas = Inscricao.objects.filter(
+        pk=inscricao_id, evento_id=evento_id, check_in_em__isnull=True
+    ).update(check_in_em=momento, check_in_sincronizado_em=timezone.now())
+    if marcadas:
+        return OK, inscricao_id, momento
+    anterior = Inscricao.objects.filter(pk=inscricao_id, evento_id=evento_id).values_list('check_in_em', flat=True)
+    anterior = anterior.first()
+    return (REPETIDO if anterior else NAO_ENCONTRADO), inscricao_id, anterior
+
+
+def registrar_lote(evento_id, leituras):
+    """
+    `leituras` é uma lista de (token, momento ou None). Marca todas com um UPDATE
+    (cada inscrição recebe o horário da sua leitura) e confere o resultado com
+    uma consulta. Devolve uma lista de (status, inscricao_id, check_in_em) na
+    ordem recebida. A primeira leitura de cada inscrição vale.
+    """
+    agora = timezone.now()
+    momentos = {}
+    por_leitura = []
+    for token, momento in leituras:
+        inscricao_id = _inscricao_do_token(token, evento_id)
+        por_leitura.append(inscricao_id)
+        if inscricao_id is not None:
+            momento = min(momento or agora, agora)
+            momentos[inscricao_id] = min(momentos.get(inscricao_id, momento), momento)
+
+    registrados = {}
+    if momentos:
+        Inscricao.objects.filter(pk__in=momentos, evento_id=evento_id, check_in_em__isnull=True).update(
+            check_in_em=Case(
+                *(When(pk=pk, then=Value(momento)) for pk, momento in momentos.items()),
+                output_field=DateTimeField(),
+            ),
+            check_in_sincronizado_em=agora,
+        )
+        registrados = dict(
+            Inscricao.objects.filter(pk__in=momentos, evento_id=evento_id).values_list('pk', 'check_in_em')
+        )
+
+    resultado, vistos = [], set()
+    for inscricao_id in por_leitura:
+        if inscricao_id is None:
+            resultado.append((INVALIDO, None, None))
+        elif inscricao_id not in registrados:
+            resultado.append((NAO_ENCONTRADO, inscricao_id, None))
+        else:
+            novo = registrados[inscricao_id] == momentos[inscricao_id] and inscricao_id not in vistos
+            resultado.append((OK if novo else REPETIDO, inscricao_id, registrados[inscricao_id]))
+        vistos.add(inscricao_id)
+    return resultado
@@ -0,0 +1,167 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.html import escape
+
+from .models import Comunicado
+from .perf import cronometro
+
+
+def _personalizar(texto, participante, html=False):
+    valores = {'{nome}': participante.nome, '{email}': participante.email}
+    for marcador, valor in valores.items():
+        texto = texto.replace(marcador, escape(valor) if html else valor)
+    return texto
+
+
+def _destinatarios(comunicado, chunk_size):
+    return (
+        comunicado.evento.inscricoes
+        .select_related('participante')
+        .filter(pk__gt=comunicado.ultima_inscricao_id)
+        .order_by('pk')
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _reserva():
+    return timezone.now() + timedelta(seconds=getattr(settings, 'COMUNICADO_RESERVA_SEGUNDOS', 300))
+
+
+def criar_reservado(evento, assunto, mensagem):
+    """
+    Cria um comunicado já reivindicado (ENVIANDO, com reserva), para ser enviado
+    por quem o criou: processar_comunicados só o pega se essa reserva vencer.
+    """
+    return Comunicado.objects.create(
+        evento=evento, assunto=assunto, mensagem=mensagem, status='ENVIANDO',
+        total=evento.inscricoes.count(), reservado_ate=_reserva(),
+    )
+
+
+def enviar_comunicado(comunicado, lote=100, taxa=None, connection=None):
+    """
+    Envia o comunicado a todos os inscritos do evento.
+
+    O HTML é renderizado uma única vez; por destinatário só trocamos os
+    marcadores {nome}/{email}. As mensagens saem em lotes de `lote` por uma
+    única conexão, limitadas a `taxa` mensagens por segundo. O progresso é
+    gravado a cada lote, então um envio interrompido é retomado de onde parou.
+
+    Se a conexão ou um lote falhar, o envio para ali: o comunicado continua
+    ENVIANDO, com o cursor antes do lote que falhou, e é retomado por
+    processar_comunicados quando a reserva vencer.
+    """
+    taxa = taxa if taxa is not None else getattr(settings, 'COMUNICADO_MAX_POR_SEGUNDO', 10)
+    remetente = settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL
+    evento = comunicado.evento
+
+    html_base = render_to_string('eventos/comunicado_email.html', {
+        'evento': evento,
+        'comunicado': comunicado,
+    })
+
+    if comunicado.status == 'PENDENTE':
+        comunicado.total = evento.inscricoes.count()
+        comunicado.status = 'ENVIANDO'
+        comunicado.reservado_ate = _reserva()
+        comunicado.save(update_fields=['total', 'status', 'reservado_ate'])
+
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as erro:
+        Comunicado.objects.filter(pk=comunicado.pk).update(ultimo_erro=str(erro)[:2000])
+        comunicado.refresh_from_db()
+        return comunicado
+
+    concluido = True
+    try:
+        bloco, ultimo_id = [], comunicado.ultima_inscricao_id
+        for inscricao in _destinatarios(comunicado, chunk_size=lote):
+            participante = inscricao.participante
+            msg = EmailMultiAlternatives(
+                subject=_personalizar(comunicado.assunto, participante),
+                body=_personalizar(comunicado.mensagem, participante),
+                from_email=remetente,
+                to=[participante.email],
+                connection=connection,
+            )
+            msg.attach_alternative(_personalizar(html_base, participante, html=True), "text/html")
+            bloco.append(msg)
+            ultimo_id = inscricao.pk
+            if len(bloco) >= lote:
+                concluido = _enviar_bloco(comunicado, connection, bloco, ultimo_id, taxa)
+                if not concluido:
+                    break
+                bloco = []
+        else:
+            if bloco:
+                concluido = _enviar_bloco(comunicado, connection, bloco, ultimo_id, taxa)
+    finally:
+        connection.close()
+
+    if concluido:
+        comunicado.status = 'CONCLUIDO'
+        comunicado.concluido_em = timezone.now()
+        comunicado.reservado_ate = None
+        comunicado.save(update_fields=['status', 'concluido_em', 'reservado_ate'])
+    comunicado.refresh_from_db()
+    return comunicado
+
+
+def _enviar_bloco(comunicado, connection, bloco, ultimo_id, taxa):
+    """
+    Envia um lote e avança o cursor. Se send_messages levantar, o cursor fica
+    onde estava, para que esses destinatários sejam tentados de novo, e
+    devolve False.
+    """
+    inicio = time.monotonic()
+    try:
+        with cronometro('email'):
+            enviados = connection.send_messages(bloco) or 0
+    except Exception as erro:
+        Comunicado.objects.filter(pk=comunicado.pk).update(ultimo_erro=str(erro)[:2000])
+        return False
+
+    campos = {
+        'ultima_inscricao_id': ultimo_id,
+        'enviados': F('enviados') + enviados,
+        'reservado_ate': _reserva(),
+    }
+    if enviados < len(bloco):
+        campos['falhas'] = F('falhas') + (len(bloco) - enviados)
+    Comunicado.objects.filter(pk=comunicado.pk).update(**campos)
+    comunicado.ultima_inscricao_id = ultimo_id
+
+    if taxa:
+        restante = len(bloco) / taxa - (time.monotonic() - inicio)
+        if restante > 0:
+            time.sleep(restante)
+    return True
+
+
+def processar_comunicados(lote=100, taxa=None):
+    """
+    Envia os comunicados pendentes, reivindicando cada um antes de enviar.
+
+    Comunicados ENVIANDO cuja reserva venceu (worker que caiu ou lote que
+    falhou) são reivindicados de novo e retomados do último lote confirmado.
+    """
+    vencida = Q(reservado_ate__lt=timezone.now()) | Q(reservado_ate__isnull=True)
+    disponiveis = Q(status='PENDENTE') | (Q(status='ENVIANDO') & vencida)
+    processados = []
+    for pk in Comunicado.objects.filter(disponiveis).order_by('criado_em').values_list('pk', flat=True):
+        if not Comunicado.objects.filter(disponiveis, pk=pk).update(status='ENVIANDO', reservado_ate=_reserva()):
+            continue
+        comunicado = Comunicado.objects.select_related('evento').get(pk=pk)
+        if not comunicado.ultima_inscricao_id:
+            comunicado.total = comunicado.evento.inscricoes.count()
+            comunicado.save(update_fields=['total'])
+        processados.append(enviar_comunicado(comunicado, lote=lote, taxa=taxa))
+    return processados
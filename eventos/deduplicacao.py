@@ -0,0 +1,73 @@
+"""
+Mescla de participantes duplicados (mesmo e-mail com caixa ou espaços diferentes).
+
+Em cada grupo fica o participante mais antigo (menor id); as inscrições dos
+demais passam para ele. Quando os dois estavam inscritos no mesmo evento, a
+inscrição do duplicado é removida. Ao final, vagas ocupadas e estatísticas são
+recalculadas, já que o trabalho é feito com update()/delete() em lote.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .estatisticas import reconstruir
+from .models import Inscricao, Participante, normalizar_email
+
+
+def _em_blocos(itens, tamanho):
+    for i in range(0, len(itens), tamanho):
+        yield itens[i:i + tamanho]
+
+
+def _por_email():
+    """{e-mail normalizado: [ids em ordem]}, com a mesma normalização do Participante.save()."""
+    por_chave = {}
+    for pk, email in Participante.objects.order_by('pk').values_list('pk', 'email').iterator():
+        chave = normalizar_email(email)
+        if chave is not None:
+            por_chave.setdefault(chave, []).append(pk)
+    return por_chave
+
+
+def grupos_duplicados():
+    """Lista de (e-mail normalizado, id mantido, quantidade) dos e-mails repetidos."""
+    return sorted((chave, pks[0], len(pks)) for chave, pks in _por_email().items() if len(pks) > 1)
+
+
+def mesclar_duplicados(lote=500):
+    """Mescla todos os grupos de duplicados. Devolve (grupos, participantes removidos)."""
+    grupos = [(chave, pks) for chave, pks in sorted(_por_email().items()) if len(pks) > 1]
+    removidos = 0
+    for bloco in _em_blocos(grupos, lote):
+        destino = {pk: pks[0] for _, pks in bloco for pk in pks[1:]}
+        with transaction.atomic():
+            eventos_mantidos = {}
+            for participante_id, evento_id in Inscricao.objects.filter(
+                participante_id__in=set(destino.values())
+            ).values_list('participante_id', 'evento_id'):
+                eventos_mantidos.setdefault(participante_id, set()).add(evento_id)
+
+            conflitos, repontar = [], {}
+            for pk, participante_id, evento_id in Inscricao.objects.filter(
+                participante_id__in=destino
+            ).order_by('pk').values_list('pk', 'participante_id', 'evento_id'):
+                novo = destino[participante_id]
+                eventos = eventos_mantidos.setdefault(novo, set())
+                if evento_id in eventos:
+                    conflitos.append(pk)
+                else:
+                    eventos.add(evento_id)
+                    repontar.setdefault(novo, []).append(pk)
+
+            Inscricao.objects.filter(pk__in=conflitos).delete()
+            for novo, inscricoes in repontar.items():
+                Inscricao.objects.filter(pk__in=inscricoes).update(participante_id=novo)
+            Participante.objects.filter(pk__in=destino).only('pk').delete()
+            # Sem os duplicados, o mantido pode ocupar a chave única; atualizado_em invalida as exportações.
+            agora = timezone.now()
+            for chave, pks in bloco:
+                Participante.objects.filter(pk=pks[0]).update(email_normalizado=chave, atualizado_em=agora)
+            removidos += len(destino)
+
+    if grupos:
+        reconstruir()
+    return len(grupos), removidos
@@ -0,0 +1,203 @@
+import hashlib
+import re
+import secrets
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .cache import em_cache
+from .perf import cronometro
+from .models import EmailPendente
+
+
+def _remetente():
+    return settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL
+
+
+def url_publica(path, request=None):
+    base_url = (getattr(settings, 'PUBLIC_APP_URL', '') or '').strip()
+    if base_url:
+        base = base_url.rstrip('/') + '/'
+    elif request is not None:
+        base = request.build_absolute_uri('/')
+    else:
+        base = '/'
+    return urljoin(base, path.lstrip('/'))
+
+
+def enfileirar_email(assunto, corpo, destinatarios, corpo_html='', remetente=None):
+    return EmailPendente.objects.create(
+        assunto=assunto,
+        corpo=corpo,
+        corpo_html=corpo_html,
+        remetente=remetente or _remetente(),
+        destinatarios=list(destinatarios),
+    )
+
+
+# Dados do participante no HTML do ingresso pré-renderizado por evento.
+_CAMPOS_MARCADOS = ('nome', 'email', 'telefone', 'url_ingresso')
+
+
+def _versao_conteudo(evento):
+    """Muda quando muda algo do evento que aparece no e-mail (não a cada inscrição)."""
+    campos = [evento.titulo, evento.data.isoformat(), evento.local, evento.descricao, evento.url_imagem]
+    return hashlib.md5('\x1f'.join(campos).encode()).hexdigest()
+
+
+def html_ingresso_base(evento, promovido=False):
+    """
+    HTML do e-mail de ingresso com o que é comum a todos os inscritos do evento
+    (cabeçalho, imagem, descrição, layout), renderizado uma vez por versão do
+    conteúdo do evento e guardado no cache. Os dados do participante ficam como
+    marcadores [[<segredo>:nome]], [[<segredo>:email]] etc., com um segredo
+    aleatório gerado a cada renderização: o texto do evento não tem como conter
+    um marcador, então título ou descrição com "[[nome]]" não recebem dados do
+    participante. Devolve (segredo, html).
+    """
+    def gerar():
+        segredo = secrets.token_hex(8)
+        marcadores = {campo: f'[[{segredo}:{campo}]]' for campo in _CAMPOS_MARCADOS}
+        html = render_to_string('eventos/ingresso_email.html', {
+            'evento': evento,
+            'participante': {campo: marcadores[campo] for campo in ('nome', 'email', 'telefone')},
+            'url_ingresso': marcadores['url_ingresso'],
+            'promovido': promovido,
+        })
+        return segredo, html
+
+    chave = f'eventos:email:ingresso:{evento.pk}:{_versao_conteudo(evento)}:{int(promovido)}:v2'
+    return em_cache(chave, gerar)
+
+
+def html_ingresso(inscricao, url_ingresso, promovido=False):
+    participante = inscricao.participante
+    valores = {
+        'nome': escape(participante.nome),
+        'email': escape(participante.email),
+        'telefone': escape(participante.telefone),
+        'url_ingresso': escape(url_ingresso),
+    }
+    segredo, html = html_ingresso_base(inscricao.evento, promovido)
+    marcador = re.compile(r'\[\[' + segredo + r':(' + '|'.join(_CAMPOS_MARCADOS) + r')\]\]')
+    # Uma única passada: um valor que contenha um marcador não é substituído de novo.
+    return marcador.sub(lambda m: valores[m.group(1)], html)
+
+
+def enfileirar_confirmacao(inscricao, url_ingresso):
+    evento = inscricao.evento
+    participante = inscricao.participante
+    enfileirar_email(
+        assunto=f'Confirmação de Inscrição: {evento.titulo}',
+        corpo="Sua inscrição foi confirmada.",
+        destinatarios=[participante.email],
+        corpo_html=html_ingresso(inscricao, url_ingresso),
+    )
+
+    if getattr(settings, 'SEND_ORGANIZER_EMAIL', False):
+        enfileirar_email(
+            assunto='Nova Inscrição Recebida',
+            corpo=f'{participante.nome} se inscreveu no evento "{evento.titulo}".',
+            destinatarios=[settings.EMAIL_HOST_USER],
+        )
+
+
+def enfileirar_promocao(inscricao):
+    """Avisa quem saiu da lista de espera; fora de uma requisição, a URL usa PUBLIC_APP_URL."""
+    url_ingresso = url_publica(reverse('ingresso-detail', args=[inscricao.token]))
+    enfileirar_email(
+        assunto=f'Vaga liberada: {inscricao.evento.titulo}',
+        corpo="Abriu uma vaga e sua inscrição saiu da lista de espera.",
+        destinatarios=[inscricao.participante.email],
+        corpo_html=html_ingresso(inscricao, url_ingresso, promovido=True),
+    )
+
+
+def _montar_mensagem(pendente, connection):
+    msg = EmailMultiAlternatives(
+        subject=pendente.assunto,
+        body=pendente.corpo,
+        from_email=pendente.remetente or _remetente(),
+        to=pendente.destinatarios,
+        connection=connection,
+    )
+    if pendente.corpo_html:
+        msg.attach_alternative(pendente.corpo_html, "text/html")
+    return msg
+
+
+def _reservar_lote(lote):
+    """
+    Marca até `lote` e-mails vencidos como em processamento, adiando a
+    próxima tentativa pelo tempo de reserva para que outro worker não os pegue.
+    """
+    agora = timezone.now()
+    reserva = timedelta(seconds=getattr(settings, 'EMAIL_FILA_RESERVA_SEGUNDOS', 300))
+    with transaction.atomic():
+        ids = list(
+            EmailPendente.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='PENDENTE', proxima_tentativa__lte=agora)
+            .order_by('proxima_tentativa', 'pk')
+            .values_list('pk', flat=True)[:lote]
+        )
+        EmailPendente.objects.filter(pk__in=ids).update(proxima_tentativa=agora + reserva)
+    return list(EmailPendente.objects.filter(pk__in=ids).order_by('pk'))
+
+
+def _registrar_falha(pendente, erro):
+    max_tentativas = getattr(settings, 'EMAIL_FILA_MAX_TENTATIVAS', 5)
+    backoff = getattr(settings, 'EMAIL_FILA_BACKOFF_SEGUNDOS', 30)
+    tentativas = pendente.tentativas + 1
+    campos = {'tentativas': F('tentativas') + 1, 'ultimo_erro': str(erro)[:2000]}
+    if tentativas >= max_tentativas:
+        campos['status'] = 'FALHOU'
+    else:
+        campos['proxima_tentativa'] = timezone.now() + timedelta(seconds=backoff * 2 ** (tentativas - 1))
+    EmailPendente.objects.filter(pk=pendente.pk).update(**campos)
+
+
+def processar_fila(lote=50, connection=None):
+    """
+    Envia um lote da fila reutilizando uma única conexão SMTP.
+
+    Retorna a tupla (enviados, falhas).
+    """
+    pendentes = _reservar_lote(lote)
+    if not pendentes:
+        return 0, 0
+
+    connection = connection or get_connection()
+    enviados, falhas = [], 0
+    try:
+        connection.open()
+    except Exception as erro:
+        for pendente in pendentes:
+            _registrar_falha(pendente, erro)
+        return 0, len(pendentes)
+
+    try:
+        for pendente in pendentes:
+            try:
+                with cronometro('email'):
+                    _montar_mensagem(pendente, connection).send()
+            except Exception as erro:
+                _registrar_falha(pendente, erro)
+                falhas += 1
+            else:
+                enviados.append(pendente.pk)
+    finally:
+        connection.close()
+
+    EmailPendente.objects.filter(pk__in=enviados).update(
+        status='ENVIADO', enviado_em=timezone.now(), ultimo_erro=''
+    )
+    return len(enviados), falhas
@@ -0,0 +1,238 @@
+"""
+Estatísticas materializadas do dashboard.
+
+Os totais ficam na tabela Contador (escopo, chave, valor) e são ajustados pelos
+sinais a cada inscrição/evento/participante salvo ou removido, com um único
+INSERT ... ON CONFLICT por alteração. reconstruir() recalcula tudo a partir das
+tabelas de origem (manage.py reconstruir_estatisticas), por exemplo depois de
+cargas com bulk_create, que não disparam sinais.
+
+"Primeira/última inscrição do participante" (contadores de participantes e de
+assistência) é decidido com a linha do participante travada (select_for_update),
+então inscrições simultâneas da mesma pessoa contam uma vez só. Isso é exato
+quando a gravação da inscrição roda numa transação, como em reservar_vaga,
+liberar_vaga, no admin e na importação. Fora de transação os contadores podem
+derivar; reconstruir() os corrige.
+
+Ao excluir um evento, as inscrições que saem em cascata são descontadas de uma
+vez por inscricoes_de_eventos_removidas(), no pre_delete do Evento; os sinais
+por inscrição ignoram essa cascata.
+
+Escopos:
+    global       eventos, capacidade, inscricoes, participantes (com ao menos uma inscrição)
+    tipo         inscrições por tipo de evento
+    assistencia  participantes com inscrição, por necessidade de assistência
+    dia          inscrições por dia (data local, AAAA-MM-DD)
+"""
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps as apps_globais
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from .models import Contador, Evento, Inscricao, Participante
+
+GLOBAL = 'global'
+TIPO = 'tipo'
+ASSISTENCIA = 'assistencia'
+DIA = 'dia'
+
+
+def incrementar(deltas):
+    """Soma cada delta {(escopo, chave): n} ao contador correspondente, criando-o se preciso."""
+    deltas = sorted((chave, n) for chave, n in deltas.items() if n)
+    if not deltas:
+        return
+    tabela = connection.ops.quote_name(Contador._meta.db_table)
+    valores = ', '.join(['(%s, %s, %s)'] * len(deltas))
+    params = [p for (escopo, chave), n in deltas for p in (escopo, chave, n)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {tabela} (escopo, chave, valor) VALUES {valores} "
+            f"ON CONFLICT (escopo, chave) DO UPDATE SET valor = {tabela}.valor + EXCLUDED.valor",
+            params,
+        )
+
+
+def _dia(inscricao):
+    return timezone.localdate(inscricao.data_inscricao).isoformat()
+
+
+def _assistencia_travando(participante_id):
+    """Trava a linha do participante até o fim da transação e devolve sua assistência."""
+    return (
+        Participante.objects.select_for_update()
+        .values_list('assistencia', flat=True)
+        .get(pk=participante_id)
+    )
+
+
+def inscricao_criada(inscricao):
+    deltas = {
+        (GLOBAL, 'inscricoes'): 1,
+        (TIPO, inscricao.evento.tipo): 1,
+        (DIA, _dia(inscricao)): 1,
+    }
+    with transaction.atomic(savepoint=False):
+        assistencia = _assistencia_travando(inscricao.participante_id)
+        outras = Inscricao.objects.filter(participante_id=inscricao.participante_id).exclude(pk=inscricao.pk)
+        if not outras.exists():
+            deltas[GLOBAL, 'participantes'] = 1
+            deltas[ASSISTENCIA, assistencia] = 1
+        incrementar(deltas)
+
+
+def inscricao_removida(inscricao):
+    deltas = {
+        (GLOBAL, 'inscricoes'): -1,
+        (TIPO, inscricao.evento.tipo): -1,
+        (DIA, _dia(inscricao)): -1,
+    }
+    with transaction.atomic(savepoint=False):
+        try:
+            assistencia = _assistencia_travando(inscricao.participante_id)
+        except Participante.DoesNotExist:
+            # Participante apagado em cascata: conta a partir do objeto já carregado.
+            assistencia = inscricao.participante.assistencia
+        if not Inscricao.objects.filter(participante_id=inscricao.participante_id).exists():
+            deltas[GLOBAL, 'participantes'] = -1
+            deltas[ASSISTENCIA, assistencia] = -1
+        incrementar(deltas)
+
+
+def inscricoes_de_eventos_removidas(eventos):
+    """
+    Desconta as inscrições dos `eventos` (pks ou subconsulta de pks) que estão
+    para ser excluídos, em três consultas qualquer que seja o número de inscrições.
+    """
+    inscricoes = Inscricao.objects.filter(evento__in=eventos)
+    deltas = Counter()
+    por_tipo_e_dia = (
+        inscricoes.annotate(dia=TruncDate('data_inscricao'))
+        .order_by().values_list('evento__tipo', 'dia').annotate(n=Count('pk'))
+    )
+    for tipo, dia, n in por_tipo_e_dia:
+        deltas[GLOBAL, 'inscricoes'] -= n
+        deltas[TIPO, tipo] -= n
+        deltas[DIA, dia.isoformat()] -= n
+    if not deltas:
+        return
+    # Trava os participantes, como inscricao_removida(); saem dos contadores os sem inscrição fora desses eventos.
+    fora = Inscricao.objects.filter(participante=OuterRef('pk')).exclude(evento__in=eventos)
+    participantes = (
+        Participante.objects.select_for_update()
+        .filter(pk__in=inscricoes.values('participante_id'))
+        .values_list('assistencia', Exists(fora))
+    )
+    for assistencia, fica in participantes:
+        if not fica:
+            deltas[GLOBAL, 'participantes'] -= 1
+            deltas[ASSISTENCIA, assistencia] -= 1
+    incrementar(deltas)
+
+
+def evento_salvo(evento, created):
+    carregado = getattr(evento, '_carregado', None)
+    if created:
+        incrementar({(GLOBAL, 'eventos'): 1, (GLOBAL, 'capacidade'): evento.capacidade})
+    elif carregado:
+        deltas = {(GLOBAL, 'capacidade'): evento.capacidade - carregado.get('capacidade', evento.capacidade)}
+        tipo_anterior = carregado.get('tipo', evento.tipo)
+        if tipo_anterior != evento.tipo:
+            deltas[TIPO, tipo_anterior] = -evento.vagas_ocupadas
+            deltas[TIPO, evento.tipo] = evento.vagas_ocupadas
+        incrementar(deltas)
+    else:
+        return
+    evento._carregado = {**(carregado or {}), 'capacidade': evento.capacidade, 'tipo': evento.tipo}
+
+
+def evento_removido(evento):
+    incrementar({(GLOBAL, 'eventos'): -1, (GLOBAL, 'capacidade'): -evento.capacidade})
+
+
+def participante_salvo(participante, created):
+    carregado = getattr(participante, '_carregado', None)
+    if created or not carregado:
+        return
+    anterior = carregado.get('assistencia', participante.assistencia)
+    if anterior != participante.assistencia and participante.inscricoes.exists():
+        incrementar({(ASSISTENCIA, anterior): -1, (ASSISTENCIA, participante.assistencia): 1})
+    carregado['assistencia'] = participante.assistencia
+
+
+def reconstruir(apps=apps_globais):
+    """
+    Recalcula Evento.vagas_ocupadas e todos os contadores a partir das tabelas
+    de origem. `apps` permite usar os modelos históricos numa migração.
+    """
+    Evento = apps.get_model('eventos', 'Evento')
+    Inscricao = apps.get_model('eventos', 'Inscricao')
+    Participante = apps.get_model('eventos', 'Participante')
+    Contador = apps.get_model('eventos', 'Contador')
+
+    with transaction.atomic():
+        por_evento = (
+            Inscricao.objects.filter(evento=OuterRef('pk')).order_by()
+            .values('evento').annotate(n=Count('pk')).values('n')
+        )
+        Evento.objects.update(vagas_ocupadas=Coalesce(Subquery(por_evento), Value(0)))
+
+        com_inscricao = Participante.objects.filter(pk__in=Inscricao.objects.values('participante_id'))
+        totais = Evento.objects.aggregate(eventos=Count('pk'), capacidade=Sum('capacidade'))
+        contadores = [
+            Contador(escopo=GLOBAL, chave='eventos', valor=totais['eventos']),
+            Contador(escopo=GLOBAL, chave='capacidade', valor=totais['capacidade'] or 0),
+            Contador(escopo=GLOBAL, chave='inscricoes', valor=Inscricao.objects.count()),
+            Contador(escopo=GLOBAL, chave='participantes', valor=com_inscricao.count()),
+        ]
+        contadores += [
+            Contador(escopo=TIPO, chave=linha['evento__tipo'], valor=linha['n'])
+            for linha in Inscricao.objects.order_by().values('evento__tipo').annotate(n=Count('pk'))
+        ]
+        contadores += [
+            Contador(escopo=ASSISTENCIA, chave=linha['assistencia'], valor=linha['n'])
+            for linha in com_inscricao.order_by().values('assistencia').annotate(n=Count('pk'))
+        ]
+        contadores += [
+            Contador(escopo=DIA, chave=linha['dia'].isoformat(), valor=linha['n'])
+            for linha in Inscricao.objects.annotate(dia=TruncDate('data_inscricao'))
+            .order_by().values('dia').annotate(n=Count('pk'))
+        ]
+        Contador.objects.all().delete()
+        Contador.objects.bulk_create(contadores)
+    return len(contadores)
+
+
+def resumo(dias=30):
+    """Tudo o que o dashboard mostra, em uma consulta."""
+    hoje = timezone.localdate()
+    inicio = hoje - timedelta(days=dias - 1)
+    linhas = Contador.objects.filter(
+        Q(escopo__in=[GLOBAL, TIPO, ASSISTENCIA]) | Q(escopo=DIA, chave__gte=inicio.isoformat())
+    ).values_list('escopo', 'chave', 'valor')
+
+    valores = {GLOBAL: {}, TIPO: {}, ASSISTENCIA: {}, DIA: {}}
+    for escopo, chave, valor in linhas:
+        valores[escopo][chave] = valor
+
+    totais = valores[GLOBAL]
+    capacidade = totais.get('capacidade', 0)
+    inscricoes = totais.get('inscricoes', 0)
+    return {
+        'total_eventos': totais.get('eventos', 0),
+        'total_inscricoes': inscricoes,
+        'total_participantes': totais.get('participantes', 0),
+        'taxa_ocupacao': round(100 * inscricoes / capacidade) if capacidade else 0,
+        'por_tipo': [(rotulo, valores[TIPO].get(tipo, 0)) for tipo, rotulo in Evento.TIPO_CHOICES],
+        'por_assistencia': [
+            (rotulo, valores[ASSISTENCIA].get(a, 0)) for a, rotulo in Participante.ASSISTENCIA_CHOICES
+        ],
+        'serie_diaria': [
+            (dia, valores[DIA].get(dia.isoformat(), 0))
+            for dia in (inicio + timedelta(days=n) for n in range(dias))
+        ],
+    }
@@ -0,0 +1,268 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import re
+import tempfile
+import zipfile
+from datetime import timedelta
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import Count, Max, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.encoding import smart_str
+
+from .busca import filtrar_inscricoes
+from .models import Exportacao, Inscricao
+
+CABECALHO = ['Evento', 'Data/Hora', 'Participante', 'Email', 'Telefone', 'Observações', 'Data inscrição']
+
+CAMPOS = (
+    'evento_id',
+    'evento__titulo',
+    'evento__data',
+    'participante__nome',
+    'participante__email',
+    'participante__telefone',
+    'participante__assistencia_detalhes',
+    'data_inscricao',
+)
+
+CHUNK_SIZE = 2000
+
+
+class _Eco:
+    """Pseudo-arquivo: csv.writer devolve a linha formatada em vez de acumulá-la."""
+
+    def write(self, value):
+        return value
+
+
+def linhas_inscricoes(inscricoes, chunk_size=CHUNK_SIZE):
+    """
+    Gera as linhas da exportação a partir de um queryset de Inscricao.
+
+    Lê tuplas com values_list().iterator() para não instanciar nem manter em
+    cache os objetos; título e data de cada evento são formatados uma vez só.
+    """
+    yield CABECALHO
+    eventos = {}
+    for (evento_id, titulo, data, nome, email, telefone,
+         detalhes, data_inscricao) in inscricoes.values_list(*CAMPOS).iterator(chunk_size=chunk_size):
+        evento = eventos.get(evento_id)
+        if evento is None:
+            evento = eventos[evento_id] = (smart_str(titulo), data.strftime('%d/%m/%Y %H:%M'))
+        yield [
+            evento[0],
+            evento[1],
+            smart_str(nome),
+            email,
+            smart_str(telefone),
+            smart_str(detalhes or ''),
+            data_inscricao.strftime('%d/%m/%Y %H:%M'),
+        ]
+
+
+def resposta_csv(inscricoes, filename):
+    # O corpo é lido depois que a view retorna: fixa já o banco escolhido pelo roteador (eventos.replica).
+    inscricoes = inscricoes.using(inscricoes.db)
+    writer = csv.writer(_Eco())
+    response = StreamingHttpResponse(
+        (writer.writerow(linha) for linha in linhas_inscricoes(inscricoes)),
+        content_type='text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Exportações em segundo plano
+
+EXTENSOES = {'CSV': 'csv', 'CSV_GZ': 'csv.gz', 'XLSX': 'xlsx'}
+
+
+def consulta_exportacao(evento_id=None, q=''):
+    return filtrar_inscricoes(Inscricao.objects.order_by('-data_inscricao'), evento_id, q)
+
+
+def hash_filtro(formato, evento_id=None, q=''):
+    chave = json.dumps([formato, evento_id and int(evento_id), (q or '').strip()])
+    return hashlib.sha256(chave.encode()).hexdigest()
+
+
+def _microssegundos(momento):
+    return int(momento.timestamp() * 1_000_000) if momento else 0
+
+
+def versao_dados(qs):
+    """
+    Assinatura barata do conjunto filtrado: muda quando entram ou saem inscrições
+    e quando um evento ou participante exportado é editado (atualizado_em).
+    """
+    agregado = qs.order_by().aggregate(
+        total=Count('id'), ultimo=Max('id'),
+        evento=Max('evento__atualizado_em'), participante=Max('participante__atualizado_em'),
+    )
+    return (
+        f"{agregado['total']}:{agregado['ultimo'] or 0}:"
+        f"{_microssegundos(agregado['evento'])}:{_microssegundos(agregado['participante'])}"
+    )
+
+
+def solicitar_exportacao(formato, evento_id=None, q='', usuario=None):
+    """
+    Devolve uma exportação para os filtros informados.
+
+    Se já existe um arquivo pronto gerado a partir dos mesmos dados, ele é
+    reaproveitado; se há uma exportação igual na fila, ela é devolvida
+    (mesmo que abandonada por um worker: processar_exportacoes a retoma);
+    caso contrário uma nova é enfileirada.
+    """
+    q = (q or '').strip()
+    filtro = hash_filtro(formato, evento_id, q)
+    existentes = Exportacao.objects.filter(filtro_hash=filtro)
+
+    em_andamento = existentes.filter(status__in=['PENDENTE', 'PROCESSANDO']).first()
+    if em_andamento:
+        return em_andamento
+
+    pronta = existentes.filter(status='CONCLUIDO').first()
+    if pronta and pronta.versao_dados == versao_dados(consulta_exportacao(evento_id, q)) \
+            and pronta.arquivo and pronta.arquivo.storage.exists(pronta.arquivo.name):
+        return pronta
+
+    return Exportacao.objects.create(
+        formato=formato,
+        evento_id=evento_id or None,
+        q=q,
+        filtro_hash=filtro,
+        solicitado_por=usuario if usuario is not None and usuario.is_authenticated else None,
+    )
+
+
+_CARACTERES_INVALIDOS_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_ESTATICOS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Inscrições" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _escrever_csv(linhas, destino):
+    texto = io.TextIOWrapper(destino, encoding='utf-8', newline='')
+    writer = csv.writer(texto)
+    total = -1
+    for linha in linhas:
+        writer.writerow(linha)
+        total += 1
+    texto.flush()
+    texto.detach()
+    return total
+
+
+def _escrever_csv_gz(linhas, destino):
+    with gzip.GzipFile(fileobj=destino, mode='wb') as gz:
+        return _escrever_csv(linhas, gz)
+
+
+def _escrever_xlsx(linhas, destino):
+    """Planilha mínima (strings inline), escrita linha a linha sem dependências extras."""
+    total = -1
+    with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for nome, conteudo in _XLSX_ESTATICOS.items():
+            zf.writestr(nome, conteudo)
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as planilha:
+            planilha.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            for linha in linhas:
+                celulas = ''.join(
+                    '<c t="inlineStr"><is><t xml:space="preserve">%s</t></is></c>'
+                    % escape(_CARACTERES_INVALIDOS_XML.sub('', str(valor)))
+                    for valor in linha
+                )
+                planilha.write(f'<row>{celulas}</row>'.encode('utf-8'))
+                total += 1
+            planilha.write(b'</sheetData></worksheet>')
+    return total
+
+
+ESCRITORES = {'CSV': _escrever_csv, 'CSV_GZ': _escrever_csv_gz, 'XLSX': _escrever_xlsx}
+
+
+def gerar_arquivo(exportacao):
+    qs = consulta_exportacao(exportacao.evento_id, exportacao.q)
+    versao = versao_dados(qs)
+    with tempfile.TemporaryFile() as tmp:
+        total = ESCRITORES[exportacao.formato](linhas_inscricoes(qs), tmp)
+        tmp.seek(0)
+        carimbo = timezone.now().strftime('%Y%m%d_%H%M%S')
+        nome = f"inscricoes_{exportacao.pk}_{carimbo}.{EXTENSOES[exportacao.formato]}"
+        exportacao.arquivo.save(nome, File(tmp), save=False)
+    exportacao.total_linhas = total
+    exportacao.versao_dados = versao
+    exportacao.status = 'CONCLUIDO'
+    exportacao.concluido_em = timezone.now()
+    exportacao.erro = ''
+    exportacao.save()
+
+
+def _disponiveis():
+    """PENDENTE, ou PROCESSANDO há mais que a reserva (o worker que a pegou caiu)."""
+    reserva = timedelta(seconds=getattr(settings, 'EXPORTACOES_RESERVA_SEGUNDOS', 1800))
+    abandonada = Q(iniciado_em__lt=timezone.now() - reserva) | Q(iniciado_em__isnull=True)
+    return Q(status='PENDENTE') | (Q(status='PROCESSANDO') & abandonada)
+
+
+def processar_exportacoes(limite=None):
+    """Gera os arquivos das exportações pendentes; devolve as exportações processadas."""
+    processadas = []
+    disponiveis = _disponiveis()
+    pendentes = Exportacao.objects.filter(disponiveis).order_by('criado_em').values_list('pk', flat=True)
+    for pk in list(pendentes[:limite] if limite else pendentes):
+        if not Exportacao.objects.filter(disponiveis, pk=pk).update(status='PROCESSANDO', iniciado_em=timezone.now()):
+            continue
+        exportacao = Exportacao.objects.get(pk=pk)
+        try:
+            gerar_arquivo(exportacao)
+        except Exception as erro:
+            Exportacao.objects.filter(pk=pk).update(status='FALHOU', erro=str(erro)[:2000])
+            exportacao.refresh_from_db()
+        processadas.append(exportacao)
+    return processadas
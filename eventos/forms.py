@@ -1,5 +1,5 @@
 from django import forms
-from .models import Evento, Participante
+from .models import Evento, Participante, Comunicado, Exportacao
 
 class EventoForm(forms.ModelForm):
     data = forms.DateTimeField(
@@ -15,11 +15,18 @@ class EventoForm(forms.ModelForm):
         ),
         label='Data e Hora do Evento'
     )
+    # Não é o campo do modelo: o arquivo vai para staging e é publicado pelo worker (eventos.imagens).
+    imagem = forms.ImageField(
+        required=False,
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': 'image/*'}),
+        label='Imagem'
+    )
+    remover_imagem = forms.BooleanField(required=False, label='Remover imagem atual')
 
     class Meta:
         model = Evento
         fields = ['titulo', 'tipo', 'data', 'local', 'descricao',
-                  'observacao_organizador', 'capacidade', 'imagem']
+                  'observacao_organizador', 'capacidade']
         widgets = {
             'titulo': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Digite o título'}),
             'tipo': forms.Select(attrs={'class': 'form-select'}),
@@ -31,7 +38,6 @@ class EventoForm(forms.ModelForm):
                 'rows': 3
             }),
             'capacidade': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Capacidade máxima'}),
-            'imagem': forms.ClearableFileInput(attrs={'class': 'form-control'}),
         }
 
     def clean_capacidade(self):
@@ -60,11 +66,57 @@ class ParticipanteForm(forms.ModelForm):
 
     def clean(self):
         cleaned = super().clean()
-        assistencia = cleaned.get('assistencia')
-        detalhes = (cleaned.get('assistencia_detalhes') or '').strip()
-
-        if assistencia == 'OUTRA' and not detalhes:
-            self.add_error('assistencia_detalhes', 'Descreva a assistência necessária.')
-        if assistencia != 'OUTRA':
-            cleaned['assistencia_detalhes'] = ''  
+        for campo, mensagem in regra_assistencia(cleaned).items():
+            self.add_error(campo, mensagem)
         return cleaned
+
+
+def regra_assistencia(cleaned):
+    """
+    Regra do ParticipanteForm (também usada na importação de CSV): com "OUTRA" os
+    detalhes são obrigatórios; nos demais casos são descartados. Ajusta
+    `cleaned` e devolve os erros como {campo: mensagem}.
+    """
+    assistencia = cleaned.get('assistencia')
+    detalhes = (cleaned.get('assistencia_detalhes') or '').strip()
+
+    if assistencia != 'OUTRA':
+        cleaned['assistencia_detalhes'] = ''
+    elif not detalhes:
+        return {'assistencia_detalhes': 'Descreva a assistência necessária.'}
+    return {}
+
+
+class ComunicadoForm(forms.ModelForm):
+    class Meta:
+        model = Comunicado
+        fields = ['assunto', 'mensagem']
+        widgets = {
+            'assunto': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Assunto do e-mail'}),
+            'mensagem': forms.Textarea(attrs={
+                'class': 'form-control',
+                'rows': 8,
+                'placeholder': 'Olá, {nome}! ...'
+            }),
+        }
+        help_texts = {
+            'mensagem': 'Use {nome} e {email} para personalizar a mensagem de cada inscrito.',
+        }
+
+
+class ImportacaoForm(forms.Form):
+    arquivo = forms.FileField(
+        label='Arquivo CSV',
+        help_text='Colunas: nome, email, telefone e, opcionalmente, assistencia e assistencia_detalhes (UTF-8).',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,text/csv'}),
+    )
+
+
+class ExportacaoForm(forms.Form):
+    """Filtros de uma exportação em segundo plano (mesmos da lista de inscrições)."""
+    formato = forms.ChoiceField(choices=Exportacao.FORMATO_CHOICES, required=False)
+    evento = forms.ModelChoiceField(queryset=Evento.objects.all(), required=False)
+    q = forms.CharField(max_length=100, required=False)
+
+    def clean_formato(self):
+        return self.cleaned_data.get('formato') or 'CSV'
@@ -0,0 +1,164 @@
+"""
+Pipeline de imagens dos eventos.
+
+O formulário só grava o arquivo enviado na área de staging local e marca o
+evento como PENDENTE; o worker (manage.py processar_imagens) gera com Pillow,
+uma única vez, as variantes dos cards e a versão completa, publica tudo no
+storage 'imagens' (Cloudinary em produção, FileSystemStorage nos testes) e
+guarda nomes e URLs já resolvidas em Evento.imagem_variantes. A renderização
+só lê esse JSON, sem chamadas ao storage.
+
+Ao publicar, o worker invalida o cache da listagem (marcar_alteracao); por isso
+ele precisa do mesmo cache que os processos web, e o comando recusa rodar com
+o LocMemCache, que é de cada processo.
+"""
+import hashlib
+import io
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, storages
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import marcar_alteracao
+from .models import Evento
+
+LARGURAS = (400, 800, 1200)
+PROPORCAO = 9 / 16
+LARGURA_COMPLETA = 1600
+QUALIDADE_JPEG = 82
+
+
+def storage_staging():
+    return FileSystemStorage(location=settings.IMAGENS_STAGING_ROOT)
+
+
+def storage_imagens():
+    return storages['imagens']
+
+
+def cache_compartilhado():
+    """False se o cache é local ao processo: a invalidação feita pelo worker não chegaria à web."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def receber_upload(evento, arquivo):
+    """Grava o upload em staging e enfileira o evento para o worker; a imagem atual segue no ar até lá."""
+    staging = storage_staging()
+    extensao = os.path.splitext(arquivo.name)[1].lower()[:10]
+    nome = staging.save(f"{evento.pk}_{uuid.uuid4().hex}{extensao}", arquivo)
+    anterior = Evento.objects.filter(pk=evento.pk).values_list('imagem_pendente', flat=True).first()
+    Evento.objects.filter(pk=evento.pk).update(imagem_pendente=nome, imagem_status='PENDENTE', imagem_erro='')
+    if anterior:
+        staging.delete(anterior)
+    return nome
+
+
+def remover_imagem(evento):
+    atual = Evento.objects.filter(pk=evento.pk).values_list('imagem_pendente', 'imagem_variantes').first()
+    if atual is None:
+        return
+    Evento.objects.filter(pk=evento.pk).update(
+        imagem=None, imagem_status='', imagem_pendente='', imagem_variantes={}, imagem_erro='',
+    )
+    pendente, variantes = atual
+    if pendente:
+        storage_staging().delete(pendente)
+    descartar_variantes(variantes)
+    marcar_alteracao(evento.pk)
+
+
+def _jpeg(imagem):
+    saida = io.BytesIO()
+    imagem.save(saida, 'JPEG', quality=QUALIDADE_JPEG, optimize=True, progressive=True)
+    return saida.getvalue()
+
+
+def gerar_variantes(arquivo):
+    """
+    Devolve {tamanho: bytes JPEG}: os cortes 16:9 de LARGURAS e a versão
+    'completa' (proporção original, no máximo LARGURA_COMPLETA px).
+
+    O original é decodificado uma vez, já reduzido pelo draft() do JPEG, e os
+    cortes saem da versão completa em vez do arquivo enviado.
+    """
+    with Image.open(arquivo) as original:
+        original.draft('RGB', (LARGURA_COMPLETA, LARGURA_COMPLETA))
+        completa = ImageOps.exif_transpose(original).convert('RGB')
+    completa.thumbnail((LARGURA_COMPLETA, LARGURA_COMPLETA), Image.Resampling.LANCZOS)
+
+    variantes = {'completa': _jpeg(completa)}
+    for largura in LARGURAS:
+        corte = ImageOps.fit(completa, (largura, round(largura * PROPORCAO)), Image.Resampling.LANCZOS)
+        variantes[str(largura)] = _jpeg(corte)
+    return variantes
+
+
+def publicar(evento_id, nome_staging):
+    """Gera as variantes do arquivo em staging e as envia ao storage; devolve {tamanho: {nome, url}}."""
+    with storage_staging().open(nome_staging, 'rb') as arquivo:
+        dados = arquivo.read()
+    assinatura = hashlib.sha256(dados).hexdigest()[:16]
+    storage = storage_imagens()
+    publicadas = {}
+    try:
+        for tamanho, conteudo in gerar_variantes(io.BytesIO(dados)).items():
+            nome = storage.save(f"eventos/{evento_id}/{assinatura}_{tamanho}.jpg", ContentFile(conteudo))
+            publicadas[tamanho] = {'nome': nome, 'url': storage.url(nome)}
+    except Exception:
+        descartar_variantes(publicadas)
+        raise
+    return publicadas
+
+
+def descartar_variantes(variantes):
+    storage = storage_imagens()
+    for variante in (variantes or {}).values():
+        storage.delete(variante['nome'])
+
+
+def _disponiveis():
+    """PENDENTE, ou PROCESSANDO há mais que a reserva (o worker que a pegou caiu)."""
+    reserva = timedelta(seconds=getattr(settings, 'IMAGENS_RESERVA_SEGUNDOS', 600))
+    abandonada = Q(imagem_processando_desde__lt=timezone.now() - reserva) | Q(imagem_processando_desde__isnull=True)
+    return Q(imagem_status='PENDENTE') | (Q(imagem_status='PROCESSANDO') & abandonada)
+
+
+def processar_imagens(limite=None):
+    """Publica as imagens pendentes; devolve os eventos processados."""
+    processados = []
+    disponiveis = _disponiveis()
+    pendentes = (
+        Evento.objects.filter(disponiveis).order_by('pk')
+        .values_list('pk', 'imagem_pendente', 'imagem_variantes')
+    )
+    for pk, nome, anteriores in list(pendentes[:limite] if limite else pendentes):
+        if not Evento.objects.filter(disponiveis, pk=pk, imagem_pendente=nome).update(
+                imagem_status='PROCESSANDO', imagem_processando_desde=timezone.now()):
+            continue
+        try:
+            variantes = publicar(pk, nome)
+        except Exception as erro:
+            Evento.objects.filter(pk=pk, imagem_pendente=nome).update(imagem_status='FALHOU', imagem_erro=str(erro)[:2000])
+        else:
+            # Se outro upload chegou durante o processamento, este resultado é descartado.
+            publicada = Evento.objects.filter(pk=pk, imagem_pendente=nome).update(
+                imagem=None, imagem_status='PRONTA', imagem_pendente='', imagem_variantes=variantes, imagem_erro='',
+            )
+            if publicada:
+                storage_staging().delete(nome)
+                descartar_variantes(anteriores)
+                marcar_alteracao(pk)
+            else:
+                descartar_variantes(variantes)
+        evento = Evento.objects.filter(pk=pk).first()
+        if evento is not None:
+            processados.append(evento)
+    return processados
@@ -0,0 +1,208 @@
+"""
+Importação em massa de inscrições a partir de CSV (listas de parceiros).
+
+O arquivo é lido linha a linha e cada linha é validada pelas regras do
+ParticipanteForm. Participantes são reaproveitados pelo e-mail (sem diferenciar
+maiúsculas, via email_normalizado) por meio de um dicionário e-mail -> id,
+completado a cada bloco com uma consulta sobre os e-mails ainda desconhecidos. Participantes e
+inscrições são gravados com bulk_create em blocos, numa única transação, com a
+linha do evento travada para respeitar a capacidade.
+
+Como bulk_create não dispara sinais, o contador de vagas, as estatísticas do
+dashboard e a versão do cache da listagem são ajustados aqui.
+"""
+import csv
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import estatisticas
+from .cache import marcar_alteracao
+from .forms import ParticipanteForm, regra_assistencia
+from .models import Evento, Inscricao, Participante, normalizar_email, normalizar_telefone
+
+COLUNAS = ['nome', 'email', 'telefone', 'assistencia', 'assistencia_detalhes']
+
+
+@dataclass
+class ResultadoImportacao:
+    linhas: int = 0
+    participantes_criados: int = 0
+    inscricoes_criadas: int = 0
+    ja_inscritos: int = 0
+    erros: list = field(default_factory=list)
+
+    def erro(self, linha, mensagem):
+        self.erros.append((linha, mensagem))
+
+
+def _mensagens(erros):
+    return '; '.join(
+        f"{campo}: {' '.join(mensagens)}" if campo != '__all__' else ' '.join(mensagens)
+        for campo, mensagens in erros.items()
+    )
+
+
+def _ler_linhas(arquivo):
+    leitor = csv.DictReader(arquivo)
+    leitor.fieldnames = [(nome or '').strip().lower() for nome in leitor.fieldnames or []]
+    faltando = {'nome', 'email', 'telefone'} - set(leitor.fieldnames)
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(sorted(faltando))}.")
+    for numero, linha in enumerate(leitor, start=2):
+        dados = {coluna: (linha.get(coluna) or '').strip() for coluna in COLUNAS}
+        dados['assistencia'] = dados['assistencia'].upper() or 'NENHUMA'
+        yield numero, dados
+
+
+_CAMPOS_FORM = ParticipanteForm.base_fields
+_FORA_DO_FORM = [campo.name for campo in Participante._meta.fields if campo.name not in _CAMPOS_FORM]
+
+
+def _validar_linha(dados):
+    """
+    Valida uma linha com as regras do ParticipanteForm: clean() de cada campo
+    do form, regra_assistencia() e full_clean() do modelo, como faz o ModelForm.
+    Montar um form por linha (deepcopy dos campos e widgets) custava mais que o
+    resto da importação. Devolve (dados limpos, erros por campo).
+    """
+    limpos, erros = {}, {}
+    for nome, campo in _CAMPOS_FORM.items():
+        try:
+            limpos[nome] = campo.clean(dados.get(nome, ''))
+        except ValidationError as erro:
+            erros[nome] = erro.messages
+    if erros:
+        return limpos, erros
+    erros = {campo: [mensagem] for campo, mensagem in regra_assistencia(limpos).items()}
+    if not erros:
+        try:
+            Participante(**limpos).full_clean(exclude=_FORA_DO_FORM, validate_unique=False)
+        except ValidationError as erro:
+            erros = erro.message_dict
+    return limpos, erros
+
+
+def _em_blocos(iteravel, tamanho):
+    bloco = []
+    for item in iteravel:
+        bloco.append(item)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def importar_inscricoes(evento, arquivo, lote=2000):
+    """
+    Importa as linhas de `arquivo` (texto CSV com cabeçalho nome,email,telefone
+    e opcionalmente assistencia, assistencia_detalhes) como inscrições em
+    `evento`. Linhas inválidas, repetidas ou além da capacidade entram em
+    `erros` e não interrompem a importação. Levanta ValueError se faltar coluna.
+    """
+    resultado = ResultadoImportacao()
+    linhas = _ler_linhas(arquivo)
+    agora = timezone.now()
+
+    with transaction.atomic():
+        evento = Evento.objects.select_for_update().get(pk=evento.pk)
+        vagas = max(evento.capacidade - evento.vagas_ocupadas, 0)
+        inscritos = set(evento.inscricoes.values_list('participante_id', flat=True))
+        por_email = {}
+        vistos = {}
+        deltas = Counter()
+
+        for bloco in _em_blocos(linhas, lote):
+            validos = []
+            for numero, dados in bloco:
+                resultado.linhas += 1
+                limpos, erros = _validar_linha(dados)
+                if erros:
+                    resultado.erro(numero, _mensagens(erros))
+                    continue
+                chave = normalizar_email(limpos['email'])
+                if chave in vistos:
+                    resultado.erro(numero, f"E-mail repetido no arquivo (linha {vistos[chave]}).")
+                    continue
+                vistos[chave] = numero
+                validos.append((numero, chave, limpos))
+
+            desconhecidos = [chave for _, chave, _ in validos if chave not in por_email]
+            if desconhecidos:
+                por_email.update(
+                    Participante.objects.filter(email_normalizado__in=desconhecidos)
+                    .values_list('email_normalizado', 'pk')
+                )
+
+            novos = {}
+            inscrever = []
+            for numero, chave, dados in validos:
+                participante_id = por_email.get(chave)
+                if participante_id in inscritos:
+                    resultado.ja_inscritos += 1
+                    continue
+                if len(inscrever) >= vagas:
+                    resultado.erro(numero, "Evento esgotado.")
+                    continue
+                if participante_id is None:
+                    novos[chave] = Participante(
+                        nome=dados['nome'],
+                        email=dados['email'],
+                        email_normalizado=chave,
+                        telefone=dados['telefone'],
+                        telefone_digitos=normalizar_telefone(dados['telefone']),
+                        assistencia=dados['assistencia'],
+                        assistencia_detalhes=dados['assistencia_detalhes'],
+                    )
+                inscrever.append(chave)
+
+            # Estatísticas: participantes que recebem aqui a primeira inscrição.
+            primeira = [p.assistencia for p in novos.values()]
+            existentes = {por_email[chave] for chave in inscrever if chave not in novos}
+            if existentes:
+                com_inscricao = set(
+                    Inscricao.objects.filter(participante_id__in=existentes)
+                    .values_list('participante_id', flat=True).distinct()
+                )
+                primeira += Participante.objects.filter(
+                    pk__in=existentes - com_inscricao
+                ).values_list('assistencia', flat=True)
+            for valor in primeira:
+                deltas[estatisticas.GLOBAL, 'participantes'] += 1
+                deltas[estatisticas.ASSISTENCIA, valor] += 1
+
+            for participante in Participante.objects.bulk_create(novos.values()):
+                por_email[participante.email_normalizado] = participante.pk
+            resultado.participantes_criados += len(novos)
+
+            novas = [
+                Inscricao(evento=evento, participante_id=por_email[chave], data_inscricao=agora)
+                for chave in inscrever
+            ]
+            Inscricao.objects.bulk_create(novas)
+            inscritos.update(i.participante_id for i in novas)
+            vagas -= len(novas)
+            resultado.inscricoes_criadas += len(novas)
+
+        criadas = resultado.inscricoes_criadas
+        if criadas:
+            Evento.objects.filter(pk=evento.pk).update(vagas_ocupadas=F('vagas_ocupadas') + criadas)
+            deltas[estatisticas.GLOBAL, 'inscricoes'] += criadas
+            deltas[estatisticas.TIPO, evento.tipo] += criadas
+            deltas[estatisticas.DIA, timezone.localdate(agora).isoformat()] += criadas
+            estatisticas.incrementar(deltas)
+            marcar_alteracao(evento.pk)
+
+    return resultado
+
+
+def escrever_relatorio(resultado, destino):
+    """Relatório de erros por linha em CSV."""
+    writer = csv.writer(destino)
+    writer.writerow(['linha', 'erro'])
+    writer.writerows(resultado.erros)
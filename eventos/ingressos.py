@@ -0,0 +1,48 @@
+"""
+Tokens dos ingressos.
+
+O link do ingresso leva um token assinado (HMAC com a SECRET_KEY) com o id da
+inscrição e do evento, em vez do id sequencial: não dá para chegar ao ingresso
+de outra pessoa trocando o número, e um token adulterado é recusado sem
+consultar o banco. O id do evento permite montar a chave de cache do ingresso
+(versão do evento) antes de qualquer consulta.
+
+O mesmo token vai no QR code do ingresso, lido no check-in (eventos/checkin.py).
+"""
+import hashlib
+
+import qrcode
+from qrcode.image.svg import SvgPathImage
+from django.core import signing
+from django.core.cache import cache
+
+SALT = 'eventos.ingresso'
+
+
+def gerar_token(inscricao):
+    return token_para(inscricao.pk, inscricao.evento_id)
+
+
+def token_para(inscricao_id, evento_id):
+    return signing.dumps([inscricao_id, evento_id], salt=SALT)
+
+
+def ler_token(token):
+    """Devolve (inscricao_id, evento_id), ou None se o token for inválido."""
+    try:
+        inscricao_id, evento_id = signing.loads(token, salt=SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    if not isinstance(inscricao_id, int) or not isinstance(evento_id, int):
+        return None
+    return inscricao_id, evento_id
+
+
+def qr_svg(token):
+    """SVG do QR code com o token, gerado localmente e guardado no cache (não muda para o mesmo token)."""
+    def gerar():
+        imagem = qrcode.make(token, image_factory=SvgPathImage, error_correction=qrcode.constants.ERROR_CORRECT_M)
+        return imagem.to_string(encoding='unicode')
+
+    chave = 'eventos:qr:' + hashlib.md5(token.encode()).hexdigest()
+    return cache.get_or_set(chave, gerar, None)
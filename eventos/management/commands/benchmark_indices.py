@@ -0,0 +1,113 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from eventos.models import Evento, Inscricao, Participante
+from eventos.semeadura import semear
+from eventos.views import filtrar_por_dia
+
+
+class _Desfazer(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede as consultas de cada view com e sem os índices de Meta.indexes "
+        "(EXPLAIN + tempos). Os índices são removidos dentro de uma transação "
+        "desfeita ao final, portanto o banco volta ao estado original."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--semear', action='store_true',
+                            help="Cria dados sintéticos antes de medir (não use em produção).")
+        parser.add_argument('--inscricoes', type=int, default=1_000_000)
+        parser.add_argument('--eventos', type=int, default=2000)
+        parser.add_argument('--repeticoes', type=int, default=20)
+        parser.add_argument('--sem-explain', action='store_true', help="Mostra apenas os tempos.")
+
+    def handle(self, *args, **options):
+        if options['semear']:
+            if not settings.DEBUG and 'test' not in str(connection.settings_dict['NAME']):
+                self.stdout.write(self.style.WARNING("DEBUG=False: confira se este não é o banco de produção."))
+            self.stdout.write(f"Semeando {options['inscricoes']} inscrições em {options['eventos']} eventos...")
+            semear(eventos=options['eventos'], inscricoes=options['inscricoes'])
+
+        evento = Evento.objects.annotate(total=Count('inscricoes')).order_by('-total').first()
+        participante = Participante.objects.order_by('-pk').first()
+        if not (evento and participante):
+            raise CommandError("Banco vazio: rode com --semear.")
+
+        consultas = self._consultas(evento, participante)
+
+        # "Sem índices" roda primeiro, numa conexão nova: o SQLite reaproveita
+        # planos de instruções já preparadas mesmo depois de um DROP INDEX.
+        connection.close()
+        self.stdout.write(self.style.MIGRATE_HEADING("Sem índices"))
+        sem = {}
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in (Evento, Inscricao, Participante):
+                        for index in model._meta.indexes:
+                            cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+                sem = self._medir(consultas, options)
+                raise _Desfazer()
+        except _Desfazer:
+            pass
+        connection.close()
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Com índices"))
+        com = self._medir(consultas, options)
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Resumo (mediana em ms)"))
+        for nome in consultas:
+            ganho = sem[nome] / com[nome] if com[nome] else 0
+            self.stdout.write(f"{nome:<32} sem={sem[nome]:>9.2f}  com={com[nome]:>9.2f}  ({ganho:.1f}x)")
+
+    def _consultas(self, evento, participante):
+        agora = timezone.now()
+        hoje = timezone.localdate(evento.data).isoformat()
+        return {
+            'EventoListView': lambda: Evento.objects.filter(data__gte=agora).order_by('data'),
+            'EventoListView ?data=': lambda: filtrar_por_dia(Evento.objects.order_by('data'), hoje),
+            'DashboardView próximos': lambda: (
+                Evento.objects.filter(data__gte=agora).annotate(total=Count('inscricoes')).order_by('data')[:5]
+            ),
+            'ListaInscritosView': lambda: (
+                Inscricao.objects.filter(evento_id=evento.pk).select_related('participante')
+                .order_by('data_inscricao')
+            ),
+            'InscricoesAdminListView ?evento': lambda: (
+                Inscricao.objects.filter(evento_id=evento.pk).select_related('evento', 'participante')
+                .order_by('-data_inscricao')[:20]
+            ),
+            'Inscrição: email_normalizado': lambda: (
+                Participante.objects.filter(email_normalizado=participante.email_normalizado)[:1]
+            ),
+            'Inscrição: recentes 24h': lambda: (
+                Inscricao.objects.filter(evento_id=evento.pk, data_inscricao__gte=agora - timedelta(days=1))
+                .order_by('data_inscricao')
+            ),
+        }
+
+    def _medir(self, consultas, options):
+        medianas = {}
+        for nome, fabrica in consultas.items():
+            if not options['sem_explain']:
+                self.stdout.write(self.style.SQL_TABLE(nome))
+                self.stdout.write('  ' + fabrica().explain().replace('\n', '\n  '))
+            amostras = []
+            for _ in range(options['repeticoes']):
+                inicio = time.perf_counter()
+                list(fabrica())
+                amostras.append((time.perf_counter() - inicio) * 1000)
+            medianas[nome] = statistics.median(amostras)
+            self.stdout.write(f"  {nome}: mediana {medianas[nome]:.2f} ms ({options['repeticoes']} execuções)")
+        return medianas
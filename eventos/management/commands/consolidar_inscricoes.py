@@ -0,0 +1,29 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from eventos.analise import consolidar
+
+
+class Command(BaseCommand):
+    help = (
+        "Consolida as inscrições por evento e hora (InscricoesHora) usadas nos gráficos do dashboard. "
+        "Por padrão refaz só os últimos dias, o que também absorve cancelamentos recentes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=2, help="Quantos dias para trás refazer.")
+        parser.add_argument('--completo', action='store_true', help="Refaz todo o histórico.")
+        parser.add_argument('--continuo', action='store_true', help="Repete a cada --intervalo segundos.")
+        parser.add_argument('--intervalo', type=float, default=600.0)
+
+    def handle(self, *args, **options):
+        while True:
+            desde = None if options['completo'] else timezone.now() - timedelta(days=options['dias'])
+            total = consolidar(desde)
+            self.stdout.write(self.style.SUCCESS(f"{total} hora(s) consolidada(s)."))
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
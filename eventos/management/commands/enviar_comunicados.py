@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eventos.comunicados import criar_reservado, enviar_comunicado, processar_comunicados
+from eventos.models import Evento
+
+
+class Command(BaseCommand):
+    help = "Envia comunicados aos inscritos de um evento em lotes por uma única conexão SMTP."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--evento', type=int, help="Cria e envia um comunicado para este evento.")
+        parser.add_argument('--assunto', help="Assunto do comunicado (com --evento).")
+        parser.add_argument('--mensagem', help="Texto do comunicado; aceita {nome} e {email} (com --evento).")
+        parser.add_argument('--lote', type=int, default=100, help="Mensagens por chamada a send_messages.")
+        parser.add_argument('--taxa', type=float, default=None,
+                            help="Máximo de mensagens por segundo (padrão: COMUNICADO_MAX_POR_SEGUNDO).")
+        parser.add_argument('--continuo', action='store_true', help="Fica aguardando novos comunicados.")
+        parser.add_argument('--intervalo', type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        if options['evento']:
+            if not (options['assunto'] and options['mensagem']):
+                raise CommandError("Informe --assunto e --mensagem junto com --evento.")
+            try:
+                evento = Evento.objects.get(pk=options['evento'])
+            except Evento.DoesNotExist:
+                raise CommandError(f"Evento {options['evento']} não encontrado.")
+            # Criado já reservado: um worker --continuo não o envia em paralelo.
+            comunicado = criar_reservado(evento, options['assunto'], options['mensagem'])
+            self._relatar(enviar_comunicado(comunicado, lote=options['lote'], taxa=options['taxa']))
+            return
+
+        while True:
+            for comunicado in processar_comunicados(lote=options['lote'], taxa=options['taxa']):
+                self._relatar(comunicado)
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
+
+    def _relatar(self, comunicado):
+        resumo = (
+            f'"{comunicado.assunto}" ({comunicado.evento.titulo}): '
+            f'{comunicado.enviados}/{comunicado.total} enviados, {comunicado.falhas} falha(s).'
+        )
+        if comunicado.status == 'CONCLUIDO':
+            self.stdout.write(self.style.SUCCESS(resumo))
+        else:
+            self.stdout.write(self.style.WARNING(f"{resumo} Interrompido, será retomado: {comunicado.ultimo_erro}"))
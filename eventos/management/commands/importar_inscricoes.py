@@ -0,0 +1,50 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eventos.importacao import escrever_relatorio, importar_inscricoes
+from eventos.models import Evento
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa inscrições de um CSV (colunas nome, email, telefone e, opcionalmente, "
+        "assistencia e assistencia_detalhes) para um evento."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('evento', type=int, help="ID do evento.")
+        parser.add_argument('arquivo', help="Caminho do CSV.")
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument('--lote', type=int, default=2000)
+        parser.add_argument('--relatorio', help="Grava os erros por linha neste CSV (padrão: saída de erro).")
+
+    def handle(self, *args, **options):
+        try:
+            evento = Evento.objects.get(pk=options['evento'])
+        except Evento.DoesNotExist:
+            raise CommandError(f"Evento {options['evento']} não existe.")
+
+        inicio = time.perf_counter()
+        try:
+            with open(options['arquivo'], encoding=options['encoding'], newline='') as arquivo:
+                resultado = importar_inscricoes(evento, arquivo, lote=options['lote'])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        except csv.Error as exc:
+            raise CommandError(f"CSV inválido: {exc}.")
+        duracao = time.perf_counter() - inicio
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.linhas} linha(s) em {duracao:.1f}s: {resultado.inscricoes_criadas} inscrição(ões) criada(s), "
+            f"{resultado.participantes_criados} participante(s) novo(s), {resultado.ja_inscritos} já inscrito(s), "
+            f"{len(resultado.erros)} erro(s)."
+        ))
+        if resultado.erros:
+            if options['relatorio']:
+                with open(options['relatorio'], 'w', encoding='utf-8', newline='') as destino:
+                    escrever_relatorio(resultado, destino)
+                self.stdout.write(f"Erros gravados em {options['relatorio']}.")
+            else:
+                escrever_relatorio(resultado, self.stderr)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from eventos.deduplicacao import grupos_duplicados, mesclar_duplicados
+
+
+class Command(BaseCommand):
+    help = (
+        "Mescla participantes com o mesmo e-mail (ignorando maiúsculas e espaços), "
+        "mantendo o mais antigo e transferindo as inscrições dos demais."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--simular', action='store_true',
+            help="Apenas lista os grupos de duplicados, sem alterar nada.",
+        )
+
+    def handle(self, *args, **options):
+        if options['simular']:
+            grupos = grupos_duplicados()
+            for chave, manter, n in grupos:
+                self.stdout.write(f"{chave}: {n} cadastros (mantém #{manter})")
+            self.stdout.write(f"{len(grupos)} grupo(s) de duplicados.")
+            return
+        grupos, removidos = mesclar_duplicados()
+        self.stdout.write(self.style.SUCCESS(
+            f"{grupos} grupo(s) mesclado(s), {removidos} participante(s) removido(s)."
+        ))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eventos.emails import processar_fila
+
+
+class Command(BaseCommand):
+    help = "Envia os e-mails pendentes da fila em lotes, reutilizando uma conexão SMTP por lote."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=50, help="Quantidade de e-mails por conexão SMTP.")
+        parser.add_argument('--continuo', action='store_true', help="Continua drenando a fila indefinidamente.")
+        parser.add_argument('--intervalo', type=float, default=5.0,
+                            help="Segundos de espera quando a fila está vazia (modo contínuo).")
+
+    def handle(self, *args, **options):
+        total_enviados = total_falhas = 0
+        while True:
+            enviados, falhas = processar_fila(lote=options['lote'])
+            total_enviados += enviados
+            total_falhas += falhas
+            if enviados or falhas:
+                self.stdout.write(f"Lote: {enviados} enviado(s), {falhas} falha(s).")
+            if not (enviados or falhas):
+                if not options['continuo']:
+                    break
+                time.sleep(options['intervalo'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Fila processada: {total_enviados} enviado(s), {total_falhas} falha(s)."
+        ))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from eventos.exportacao import processar_exportacoes
+
+
+class Command(BaseCommand):
+    help = "Gera os arquivos (CSV, CSV.gz, XLSX) das exportações solicitadas pelos organizadores."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help="Fica aguardando novas exportações.")
+        parser.add_argument('--intervalo', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            for exportacao in processar_exportacoes():
+                if exportacao.status == 'CONCLUIDO':
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{exportacao}: {exportacao.total_linhas} linha(s) em {exportacao.arquivo.name}"
+                    ))
+                else:
+                    self.stderr.write(f"{exportacao}: falhou ({exportacao.erro})")
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
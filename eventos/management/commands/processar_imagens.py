@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from eventos.imagens import cache_compartilhado, processar_imagens
+
+
+class Command(BaseCommand):
+    help = "Gera as variantes das imagens enviadas e as publica no storage de imagens."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help="Fica aguardando novas imagens.")
+        parser.add_argument('--intervalo', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        if not cache_compartilhado():
+            raise CommandError(
+                "O cache padrão é o LocMemCache, local a cada processo: as páginas não veriam as imagens "
+                "publicadas por este worker. Configure CACHE_BACKEND/CACHE_LOCATION (Redis ou FileBasedCache) "
+                "igual ao dos processos web."
+            )
+        while True:
+            for evento in processar_imagens():
+                if evento.imagem_status == 'PRONTA':
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{evento}: {len(evento.imagem_variantes)} variante(s) publicada(s)"
+                    ))
+                elif evento.imagem_status == 'FALHOU':
+                    self.stderr.write(f"{evento}: falhou ({evento.imagem_erro})")
+            if not options['continuo']:
+                break
+            time.sleep(options['intervalo'])
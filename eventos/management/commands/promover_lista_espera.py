@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from eventos.models import Evento
+from eventos.vagas import promover_da_espera
+
+
+class Command(BaseCommand):
+    help = (
+        "Promove a lista de espera dos eventos com vagas livres. A promoção já acontece a cada "
+        "cancelamento ou aumento de capacidade; este comando cobre falhas nesse caminho."
+    )
+
+    def handle(self, *args, **options):
+        eventos = (
+            Evento.objects.filter(vagas_ocupadas__lt=F('capacidade'), lista_espera__isnull=False)
+            .distinct().values_list('pk', flat=True)
+        )
+        total = sum(len(promover_da_espera(pk)) for pk in eventos)
+        self.stdout.write(self.style.SUCCESS(f"{total} inscrição(ões) promovida(s) da lista de espera."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from eventos.estatisticas import reconstruir
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula as estatísticas do dashboard (tabela Contador) e as vagas ocupadas "
+        "de cada evento a partir das inscrições. Use após cargas em massa."
+    )
+
+    def handle(self, *args, **options):
+        total = reconstruir()
+        self.stdout.write(self.style.SUCCESS(f"{total} contador(es) recalculado(s)."))
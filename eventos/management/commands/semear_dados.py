@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from eventos.semeadura import semear
+
+
+def _banco_descartavel():
+    # Bancos de teste: o nome ganha "test" (test_<NAME>) ou, no SQLite, o banco fica em memória.
+    if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+        return True
+    return 'test' in str(connection.settings_dict['NAME'])
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria eventos, participantes e inscrições sintéticos para testes de carga "
+        "e para a suíte de benchmarks (não use em produção)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--eventos', type=int, default=10_000)
+        parser.add_argument('--inscricoes', type=int, default=1_000_000)
+        parser.add_argument('--participantes', type=int, default=None,
+                            help="Padrão: o mínimo para ninguém se inscrever duas vezes no mesmo evento.")
+        parser.add_argument('--passados', type=float, default=0.3, help="Fração dos eventos que fica no passado.")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--lote', type=int, default=5000)
+        parser.add_argument('--forcar', action='store_true',
+                            help="Semeia mesmo com DEBUG=False num banco que não parece ser de teste.")
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not _banco_descartavel() and not options['forcar']:
+            raise CommandError(
+                f"DEBUG=False e o banco {connection.settings_dict['NAME']!r} não parece ser de teste; "
+                "se não for o de produção, repita com --forcar."
+            )
+        totais = semear(
+            eventos=options['eventos'],
+            inscricoes=options['inscricoes'],
+            participantes=options['participantes'],
+            lote=options['lote'],
+            seed=options['seed'],
+            passados=options['passados'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{totais['eventos']} eventos, {totais['participantes']} participantes e "
+            f"{totais['inscricoes']} inscrições criados."
+        ))
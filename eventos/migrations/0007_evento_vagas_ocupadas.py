@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:51
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remover_inscricoes_duplicadas(apps, schema_editor):
+    Inscricao = apps.get_model('eventos', 'Inscricao')
+    duplicadas = (
+        Inscricao.objects.values('evento_id', 'participante_id')
+        .annotate(n=Count('id'), manter=Min('id'))
+        .filter(n__gt=1)
+    )
+    for dup in duplicadas:
+        (Inscricao.objects
+         .filter(evento_id=dup['evento_id'], participante_id=dup['participante_id'])
+         .exclude(pk=dup['manter'])
+         .delete())
+
+
+def preencher_vagas_ocupadas(apps, schema_editor):
+    Evento = apps.get_model('eventos', 'Evento')
+    for evento in Evento.objects.annotate(total=Count('inscricoes')).iterator():
+        Evento.objects.filter(pk=evento.pk).update(vagas_ocupadas=evento.total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0006_rename_observacoes_participante_assistencia_detalhes_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='vagas_ocupadas',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(remover_inscricoes_duplicadas, migrations.RunPython.noop),
+        migrations.RunPython(preencher_vagas_ocupadas, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='inscricao',
+            constraint=models.UniqueConstraint(fields=('evento', 'participante'), name='inscricao_unica_por_evento'),
+        ),
+    ]
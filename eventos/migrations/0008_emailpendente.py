@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0007_evento_vagas_ocupadas'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assunto', models.CharField(max_length=255)),
+                ('corpo', models.TextField()),
+                ('corpo_html', models.TextField(blank=True, default='')),
+                ('remetente', models.CharField(blank=True, default='', max_length=255)),
+                ('destinatarios', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('ENVIADO', 'Enviado'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=10)),
+                ('tentativas', models.PositiveIntegerField(default=0)),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ultimo_erro', models.TextField(blank=True, default='')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('enviado_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='email_fila_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0008_emailpendente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Comunicado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assunto', models.CharField(max_length=255)),
+                ('mensagem', models.TextField()),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('ENVIANDO', 'Enviando'), ('CONCLUIDO', 'Concluído')], default='PENDENTE', max_length=10)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('enviados', models.PositiveIntegerField(default=0)),
+                ('falhas', models.PositiveIntegerField(default=0)),
+                ('ultima_inscricao_id', models.BigIntegerField(default=0)),
+                ('ultimo_erro', models.TextField(blank=True, default='')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comunicados', to='eventos.evento')),
+            ],
+            options={
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
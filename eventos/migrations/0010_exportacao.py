@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:56
+
+import django.db.models.deletion
+import eventos.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0009_comunicado'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Exportacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('formato', models.CharField(choices=[('CSV', 'CSV'), ('CSV_GZ', 'CSV compactado (.csv.gz)'), ('XLSX', 'Excel (.xlsx)')], default='CSV', max_length=10)),
+                ('q', models.CharField(blank=True, default='', max_length=100)),
+                ('filtro_hash', models.CharField(db_index=True, max_length=64)),
+                ('versao_dados', models.CharField(blank=True, default='', max_length=64)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('CONCLUIDO', 'Concluído'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=12)),
+                ('arquivo', models.FileField(blank=True, storage=eventos.models.storage_exportacoes, upload_to='')),
+                ('total_linhas', models.PositiveIntegerField(default=0)),
+                ('erro', models.TextField(blank=True, default='')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('concluido_em', models.DateTimeField(blank=True, null=True)),
+                ('evento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='exportacoes', to='eventos.evento')),
+                ('solicitado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-criado_em'],
+            },
+        ),
+    ]
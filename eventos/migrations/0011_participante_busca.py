@@ -0,0 +1,92 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:58
+
+import re
+
+from django.db import DatabaseError, migrations, models, transaction
+
+TABELA_FTS = 'eventos_participante_busca'
+
+SQLITE_CRIAR = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_FTS} USING fts5(
+        nome, email, content='eventos_participante', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ai AFTER INSERT ON eventos_participante BEGIN
+        INSERT INTO {TABELA_FTS}(rowid, nome, email) VALUES (new.id, new.nome, new.email);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_ad AFTER DELETE ON eventos_participante BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, nome, email) VALUES ('delete', old.id, old.nome, old.email);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_FTS}_au AFTER UPDATE OF nome, email ON eventos_participante BEGIN
+        INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, nome, email) VALUES ('delete', old.id, old.nome, old.email);
+        INSERT INTO {TABELA_FTS}(rowid, nome, email) VALUES (new.id, new.nome, new.email);
+    END""",
+    f"INSERT INTO {TABELA_FTS}({TABELA_FTS}) VALUES ('rebuild')",
+]
+
+SQLITE_REMOVER = [
+    f"DROP TRIGGER IF EXISTS {TABELA_FTS}_ai",
+    f"DROP TRIGGER IF EXISTS {TABELA_FTS}_ad",
+    f"DROP TRIGGER IF EXISTS {TABELA_FTS}_au",
+    f"DROP TABLE IF EXISTS {TABELA_FTS}",
+]
+
+# Índices sobre UPPER(col), a mesma expressão que o icontains gera no PostgreSQL.
+POSTGRES_CRIAR = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS participante_nome_trgm ON eventos_participante USING gin (UPPER(nome) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS participante_email_trgm ON eventos_participante USING gin (UPPER(email) gin_trgm_ops)",
+]
+
+POSTGRES_REMOVER = [
+    "DROP INDEX IF EXISTS participante_nome_trgm",
+    "DROP INDEX IF EXISTS participante_email_trgm",
+]
+
+
+def preencher_telefone_digitos(apps, schema_editor):
+    Participante = apps.get_model('eventos', 'Participante')
+    for pk, telefone in Participante.objects.values_list('pk', 'telefone').iterator():
+        Participante.objects.filter(pk=pk).update(telefone_digitos=re.sub(r'\D', '', telefone or '')[:20])
+
+
+def _executar(schema_editor, comandos):
+    for sql in comandos:
+        schema_editor.execute(sql)
+
+
+def criar_indices_busca(apps, schema_editor):
+    # Sem pg_trgm (permissão) ou sem FTS5 com trigram (SQLite < 3.34), a busca
+    # continua funcionando com icontains; só não ganha índice.
+    comandos = {'postgresql': POSTGRES_CRIAR, 'sqlite': SQLITE_CRIAR}.get(schema_editor.connection.vendor)
+    if not comandos:
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            _executar(schema_editor, comandos)
+    except DatabaseError:
+        pass
+
+
+def remover_indices_busca(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _executar(schema_editor, POSTGRES_REMOVER)
+    elif vendor == 'sqlite':
+        _executar(schema_editor, SQLITE_REMOVER)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0010_exportacao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participante',
+            name='telefone_digitos',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=20),
+        ),
+        migrations.RunPython(preencher_telefone_digitos, migrations.RunPython.noop),
+        migrations.RunPython(criar_indices_busca, remover_indices_busca),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0011_participante_busca'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['data'], name='evento_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['evento', 'data_inscricao'], name='inscricao_evento_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participante',
+            index=models.Index(django.db.models.functions.text.Upper('email'), name='participante_email_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0012_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['data_inscricao', 'id'], name='inscricao_data_id_idx'),
+        ),
+    ]
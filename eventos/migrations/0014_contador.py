@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+def preencher_contadores(apps, schema_editor):
+    from eventos.estatisticas import reconstruir
+    reconstruir(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0013_inscricao_data_id_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Contador',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('escopo', models.CharField(max_length=20)),
+                ('chave', models.CharField(max_length=50)),
+                ('valor', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('escopo', 'chave'), name='contador_escopo_chave')],
+            },
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
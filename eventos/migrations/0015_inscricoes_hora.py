@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0014_contador'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InscricoesHora',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hora', models.DateTimeField()),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inscricoes_por_hora', to='eventos.evento')),
+            ],
+            options={
+                'ordering': ['evento', 'hora'],
+                'constraints': [models.UniqueConstraint(fields=('evento', 'hora'), name='inscricoes_hora_unica')],
+            },
+        ),
+    ]
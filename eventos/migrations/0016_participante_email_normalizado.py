@@ -0,0 +1,147 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:15
+
+import importlib
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+
+busca = importlib.import_module('eventos.migrations.0011_participante_busca')
+
+# Cópia congelada de eventos.models.normalizar_email e da mescla de eventos.deduplicacao
+# como estavam nesta migração: mudanças nesses módulos não podem alterá-la.
+
+
+def _normalizar(email):
+    return (email or '').strip().lower() or None
+
+
+def _recontar(apps):
+    """Vagas ocupadas e contadores do dashboard, como eventos.estatisticas.reconstruir() nesta migração."""
+    Evento = apps.get_model('eventos', 'Evento')
+    Inscricao = apps.get_model('eventos', 'Inscricao')
+    Participante = apps.get_model('eventos', 'Participante')
+    Contador = apps.get_model('eventos', 'Contador')
+
+    por_evento = (
+        Inscricao.objects.filter(evento=OuterRef('pk')).order_by()
+        .values('evento').annotate(n=Count('pk')).values('n')
+    )
+    Evento.objects.update(vagas_ocupadas=Coalesce(Subquery(por_evento), Value(0)))
+
+    com_inscricao = Participante.objects.filter(pk__in=Inscricao.objects.values('participante_id'))
+    totais = Evento.objects.aggregate(eventos=Count('pk'), capacidade=Sum('capacidade'))
+    contadores = [
+        Contador(escopo='global', chave='eventos', valor=totais['eventos']),
+        Contador(escopo='global', chave='capacidade', valor=totais['capacidade'] or 0),
+        Contador(escopo='global', chave='inscricoes', valor=Inscricao.objects.count()),
+        Contador(escopo='global', chave='participantes', valor=com_inscricao.count()),
+    ]
+    contadores += [
+        Contador(escopo='tipo', chave=linha['evento__tipo'], valor=linha['n'])
+        for linha in Inscricao.objects.order_by().values('evento__tipo').annotate(n=Count('pk'))
+    ]
+    contadores += [
+        Contador(escopo='assistencia', chave=linha['assistencia'], valor=linha['n'])
+        for linha in com_inscricao.order_by().values('assistencia').annotate(n=Count('pk'))
+    ]
+    contadores += [
+        Contador(escopo='dia', chave=linha['dia'].isoformat(), valor=linha['n'])
+        for linha in Inscricao.objects.annotate(dia=TruncDate('data_inscricao'))
+        .order_by().values('dia').annotate(n=Count('pk'))
+    ]
+    Contador.objects.all().delete()
+    Contador.objects.bulk_create(contadores)
+
+
+def _em_blocos(itens, tamanho=500):
+    for i in range(0, len(itens), tamanho):
+        yield itens[i:i + tamanho]
+
+
+def _mesclar(apps, grupos):
+    """`grupos`: [(id mantido, ids duplicados)]; as inscrições dos duplicados passam para o mantido."""
+    Participante = apps.get_model('eventos', 'Participante')
+    Inscricao = apps.get_model('eventos', 'Inscricao')
+
+    destino = {pk: manter for manter, duplicados in grupos for pk in duplicados}
+    eventos_mantidos = {}
+    for participante_id, evento_id in Inscricao.objects.filter(
+        participante_id__in=set(destino.values())
+    ).values_list('participante_id', 'evento_id'):
+        eventos_mantidos.setdefault(participante_id, set()).add(evento_id)
+
+    conflitos, repontar = [], {}
+    for pk, participante_id, evento_id in Inscricao.objects.filter(
+        participante_id__in=destino
+    ).order_by('pk').values_list('pk', 'participante_id', 'evento_id'):
+        novo = destino[participante_id]
+        eventos = eventos_mantidos.setdefault(novo, set())
+        if evento_id in eventos:
+            conflitos.append(pk)
+        else:
+            eventos.add(evento_id)
+            repontar.setdefault(novo, []).append(pk)
+
+    Inscricao.objects.filter(pk__in=conflitos).delete()
+    for novo, inscricoes in repontar.items():
+        Inscricao.objects.filter(pk__in=inscricoes).update(participante_id=novo)
+    Participante.objects.filter(pk__in=destino).delete()
+
+
+def mesclar_e_preencher(apps, schema_editor):
+    """
+    Agrupa os participantes pelo e-mail normalizado em Python (a mesma regra do
+    save(); no SQLite LOWER() só converte ASCII), mantém o de menor id de cada
+    grupo com as inscrições dos demais e preenche email_normalizado.
+    """
+    Participante = apps.get_model('eventos', 'Participante')
+
+    por_chave = {}
+    for pk, email in Participante.objects.order_by('pk').values_list('pk', 'email').iterator():
+        chave = _normalizar(email)
+        if chave is not None:
+            por_chave.setdefault(chave, []).append(pk)
+
+    grupos = [(pks[0], pks[1:]) for pks in por_chave.values() if len(pks) > 1]
+    for bloco in _em_blocos(grupos):
+        _mesclar(apps, bloco)
+    if grupos:
+        _recontar(apps)
+
+    mantidos = [Participante(pk=pks[0], email_normalizado=chave) for chave, pks in por_chave.items()]
+    Participante.objects.bulk_update(mantidos, ['email_normalizado'], batch_size=500)
+
+
+def recriar_gatilhos_busca(apps, schema_editor):
+    # No SQLite o AlterField abaixo recria a tabela eventos_participante, o que
+    # descarta os gatilhos que mantêm o índice FTS da busca (0011).
+    if schema_editor.connection.vendor == 'sqlite':
+        busca.criar_indices_busca(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0015_inscricoes_hora'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='participante',
+            name='email_normalizado',
+            field=models.CharField(editable=False, max_length=254, null=True),
+        ),
+        migrations.RunPython(mesclar_e_preencher, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='participante',
+            name='email_normalizado',
+            field=models.CharField(editable=False, max_length=254, null=True, unique=True),
+        ),
+        migrations.RunPython(recriar_gatilhos_busca, migrations.RunPython.noop),
+        # A busca por e-mail passa a ser igualdade em email_normalizado.
+        migrations.RemoveIndex(
+            model_name='participante',
+            name='participante_email_upper_idx',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0016_participante_email_normalizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListaEspera',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_entrada', models.DateTimeField(default=django.utils.timezone.now)),
+                ('evento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lista_espera', to='eventos.evento')),
+                ('participante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='esperas', to='eventos.participante')),
+            ],
+            options={
+                'ordering': ['data_entrada', 'id'],
+                'indexes': [models.Index(fields=['evento', 'data_entrada', 'id'], name='espera_fila_idx')],
+                'constraints': [models.UniqueConstraint(fields=('evento', 'participante'), name='espera_unica_por_evento')],
+            },
+        ),
+    ]
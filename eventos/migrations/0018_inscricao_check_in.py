@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0017_lista_espera'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inscricao',
+            name='check_in_em',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
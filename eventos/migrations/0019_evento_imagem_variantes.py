@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0018_inscricao_check_in'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='imagem_erro',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='imagem_pendente',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='imagem_status',
+            field=models.CharField(blank=True, choices=[('', 'Sem imagem nova'), ('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('PRONTA', 'Pronta'), ('FALHOU', 'Falhou')], default='', editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name='evento',
+            name='imagem_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
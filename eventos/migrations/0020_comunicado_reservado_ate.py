@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0019_evento_imagem_variantes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunicado',
+            name='reservado_ate',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
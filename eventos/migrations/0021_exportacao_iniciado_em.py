@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0020_comunicado_reservado_ate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exportacao',
+            name='iniciado_em',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def preencher_sincronizado_em(apps, schema_editor):
+    Inscricao = apps.get_model('eventos', 'Inscricao')
+    Inscricao.objects.filter(check_in_em__isnull=False).update(check_in_sincronizado_em=F('check_in_em'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0021_exportacao_iniciado_em'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inscricao',
+            name='check_in_sincronizado_em',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(preencher_sincronizado_em, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='inscricao',
+            index=models.Index(fields=['evento', 'check_in_sincronizado_em'], name='inscricao_evento_sinc_idx'),
+        ),
+    ]
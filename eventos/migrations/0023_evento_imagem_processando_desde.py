@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0022_inscricao_check_in_sincronizado_em'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='imagem_processando_desde',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
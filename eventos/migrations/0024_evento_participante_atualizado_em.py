@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 17:10
+
+import importlib
+
+from django.db import migrations, models
+
+busca = importlib.import_module('eventos.migrations.0011_participante_busca')
+
+
+def recriar_gatilhos_busca(apps, schema_editor):
+    # No SQLite o AddField recria a tabela eventos_participante e descarta os gatilhos da busca (0011).
+    if schema_editor.connection.vendor == 'sqlite':
+        busca.criar_indices_busca(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('eventos', '0023_evento_imagem_processando_desde'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evento',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='participante',
+            name='atualizado_em',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(recriar_gatilhos_busca, migrations.RunPython.noop),
+    ]
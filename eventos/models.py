@@ -1,8 +1,34 @@
+import os
+import re
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
 from django.db import models
 from django.utils import timezone
 from cloudinary.models import CloudinaryField
 
-class Evento(models.Model):
+from .ingressos import gerar_token
+
+def normalizar_telefone(telefone):
+    return re.sub(r'\D', '', telefone or '')[:20]
+
+
+def normalizar_email(email):
+    """Chave única do participante: e-mail sem espaços e em minúsculas (None se vazio)."""
+    return (email or '').strip().lower() or None
+
+
+class ValoresCarregadosMixin:
+    """Guarda os valores lidos do banco em `_carregado`, para os sinais saberem o que mudou."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._carregado = dict(zip(field_names, values))
+        return instance
+
+
+class Evento(ValoresCarregadosMixin, models.Model):
     TIPO_CHOICES = [
         ('PALESTRA', 'Palestra'),
         ('WORKSHOP', 'Workshop'),
@@ -18,15 +44,79 @@ class Evento(models.Model):
     descricao = models.TextField()
     observacao_organizador = models.TextField(blank=True, null=True)
     capacidade = models.PositiveIntegerField()
+    vagas_ocupadas = models.PositiveIntegerField(default=0, editable=False)
+    IMAGEM_STATUS_CHOICES = [
+        ('', 'Sem imagem nova'),
+        ('PENDENTE', 'Pendente'),
+        ('PROCESSANDO', 'Processando'),
+        ('PRONTA', 'Pronta'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    # Campo legado: uploads novos passam por eventos.imagens e ficam em imagem_variantes.
     imagem = CloudinaryField('imagem', blank=True, null=True)
+    imagem_status = models.CharField(max_length=12, choices=IMAGEM_STATUS_CHOICES, blank=True, default='', editable=False)
+    imagem_pendente = models.CharField(max_length=255, blank=True, default='', editable=False)
+    imagem_variantes = models.JSONField(default=dict, blank=True, editable=False)
+    imagem_erro = models.TextField(blank=True, default='', editable=False)
+    # Quando o worker pegou a imagem; PROCESSANDO há mais de IMAGENS_RESERVA_SEGUNDOS é retomada por outro.
+    imagem_processando_desde = models.DateTimeField(blank=True, null=True, editable=False)
+    # Última edição pelo save(); os UPDATEs dos CAMPOS_EXTERNOS não a alteram.
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    # Mantidos por UPDATEs fora do formulário (inscrições e worker de imagens).
+    CAMPOS_EXTERNOS = (
+        'vagas_ocupadas', 'imagem_status', 'imagem_pendente', 'imagem_variantes', 'imagem_erro',
+        'imagem_processando_desde',
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['data'], name='evento_data_idx'),
+        ]
 
     def __str__(self):
         return f"{self.titulo} - {self.data.strftime('%d/%m/%Y %H:%M')}"
 
+    def save(self, *args, **kwargs):
+        # vagas_ocupadas só muda por UPDATE com F(), e as variantes da imagem só pelo
+        # worker: o save() de um formulário de edição não pode gravar de volta os
+        # valores lidos antes de inscrições concorrentes ou do fim do processamento.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.CAMPOS_EXTERNOS
+            ]
+        super().save(*args, **kwargs)
+
     def total_inscritos(self):
         return self.inscricoes.count()
 
-class Participante(models.Model):
+    @property
+    def tem_imagem(self):
+        return bool(self.imagem_variantes or self.imagem)
+
+    @property
+    def url_imagem(self):
+        """URL da versão completa da imagem, já resolvida pelo worker (ou a do upload legado)."""
+        variante = self.imagem_variantes.get('completa')
+        if variante:
+            return variante['url']
+        return self.imagem.url if self.imagem else ''
+
+    @property
+    def vagas_disponiveis(self):
+        return max(self.capacidade - self.vagas_ocupadas, 0)
+
+    @property
+    def esgotado(self):
+        return self.vagas_ocupadas >= self.capacidade
+
+    @property
+    def taxa_ocupacao(self):
+        return round(100 * self.vagas_ocupadas / self.capacidade) if self.capacidade else 0
+
+class Participante(ValoresCarregadosMixin, models.Model):
     ASSISTENCIA_CHOICES = [
         ('NENHUMA', 'Não preciso de assistência'),
         ('LOCOMOCAO', 'Assistência de locomoção'),
@@ -36,17 +126,232 @@ class Participante(models.Model):
 
     nome = models.CharField(max_length=100)
     email = models.EmailField()
+    email_normalizado = models.CharField(max_length=254, unique=True, null=True, editable=False)
     telefone = models.CharField(max_length=20)
+    telefone_digitos = models.CharField(max_length=20, blank=True, default='', db_index=True, editable=False)
     assistencia = models.CharField(max_length=20, choices=ASSISTENCIA_CHOICES, default='NENHUMA')
     assistencia_detalhes = models.TextField(blank=True, null=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nome
 
+    def save(self, *args, **kwargs):
+        self.telefone_digitos = normalizar_telefone(self.telefone)
+        self.email_normalizado = normalizar_email(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields) | {'atualizado_em'}
+            if 'telefone' in update_fields:
+                update_fields.add('telefone_digitos')
+            if 'email' in update_fields:
+                update_fields.add('email_normalizado')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
 class Inscricao(models.Model):
     evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='inscricoes')
     participante = models.ForeignKey(Participante, on_delete=models.CASCADE, related_name='inscricoes')
     data_inscricao = models.DateTimeField(default=timezone.now)
+    check_in_em = models.DateTimeField(null=True, blank=True, editable=False)
+    # Quando o servidor gravou o check-in; check_in_em é o horário da leitura, que no
+    # leitor offline pode ser bem anterior. Os deltas da lista de presença usam este.
+    check_in_sincronizado_em = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'participante'], name='inscricao_unica_por_evento'),
+        ]
+        indexes = [
+            models.Index(fields=['evento', 'data_inscricao'], name='inscricao_evento_data_idx'),
+            models.Index(fields=['data_inscricao', 'id'], name='inscricao_data_id_idx'),
+            models.Index(fields=['evento', 'check_in_sincronizado_em'], name='inscricao_evento_sinc_idx'),
+        ]
 
     def __str__(self):
         return f"{self.participante.nome} em {self.evento.titulo}"
+
+    @property
+    def token(self):
+        return gerar_token(self)
+
+
+class ListaEspera(models.Model):
+    """Fila de espera de um evento esgotado; a ordem de chegada é (data_entrada, id)."""
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='lista_espera')
+    participante = models.ForeignKey(Participante, on_delete=models.CASCADE, related_name='esperas')
+    data_entrada = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['data_entrada', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'participante'], name='espera_unica_por_evento'),
+        ]
+        indexes = [
+            models.Index(fields=['evento', 'data_entrada', 'id'], name='espera_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.participante} aguardando {self.evento}"
+
+    def posicao(self):
+        anteriores = ListaEspera.objects.filter(evento_id=self.evento_id).filter(
+            models.Q(data_entrada__lt=self.data_entrada)
+            | models.Q(data_entrada=self.data_entrada, id__lt=self.id)
+        )
+        return anteriores.count() + 1
+
+
+class EmailPendente(models.Model):
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('ENVIADO', 'Enviado'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    assunto = models.CharField(max_length=255)
+    corpo = models.TextField()
+    corpo_html = models.TextField(blank=True, default='')
+    remetente = models.CharField(max_length=255, blank=True, default='')
+    destinatarios = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDENTE')
+    tentativas = models.PositiveIntegerField(default=0)
+    proxima_tentativa = models.DateTimeField(default=timezone.now)
+    ultimo_erro = models.TextField(blank=True, default='')
+    criado_em = models.DateTimeField(auto_now_add=True)
+    enviado_em = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa'], name='email_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.assunto} -> {', '.join(self.destinatarios)}"
+
+
+class Comunicado(models.Model):
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('ENVIANDO', 'Enviando'),
+        ('CONCLUIDO', 'Concluído'),
+    ]
+
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='comunicados')
+    assunto = models.CharField(max_length=255)
+    mensagem = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDENTE')
+    total = models.PositiveIntegerField(default=0)
+    enviados = models.PositiveIntegerField(default=0)
+    falhas = models.PositiveIntegerField(default=0)
+    ultima_inscricao_id = models.BigIntegerField(default=0)
+    ultimo_erro = models.TextField(blank=True, default='')
+    # Enquanto ENVIANDO, o worker renova esta reserva a cada lote; vencida, outro worker retoma o envio.
+    reservado_ate = models.DateTimeField(blank=True, null=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    concluido_em = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-criado_em']
+
+    def __str__(self):
+        return f"{self.assunto} ({self.evento.titulo})"
+
+    @property
+    def progresso(self):
+        if not self.total:
+            return 100 if self.status == 'CONCLUIDO' else 0
+        return int((self.enviados + self.falhas) * 100 / self.total)
+
+
+class ExportacoesStorage(FileSystemStorage):
+    """
+    FileSystemStorage em EXPORTACOES_ROOT, lido a cada acesso: o FileField
+    guarda a instância criada ao carregar o modelo, e assim override_settings
+    (e mudanças de configuração em geral) continuam valendo.
+    """
+
+    @property
+    def base_location(self):
+        return settings.EXPORTACOES_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+def storage_exportacoes():
+    return ExportacoesStorage()
+
+
+class Exportacao(models.Model):
+    FORMATO_CHOICES = [
+        ('CSV', 'CSV'),
+        ('CSV_GZ', 'CSV compactado (.csv.gz)'),
+        ('XLSX', 'Excel (.xlsx)'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDENTE', 'Pendente'),
+        ('PROCESSANDO', 'Processando'),
+        ('CONCLUIDO', 'Concluído'),
+        ('FALHOU', 'Falhou'),
+    ]
+
+    formato = models.CharField(max_length=10, choices=FORMATO_CHOICES, default='CSV')
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, blank=True, null=True, related_name='exportacoes')
+    q = models.CharField(max_length=100, blank=True, default='')
+    filtro_hash = models.CharField(max_length=64, db_index=True)
+    versao_dados = models.CharField(max_length=64, blank=True, default='')
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default='PENDENTE')
+    arquivo = models.FileField(storage=storage_exportacoes, upload_to='', blank=True)
+    total_linhas = models.PositiveIntegerField(default=0)
+    erro = models.TextField(blank=True, default='')
+    solicitado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    # Quando o worker pegou o job; PROCESSANDO há mais de EXPORTACOES_RESERVA_SEGUNDOS é retomado por outro.
+    iniciado_em = models.DateTimeField(blank=True, null=True)
+    concluido_em = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-criado_em']
+
+    def __str__(self):
+        return f"Exportação {self.pk} ({self.get_formato_display()})"
+
+    @property
+    def pronta(self):
+        return self.status == 'CONCLUIDO' and bool(self.arquivo)
+
+
+class Contador(models.Model):
+    """
+    Estatísticas materializadas do dashboard (eventos.estatisticas), atualizadas
+    pelos sinais e refeitas por manage.py reconstruir_estatisticas.
+    """
+    escopo = models.CharField(max_length=20)
+    chave = models.CharField(max_length=50)
+    valor = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['escopo', 'chave'], name='contador_escopo_chave'),
+        ]
+
+    def __str__(self):
+        return f"{self.escopo}:{self.chave} = {self.valor}"
+
+
+class InscricoesHora(models.Model):
+    """Inscrições por evento e hora cheia (UTC), consolidadas por manage.py consolidar_inscricoes."""
+    evento = models.ForeignKey(Evento, on_delete=models.CASCADE, related_name='inscricoes_por_hora')
+    hora = models.DateTimeField()
+    total = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['evento', 'hora']
+        constraints = [
+            models.UniqueConstraint(fields=['evento', 'hora'], name='inscricoes_hora_unica'),
+        ]
+
+    def __str__(self):
+        return f"{self.evento_id} @ {self.hora:%d/%m/%Y %H:00}: {self.total}"
@@ -0,0 +1,82 @@
+"""
+Paginação por cursor (keyset) sobre (data_inscricao, id), do mais recente
+para o mais antigo.
+
+Em vez de OFFSET, cada página filtra a partir da última linha vista, então o
+custo de uma página não depende da profundidade; não é feito COUNT(*).
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.db.models import Q
+
+PROXIMA = 'p'
+ANTERIOR = 'a'
+
+
+@dataclass
+class PaginaCursor:
+    itens: list = field(default_factory=list)
+    proximo: str = ''
+    anterior: str = ''
+
+    @property
+    def tem_proxima(self):
+        return bool(self.proximo)
+
+    @property
+    def tem_anterior(self):
+        return bool(self.anterior)
+
+
+def codificar_cursor(inscricao, direcao):
+    bruto = json.dumps([inscricao.data_inscricao.isoformat(), inscricao.pk, direcao], separators=(',', ':'))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(token):
+    """Devolve (data_inscricao, id, direcao) ou None se o token for inválido."""
+    try:
+        bruto = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data, pk, direcao = json.loads(bruto)
+        if direcao not in (PROXIMA, ANTERIOR):
+            return None
+        return datetime.fromisoformat(data), int(pk), direcao
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+
+def paginar_por_cursor(qs, cursor='', tamanho=20):
+    posicao = decodificar_cursor(cursor) if cursor else None
+
+    if posicao is None:
+        linhas = list(qs.order_by('-data_inscricao', '-id')[:tamanho + 1])
+        tem_anterior, tem_proxima = False, len(linhas) > tamanho
+        linhas = linhas[:tamanho]
+    else:
+        data, pk, direcao = posicao
+        if direcao == PROXIMA:
+            linhas = list(
+                qs.filter(Q(data_inscricao__lt=data) | Q(data_inscricao=data, id__lt=pk))
+                .order_by('-data_inscricao', '-id')[:tamanho + 1]
+            )
+            tem_anterior, tem_proxima = True, len(linhas) > tamanho
+            linhas = linhas[:tamanho]
+        else:
+            linhas = list(
+                qs.filter(Q(data_inscricao__gt=data) | Q(data_inscricao=data, id__gt=pk))
+                .order_by('data_inscricao', 'id')[:tamanho + 1]
+            )
+            tem_anterior, tem_proxima = len(linhas) > tamanho, True
+            linhas = linhas[:tamanho][::-1]
+
+    pagina = PaginaCursor(itens=linhas)
+    if linhas and tem_proxima:
+        pagina.proximo = codificar_cursor(linhas[-1], PROXIMA)
+    if linhas and tem_anterior:
+        pagina.anterior = codificar_cursor(linhas[0], ANTERIOR)
+    return pagina
+
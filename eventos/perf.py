@@ -0,0 +1,272 @@
+"""
+Instrumentação de desempenho por requisição.
+
+InstrumentacaoMiddleware abre uma Medicao para cada requisição e acumula nela:
+
+- consultas SQL (quantidade, tempo e o texto de cada uma), por um execute_wrapper
+  em todas as conexões; o tempo é o do execute(), então a leitura das linhas
+  feita depois (fetch, iterator()) fica de fora;
+- tempo de renderização de templates, pelo backend TemplatesMedidos (TEMPLATES);
+- tempo de envio de e-mail, pelos trechos marcados com cronometro('email').
+
+Com isso a resposta ganha o cabeçalho Server-Timing (se PERF_SERVER_TIMING),
+requisições acima de PERF_LENTA_MS vão para o log 'eventos.perf' com as
+consultas mais caras, e os histogramas de latência por rota ficam em /metrics
+(formato texto do Prometheus). Os histogramas são por processo: com vários
+workers do gunicorn, cada coleta vê apenas o processo que a atendeu.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+BALDES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_MAXIMO = 500
+SQL_NO_LOG = 10
+# Métodos viram rótulo tal como vêm; qualquer outro vai para OUTRO, senão um cliente criaria séries à vontade.
+METODOS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'})
+
+_medicao = ContextVar('eventos_perf_medicao', default=None)
+
+
+class Medicao:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.sql = 0.0
+        self.templates = 0.0
+        self.email = 0.0
+        self.instrucoes = []
+        self._abertos = set()
+
+    def registrar_sql(self, sql, duracao):
+        self.consultas += 1
+        self.sql += duracao
+        if len(self.instrucoes) < SQL_MAXIMO:
+            self.instrucoes.append((sql, duracao))
+
+    def total(self):
+        return time.perf_counter() - self.inicio
+
+    def server_timing(self, total):
+        return ', '.join([
+            f'db;dur={self.sql * 1000:.1f};desc="{self.consultas} consultas"',
+            f'tpl;dur={self.templates * 1000:.1f}',
+            f'email;dur={self.email * 1000:.1f}',
+            f'total;dur={total * 1000:.1f}',
+        ])
+
+    def consultas_mais_caras(self, limite=SQL_NO_LOG):
+        """[(sql, execuções, tempo total)] agrupando SQL idêntico, para expor N+1."""
+        agrupadas = defaultdict(lambda: [0, 0.0])
+        for sql, duracao in self.instrucoes:
+            agrupadas[sql][0] += 1
+            agrupadas[sql][1] += duracao
+        ordenadas = sorted(agrupadas.items(), key=lambda item: item[1][1], reverse=True)
+        return [(sql, vezes, duracao) for sql, (vezes, duracao) in ordenadas[:limite]]
+
+
+def medicao_atual():
+    return _medicao.get()
+
+
+@contextmanager
+def cronometro(campo):
+    """Soma a duração do bloco ao `campo` da medição atual; blocos aninhados do mesmo campo contam uma vez."""
+    medicao = _medicao.get()
+    if medicao is None or campo in medicao._abertos:
+        yield
+        return
+    medicao._abertos.add(campo)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(medicao, campo, getattr(medicao, campo) + time.perf_counter() - inicio)
+        medicao._abertos.discard(campo)
+
+
+def _medir_sql(execute, sql, params, many, context):
+    medicao = _medicao.get()
+    if medicao is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicao.registrar_sql(sql, time.perf_counter() - inicio)
+
+
+class TemplateMedido(Template):
+    def render(self, context=None, request=None):
+        with cronometro('templates'):
+            return super().render(context, request)
+
+
+class TemplatesMedidos(DjangoTemplates):
+    """Backend DjangoTemplates que soma o tempo de render à medição da requisição."""
+
+    def from_string(self, template_code):
+        return TemplateMedido(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return TemplateMedido(super().get_template(template_name).template, self)
+
+
+def _rotulo(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metricas:
+    """Histogramas de latência e totais de SQL/templates/e-mail por (rota, método)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observar(self, rota, metodo, medicao, total):
+        with self._lock:
+            serie = self._series.get((rota, metodo))
+            if serie is None:
+                serie = self._series[(rota, metodo)] = {
+                    'baldes': [0] * len(BALDES), 'contagem': 0, 'soma': 0.0,
+                    'consultas': 0, 'sql': 0.0, 'templates': 0.0, 'email': 0.0,
+                }
+            indice = bisect.bisect_left(BALDES, total)
+            if indice < len(BALDES):
+                serie['baldes'][indice] += 1
+            serie['contagem'] += 1
+            serie['soma'] += total
+            serie['consultas'] += medicao.consultas
+            serie['sql'] += medicao.sql
+            serie['templates'] += medicao.templates
+            serie['email'] += medicao.email
+
+    def limpar(self):
+        with self._lock:
+            self._series.clear()
+
+    def texto(self):
+        with self._lock:
+            series = sorted((chave, dict(serie, baldes=list(serie['baldes']))) for chave, serie in self._series.items())
+
+        linhas = [
+            '# HELP eventos_requisicao_segundos Duração das requisições por rota.',
+            '# TYPE eventos_requisicao_segundos histogram',
+        ]
+        for (rota, metodo), serie in series:
+            rotulos = f'rota="{_rotulo(rota)}",metodo="{_rotulo(metodo)}"'
+            acumulado = 0
+            for limite, quantidade in zip(BALDES, serie['baldes']):
+                acumulado += quantidade
+                linhas.append(f'eventos_requisicao_segundos_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'eventos_requisicao_segundos_bucket{{{rotulos},le="+Inf"}} {serie["contagem"]}')
+            linhas.append(f'eventos_requisicao_segundos_sum{{{rotulos}}} {serie["soma"]:.6f}')
+            linhas.append(f'eventos_requisicao_segundos_count{{{rotulos}}} {serie["contagem"]}')
+
+        contadores = (
+            ('eventos_requisicao_consultas_sql_total', 'consultas', 'Consultas SQL executadas.'),
+            ('eventos_requisicao_sql_segundos_total', 'sql', 'Tempo gasto em SQL.'),
+            ('eventos_requisicao_templates_segundos_total', 'templates', 'Tempo gasto renderizando templates.'),
+            ('eventos_requisicao_email_segundos_total', 'email', 'Tempo gasto enviando e-mail.'),
+        )
+        for nome, campo, ajuda in contadores:
+            linhas.append(f'# HELP {nome} {ajuda}')
+            linhas.append(f'# TYPE {nome} counter')
+            for (rota, metodo), serie in series:
+                valor = serie[campo]
+                valor = valor if campo == 'consultas' else f'{valor:.6f}'
+                linhas.append(f'{nome}{{rota="{_rotulo(rota)}",metodo="{_rotulo(metodo)}"}} {valor}')
+        return '\n'.join(linhas) + '\n'
+
+
+metricas = Metricas()
+
+
+def _rota(request):
+    # Só nomes de rota (ou "nao_encontrada"): caminhos crus explodiriam a cardinalidade das séries.
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else 'nao_encontrada'
+
+
+def _metodo(request):
+    return request.method if request.method in METODOS else 'OUTRO'
+
+
+def registrar_lenta(request, medicao, total):
+    consultas = '\n'.join(
+        f'  {duracao * 1000:8.1f} ms  {vezes:>3}x  {sql}' for sql, vezes, duracao in medicao.consultas_mais_caras()
+    )
+    logger.warning(
+        "Requisição lenta: %s %s (%s) em %.0f ms; %d consultas SQL em %.0f ms; templates %.0f ms; e-mail %.0f ms\n%s",
+        request.method, request.get_full_path(), _rota(request), total * 1000,
+        medicao.consultas, medicao.sql * 1000, medicao.templates * 1000, medicao.email * 1000, consultas,
+    )
+
+
+class InstrumentacaoMiddleware:
+    """
+    Deve ser o primeiro do MIDDLEWARE, para o tempo total incluir os demais.
+    Sob ASGI as conexões ficam na thread em que o ORM roda (a de sync_to_async
+    da requisição), então os wrappers de SQL são instalados e retirados lá.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicao = Medicao()
+        token = _medicao.set(medicao)
+        try:
+            with _medindo_sql():
+                response = self.get_response(request)
+        finally:
+            _medicao.reset(token)
+        return self._concluir(request, medicao, response)
+
+    async def __acall__(self, request):
+        medicao = Medicao()
+        token = _medicao.set(medicao)
+        pilha = ExitStack()
+        try:
+            await sync_to_async(pilha.enter_context)(_medindo_sql())
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(pilha.close)()
+        finally:
+            _medicao.reset(token)
+        return self._concluir(request, medicao, response)
+
+    def _concluir(self, request, medicao, response):
+        total = medicao.total()
+        metricas.observar(_rota(request), _metodo(request), medicao, total)
+        if settings.PERF_SERVER_TIMING:
+            response['Server-Timing'] = medicao.server_timing(total)
+        if total * 1000 >= settings.PERF_LENTA_MS:
+            registrar_lenta(request, medicao, total)
+        return response
+
+
+@contextmanager
+def _medindo_sql():
+    with ExitStack() as pilha:
+        for conexao in connections.all():
+            pilha.enter_context(conexao.execute_wrapper(_medir_sql))
+        yield
@@ -0,0 +1,80 @@
+"""
+Lista de presença para leitores offline na entrada do evento.
+
+O leitor baixa a lista completa uma vez (inscrição, participante, prefixo do
+hash do nome, token do ingresso e check-in) em JSON compactado com gzip e,
+depois, só as alterações desde a versão que já tem. A versão é o momento da
+geração. Check-ins entram no delta pelo momento em que o servidor os gravou
+(check_in_sincronizado_em), não pelo horário da leitura: um leitor que ficou
+offline sincroniza leituras antigas e os outros leitores precisam recebê-las.
+Como inscrições e check-ins podem ser gravados com horário um pouco anterior
+ao commit, cada delta repete a janela PRESENCA_JANELA_SEGUNDOS antes da versão
+pedida e o leitor mescla as linhas pelo id da inscrição.
+"""
+import gzip
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .ingressos import token_para
+from .models import Inscricao
+
+CAMPOS = ['inscricao', 'participante', 'nome_hash', 'token', 'check_in_em']
+
+
+def _versao(momento):
+    return int(momento.timestamp() * 1_000_000)
+
+
+def _momento(versao):
+    return datetime.fromtimestamp(versao / 1_000_000, tz=dt_timezone.utc)
+
+
+def ler_versao(valor):
+    """Versão enviada pelo leitor (?desde=); ValueError se não for um número que vire um momento válido."""
+    try:
+        versao = int(valor)
+        _momento(versao) - timedelta(seconds=settings.PRESENCA_JANELA_SEGUNDOS)
+    except (OverflowError, OSError, ValueError):
+        raise ValueError("Versão inválida.")
+    return versao
+
+
+def hash_nome(nome):
+    """Prefixo do SHA-256 do nome normalizado: confere o nome sem levá-lo para o aparelho."""
+    return hashlib.sha256(' '.join((nome or '').lower().split()).encode()).hexdigest()[:8]
+
+
+def montar_lista(evento_id, desde=None):
+    """
+    Lista do evento; com `desde` (versão recebida antes), só as inscrições
+    criadas ou com check-in sincronizado a partir dela. Cancelamentos não aparecem no delta:
+    o ingresso cancelado é recusado na sincronização dos check-ins.
+    """
+    agora = timezone.now()
+    qs = Inscricao.objects.filter(evento_id=evento_id)
+    if desde is not None:
+        corte = _momento(desde) - timedelta(seconds=settings.PRESENCA_JANELA_SEGUNDOS)
+        qs = qs.filter(Q(data_inscricao__gte=corte) | Q(check_in_sincronizado_em__gte=corte))
+    linhas = [
+        [pk, participante_id, hash_nome(nome), token_para(pk, evento_id),
+         check_in_em.isoformat() if check_in_em else None]
+        for pk, participante_id, nome, check_in_em in qs.order_by('pk').values_list(
+            'pk', 'participante_id', 'participante__nome', 'check_in_em'
+        ).iterator(chunk_size=2000)
+    ]
+    return {
+        'evento': evento_id,
+        'versao': _versao(agora),
+        'desde': desde,
+        'campos': CAMPOS,
+        'linhas': linhas,
+    }
+
+
+def compactar(dados):
+    return gzip.compress(json.dumps(dados, separators=(',', ':')).encode(), compresslevel=6)
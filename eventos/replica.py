@@ -0,0 +1,88 @@
+"""
+Leituras pesadas na réplica do banco.
+
+Views decoradas com ler_da_replica (lista de eventos, dashboard, exportações)
+leem os modelos de `eventos` do alias EVENTOS_BANCO_LEITURA ('replica' quando
+DB_REPLICA_HOST está configurado, senão 'default'). RoteadorReplica
+(DATABASE_ROUTERS) só desvia leituras feitas dentro dessas views; escritas,
+sessões e autenticação continuam no banco principal.
+
+A réplica fica alguns instantes atrás do principal. Onde uma leitura atrasada
+iria para o cache (a lista de eventos), use `exceto_apos_alteracao=True`: até
+DB_REPLICA_ATRASO segundos depois da última alteração conhecida a view lê do
+principal.
+"""
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.template.response import SimpleTemplateResponse
+from django.utils import timezone
+
+from .cache import alterado_em
+
+_banco = ContextVar('eventos_banco_leitura', default=None)
+
+
+def banco_leitura(exceto_apos_alteracao=False):
+    alias = settings.EVENTOS_BANCO_LEITURA
+    if alias == DEFAULT_DB_ALIAS:
+        return alias
+    if exceto_apos_alteracao and timezone.now() - alterado_em() < timedelta(seconds=settings.DB_REPLICA_ATRASO):
+        return DEFAULT_DB_ALIAS
+    return alias
+
+
+def ler_da_replica(view=None, *, exceto_apos_alteracao=False):
+    """
+    Decora views síncronas e assíncronas; use com method_decorator em views de
+    classe. TemplateResponse é renderizada aqui dentro, e não depois da view,
+    para que os querysets avaliados no template também leiam da réplica.
+    """
+    def decorador(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def envolvida(*args, **kwargs):
+                token = _banco.set(banco_leitura(exceto_apos_alteracao))
+                try:
+                    resposta = await view(*args, **kwargs)
+                    if isinstance(resposta, SimpleTemplateResponse):
+                        await sync_to_async(resposta.render)()
+                    return resposta
+                finally:
+                    _banco.reset(token)
+        else:
+            @wraps(view)
+            def envolvida(*args, **kwargs):
+                token = _banco.set(banco_leitura(exceto_apos_alteracao))
+                try:
+                    resposta = view(*args, **kwargs)
+                    if isinstance(resposta, SimpleTemplateResponse):
+                        resposta.render()
+                    return resposta
+                finally:
+                    _banco.reset(token)
+        return envolvida
+
+    return decorador(view) if view is not None else decorador
+
+
+class RoteadorReplica:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == 'eventos':
+            return _banco.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e principal têm os mesmos dados.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A réplica recebe o esquema pela replicação.
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,92 @@
+"""
+Geração de dados sintéticos para benchmarks e testes de carga.
+
+Usa bulk_create em lotes (sem sinais), portanto os contadores desnormalizados
+e as estatísticas do dashboard são recalculados aqui mesmo ao final.
+"""
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import estatisticas
+from .models import Evento, Inscricao, Participante
+
+TIPOS = [tipo for tipo, _ in Evento.TIPO_CHOICES]
+ASSISTENCIAS = [a for a, _ in Participante.ASSISTENCIA_CHOICES]
+LOCAIS = ['Auditório', 'Sala 101', 'Lab 2', 'Lab 3', 'Centro de Convenções']
+
+
+def _em_lotes(objs, lote):
+    for i in range(0, len(objs), lote):
+        yield objs[i:i + lote]
+
+
+def semear(eventos=10, inscricoes=1000, participantes=None, lote=5000, seed=42, passados=0.3):
+    """
+    Cria `eventos` eventos e `inscricoes` inscrições distribuídas entre eles.
+
+    `participantes` tem como padrão o mínimo necessário para que nenhum
+    participante se inscreva duas vezes no mesmo evento. Uma fração
+    `passados` dos eventos fica no passado. Retorna um dicionário com os totais.
+    """
+    rnd = random.Random(seed)
+    eventos = max(eventos, 1)
+    por_evento = -(-inscricoes // eventos)
+    participantes = max(participantes or 0, por_evento, 1)
+    agora = timezone.now()
+
+    with transaction.atomic():
+        novos_eventos = []
+        for n in range(eventos):
+            dias = rnd.randint(1, 365)
+            data = agora - timedelta(days=dias) if rnd.random() < passados else agora + timedelta(days=dias)
+            novos_eventos.append(Evento(
+                titulo=f"Evento {n}",
+                tipo=rnd.choice(TIPOS),
+                data=data,
+                local=rnd.choice(LOCAIS),
+                descricao=f"Descrição do evento {n}",
+                capacidade=por_evento * 2,
+            ))
+        criados = []
+        for bloco in _em_lotes(novos_eventos, lote):
+            criados.extend(Evento.objects.bulk_create(bloco))
+        evento_ids = [e.pk for e in criados]
+
+        inicio = Participante.objects.count()
+        novos_participantes = [
+            Participante(
+                nome=f"Participante {inicio + n}",
+                email=f"participante{inicio + n}@example.com",
+                email_normalizado=f"participante{inicio + n}@example.com",
+                telefone=telefone,
+                telefone_digitos=telefone,
+                assistencia=rnd.choice(ASSISTENCIAS),
+            )
+            for n, telefone in enumerate(
+                f"11{rnd.randint(900000000, 999999999)}" for _ in range(participantes)
+            )
+        ]
+        participante_ids = []
+        for bloco in _em_lotes(novos_participantes, lote):
+            participante_ids.extend(p.pk for p in Participante.objects.bulk_create(bloco))
+
+        pendentes = []
+        for n in range(inscricoes):
+            pendentes.append(Inscricao(
+                evento_id=evento_ids[n % eventos],
+                participante_id=participante_ids[n // eventos],
+                data_inscricao=agora - timedelta(minutes=rnd.randint(0, 60 * 24 * 90)),
+            ))
+            if len(pendentes) >= lote:
+                Inscricao.objects.bulk_create(pendentes)
+                pendentes = []
+        if pendentes:
+            Inscricao.objects.bulk_create(pendentes)
+
+        # Também preenche Evento.vagas_ocupadas.
+        estatisticas.reconstruir()
+
+    return {'eventos': eventos, 'participantes': participantes, 'inscricoes': inscricoes}
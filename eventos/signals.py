@@ -0,0 +1,109 @@
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import busca, estatisticas
+from .cache import marcar_alteracao
+from .models import Evento, Inscricao, Participante
+from .vagas import promover_da_espera
+
+
+def _cascata_de_evento(origin):
+    """A exclusão começou por eventos: o pre_delete do Evento já descontou as inscrições em lote."""
+    return isinstance(origin, Evento) or (isinstance(origin, QuerySet) and origin.model is Evento)
+
+
+@receiver(post_save, sender=Inscricao)
+def ocupar_vaga(sender, instance, created, **kwargs):
+    # Inscrições criadas por reservar_vaga() já incrementaram o contador.
+    if created and not getattr(instance, '_vaga_reservada', False):
+        Evento.objects.filter(pk=instance.evento_id).update(vagas_ocupadas=F('vagas_ocupadas') + 1)
+
+
+@receiver(post_delete, sender=Inscricao)
+def devolver_vaga(sender, instance, origin=None, **kwargs):
+    if _cascata_de_evento(origin):
+        return
+    Evento.objects.filter(pk=instance.evento_id, vagas_ocupadas__gt=0).update(
+        vagas_ocupadas=F('vagas_ocupadas') - 1
+    )
+
+
+@receiver(post_delete, sender=Inscricao)
+def promover_espera_inscricao(sender, instance, origin=None, **kwargs):
+    # O evento está sendo excluído: não há fila a promover.
+    if _cascata_de_evento(origin):
+        return
+    evento_id = instance.evento_id
+    transaction.on_commit(lambda: promover_da_espera(evento_id))
+
+
+# Registrado antes de contar_evento, que atualiza `_carregado` após o save.
+@receiver(post_save, sender=Evento)
+def promover_espera_evento(sender, instance, created, **kwargs):
+    anterior = getattr(instance, '_carregado', {}).get('capacidade')
+    if not created and anterior is not None and instance.capacidade > anterior:
+        transaction.on_commit(lambda: promover_da_espera(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Evento)
+def invalidar_cache_evento(sender, instance, **kwargs):
+    marcar_alteracao(instance.pk)
+
+
+@receiver(post_save, sender=Inscricao)
+def invalidar_cache_inscricao(sender, instance, **kwargs):
+    marcar_alteracao(instance.evento_id)
+
+
+@receiver(post_delete, sender=Inscricao)
+def invalidar_cache_inscricao_removida(sender, instance, origin=None, **kwargs):
+    # Na cascata, invalidar_cache_evento já marca o evento.
+    if not _cascata_de_evento(origin):
+        marcar_alteracao(instance.evento_id)
+
+
+@receiver(post_save, sender=Inscricao)
+def contar_inscricao(sender, instance, created, **kwargs):
+    if created:
+        estatisticas.inscricao_criada(instance)
+
+
+@receiver(post_delete, sender=Inscricao)
+def descontar_inscricao(sender, instance, origin=None, **kwargs):
+    if not _cascata_de_evento(origin):
+        estatisticas.inscricao_removida(instance)
+
+
+@receiver(pre_delete, sender=Evento)
+def descontar_inscricoes_do_evento(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, QuerySet) and origin.model is Evento:
+        # O pre_delete chega uma vez por evento do queryset; desconta todos no primeiro.
+        if getattr(origin, '_inscricoes_descontadas', False):
+            return
+        origin._inscricoes_descontadas = True
+        estatisticas.inscricoes_de_eventos_removidas(origin.values('pk'))
+    elif _cascata_de_evento(origin):
+        estatisticas.inscricoes_de_eventos_removidas([instance.pk])
+
+
+@receiver(post_save, sender=Evento)
+def contar_evento(sender, instance, created, **kwargs):
+    estatisticas.evento_salvo(instance, created)
+
+
+@receiver(post_delete, sender=Evento)
+def descontar_evento(sender, instance, **kwargs):
+    estatisticas.evento_removido(instance)
+
+
+@receiver(post_save, sender=Participante)
+def recontar_assistencia(sender, instance, created, **kwargs):
+    estatisticas.participante_salvo(instance, created)
+
+
+@receiver(post_migrate)
+def verificar_indice_busca(sender, using, **kwargs):
+    if sender.name == 'eventos':
+        busca.verificar_fts(using)
@@ -0,0 +1,41 @@
+from django import template
+from django.utils.html import format_html
+
+from eventos.imagens import LARGURAS, PROPORCAO
+
+register = template.Library()
+
+
+def url_miniatura(imagem, largura):
+    """URL da imagem redimensionada pelo Cloudinary (corte 16:9, formato e qualidade automáticos)."""
+    return imagem.build_url(
+        width=largura, height=round(largura * PROPORCAO), crop='fill', gravity='auto',
+        quality='auto', fetch_format='auto', secure=True,
+    )
+
+
+def _urls_card(evento):
+    """{largura: url} das variantes do card; só as imagens legadas montam a URL na hora."""
+    if evento.imagem_variantes:
+        return {largura: evento.imagem_variantes[str(largura)]['url'] for largura in LARGURAS}
+    imagem = evento.imagem
+    if not imagem or not hasattr(imagem, 'build_url'):
+        return None
+    return {largura: url_miniatura(imagem, largura) for largura in LARGURAS}
+
+
+@register.simple_tag
+def imagem_card(evento, alt, classe='card-img-top'):
+    """<img> responsivo com srcset e carregamento preguiçoso para os cards de evento."""
+    if not evento.tem_imagem:
+        return ''
+    urls = _urls_card(evento)
+    if urls is None:
+        return format_html('<img src="{}" class="{}" alt="{}" loading="lazy" decoding="async">',
+                           evento.url_imagem, classe, alt)
+    srcset = ', '.join(f"{url} {largura}w" for largura, url in urls.items())
+    return format_html(
+        '<img src="{}" srcset="{}" sizes="(min-width: 992px) 33vw, (min-width: 768px) 50vw, 100vw" '
+        'width="{}" height="{}" class="{}" alt="{}" loading="lazy" decoding="async">',
+        urls[LARGURAS[0]], srcset, LARGURAS[0], round(LARGURAS[0] * PROPORCAO), classe, alt,
+    )
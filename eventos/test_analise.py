@@ -0,0 +1,59 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.analise import consolidar, serie_inscricoes
+from eventos.models import Evento, Inscricao, InscricoesHora, Participante
+
+
+class AnaliseInscricoesTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now() + timedelta(days=3),
+            local="Auditório", descricao="Tema", capacidade=100,
+        )
+        self.agora = timezone.now()
+        # 2 inscrições há 5 horas, 1 há 3 horas e 1 agora (hora ainda aberta).
+        for n, horas in enumerate([5, 5, 3, 0]):
+            self.inscrever(n, self.agora - timedelta(hours=horas))
+
+    def inscrever(self, n, quando):
+        p = Participante.objects.create(nome=f"P{n}", email=f"p{n}@example.com", telefone="1")
+        return Inscricao.objects.create(evento=self.evento, participante=p, data_inscricao=quando)
+
+    def totais(self, serie):
+        return [total for _, total, _ in serie]
+
+    def test_serie_por_hora_preenche_lacunas(self):
+        serie = serie_inscricoes(self.evento)
+        self.assertEqual(self.totais(serie), [2, 0, 1, 0, 0, 1])
+        self.assertEqual(serie[-1][2], 4)
+
+    def test_consolidado_mais_recentes_igual_ao_calculo_direto(self):
+        direto = serie_inscricoes(self.evento)
+        self.assertEqual(consolidar(), 2)
+        self.assertEqual(InscricoesHora.objects.count(), 2)
+        self.assertEqual(serie_inscricoes(self.evento), direto)
+
+        self.inscrever(9, self.agora)
+        self.assertEqual(serie_inscricoes(self.evento)[-1][1:], (2, 5))
+
+    def test_consolidar_parcial_absorve_cancelamentos(self):
+        consolidar()
+        Inscricao.objects.filter(data_inscricao__lt=self.agora - timedelta(hours=4)).first().delete()
+        consolidar(desde=self.agora - timedelta(hours=6))
+        self.assertEqual(self.totais(serie_inscricoes(self.evento))[0], 1)
+
+    def test_serie_por_dia(self):
+        serie = serie_inscricoes(self.evento, 'dia')
+        self.assertEqual(sum(self.totais(serie)), 4)
+        self.assertEqual(serie[-1][0], timezone.localdate(self.agora))
+
+    def test_endpoint_json(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        dados = self.client.get(reverse('evento-analise', args=[self.evento.pk]), {'intervalo': 'dia'}).json()
+        self.assertEqual(dados['intervalo'], 'dia')
+        self.assertEqual(dados['pontos'][-1]['acumulado'], 4)
@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from eventos.busca import TABELA_FTS, filtrar_inscricoes, filtrar_por_participante, verificar_fts
+from eventos.models import Evento, Inscricao, Participante
+
+
+class BuscaParticipanteTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=10,
+        )
+        self.maria = Participante.objects.create(
+            nome="Maria Eduarda", email="maria.eduarda@example.com", telefone="(11) 98765-4321"
+        )
+        self.joao = Participante.objects.create(
+            nome="João Silva", email="joao@empresa.com", telefone="21 3333-4444"
+        )
+        for p in (self.maria, self.joao):
+            Inscricao.objects.create(evento=self.evento, participante=p)
+
+    def buscar(self, q):
+        return set(filtrar_por_participante(Participante.objects.all(), q, prefixo=''))
+
+    def test_telefone_normalizado_na_gravacao(self):
+        self.assertEqual(self.maria.telefone_digitos, '11987654321')
+        self.maria.telefone = '+55 (11) 90000-0000'
+        self.maria.save(update_fields=['telefone'])
+        self.maria.refresh_from_db()
+        self.assertEqual(self.maria.telefone_digitos, '5511900000000')
+
+    def test_busca_por_trecho_do_nome_sem_diferenciar_maiusculas(self):
+        self.assertEqual(self.buscar('EDUARDA'), {self.maria})
+        self.assertEqual(self.buscar('silv'), {self.joao})
+
+    def test_busca_por_email(self):
+        self.assertEqual(self.buscar('empresa.com'), {self.joao})
+
+    def test_busca_curta_usa_icontains(self):
+        self.assertEqual(self.buscar('Jo'), {self.joao})
+
+    def test_busca_por_prefixo_de_telefone_com_mascara(self):
+        self.assertEqual(self.buscar('(11) 9876'), {self.maria})
+        self.assertEqual(self.buscar('21 33'), {self.joao})
+
+    def test_indice_acompanha_alteracoes(self):
+        self.joao.nome = "João Pereira"
+        self.joao.save()
+        self.assertEqual(self.buscar('Silva'), set())
+        self.assertEqual(self.buscar('Pereira'), {self.joao})
+        self.maria.delete()
+        self.assertEqual(self.buscar('Eduarda'), set())
+
+    def test_filtra_inscricoes_por_evento_e_termo(self):
+        qs = filtrar_inscricoes(Inscricao.objects.all(), self.evento.pk, 'maria')
+        self.assertEqual([i.participante for i in qs], [self.maria])
+
+    def test_sqlite_usa_tabela_fts(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("FTS5 só no SQLite")
+        sql = str(filtrar_por_participante(Participante.objects.all(), 'Eduarda', prefixo='').query)
+        self.assertIn('eventos_participante_busca', sql)
+
+    def test_sem_tabela_fts_usa_icontains(self):
+        self.addCleanup(verificar_fts, connection.alias)
+        with mock.patch.object(connection.introspection, 'table_names', return_value=[]):
+            verificar_fts(connection.alias)
+            qs = filtrar_por_participante(Participante.objects.all(), 'Eduarda', prefixo='')
+            self.assertNotIn(TABELA_FTS, str(qs.query))
+            self.assertEqual(set(qs), {self.maria})
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import Evento, Inscricao, Participante
+
+
+class EventoListCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now() + timezone.timedelta(days=1),
+            local="Auditório", descricao="Tema", capacidade=10,
+        )
+        self.url = reverse('evento-list')
+
+    def test_segunda_visita_nao_consulta_o_banco(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.url)
+        self.assertContains(resp, "Palestra")
+
+    def test_filtros_tem_chaves_proprias(self):
+        self.client.get(self.url)
+        resp = self.client.get(self.url, {'local': 'Sala'})
+        self.assertNotContains(resp, "Palestra")
+
+    def test_alterar_evento_invalida_lista_e_card(self):
+        self.client.get(self.url)
+        self.evento.titulo = "Oficina de Python"
+        self.evento.save()
+        resp = self.client.get(self.url)
+        self.assertContains(resp, "Oficina de Python")
+        self.assertNotContains(resp, "Palestra")
+
+    def test_inscricao_muda_a_versao(self):
+        etag = self.client.get(self.url)['ETag']
+        p = Participante.objects.create(nome="Ana", email="ana@example.com", telefone="1")
+        Inscricao.objects.create(evento=self.evento, participante=p)
+        self.assertNotEqual(self.client.get(self.url)['ETag'], etag)
+
+    def test_etag_devolve_304(self):
+        resp = self.client.get(self.url)
+        self.assertIn('Last-Modified', resp)
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_evento_que_comeca_sai_da_lista_sem_escrita(self):
+        self.evento.data = timezone.now() + timedelta(minutes=1)
+        self.evento.save()
+        resp = self.client.get(self.url)
+        self.assertContains(resp, "Palestra")
+
+        depois = timezone.now() + timedelta(seconds=settings.EVENTOS_CACHE_SEGUNDOS + 60)
+        with mock.patch('django.utils.timezone.now', return_value=depois):
+            resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp['ETag'])
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotContains(resp, "Palestra")
+            self.assertContains(self.client.get(reverse('evento-arquivo')), "Palestra")
+
+    def test_organizador_nao_recebe_etag_nem_card_de_visitante(self):
+        self.client.get(self.url)
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        resp = self.client.get(self.url)
+        self.assertNotIn('ETag', resp)
+        self.assertContains(resp, reverse('evento-update', args=[self.evento.pk]))
@@ -0,0 +1,94 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.checkin import INVALIDO, NAO_ENCONTRADO, OK, REPETIDO, registrar_check_in, registrar_lote
+from eventos.models import Evento, Inscricao, Participante
+
+
+class CheckInTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=10,
+        )
+        self.outro = Evento.objects.create(
+            titulo="Outro", tipo="PALESTRA", data=timezone.now(), local="Sala",
+            descricao="Tema", capacidade=10,
+        )
+        self.inscricoes = [
+            Inscricao.objects.create(
+                evento=self.evento,
+                participante=Participante.objects.create(nome=f"P{n}", email=f"p{n}@example.com", telefone="1"),
+            )
+            for n in range(3)
+        ]
+        self.token = self.inscricoes[0].token
+
+    def test_leitura_repetida_nao_altera_o_horario(self):
+        with self.assertNumQueries(1):
+            status, pk, primeiro = registrar_check_in(self.evento.pk, self.token)
+        self.assertEqual((status, pk), (OK, self.inscricoes[0].pk))
+
+        status, _, segundo = registrar_check_in(self.evento.pk, self.token, timezone.now() + timedelta(minutes=5))
+        self.assertEqual((status, segundo), (REPETIDO, primeiro))
+        self.inscricoes[0].refresh_from_db()
+        self.assertEqual(self.inscricoes[0].check_in_em, primeiro)
+
+    def test_token_de_outro_evento_ou_adulterado(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(registrar_check_in(self.outro.pk, self.token)[0], INVALIDO)
+            self.assertEqual(registrar_check_in(self.evento.pk, self.token + 'x')[0], INVALIDO)
+
+    def test_inscricao_cancelada(self):
+        self.inscricoes[0].delete()
+        self.assertEqual(registrar_check_in(self.evento.pk, self.token)[0], NAO_ENCONTRADO)
+
+    def test_lote_offline_guarda_o_horario_da_leitura(self):
+        registrar_check_in(self.evento.pk, self.inscricoes[1].token)
+        cedo = timezone.now() - timedelta(hours=1)
+        leituras = [
+            (self.token, cedo + timedelta(minutes=2)),
+            (self.token, cedo),
+            (self.inscricoes[1].token, cedo),
+            ('lixo', None),
+            (self.inscricoes[2].token, None),
+        ]
+        with self.assertNumQueries(2):
+            resultado = registrar_lote(self.evento.pk, leituras)
+        self.assertEqual([r[0] for r in resultado], [OK, REPETIDO, REPETIDO, INVALIDO, OK])
+        self.inscricoes[0].refresh_from_db()
+        self.assertEqual(self.inscricoes[0].check_in_em, cedo)
+
+    def test_endpoints(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        url = reverse('evento-check-in', args=[self.evento.pk])
+        resp = self.client.post(url, json.dumps({'token': self.token}), content_type='application/json')
+        self.assertEqual(resp.json()['status'], OK)
+        resp = self.client.post(url, json.dumps({'token': self.token}), content_type='application/json')
+        self.assertEqual(resp.json()['status'], REPETIDO)
+        resp = self.client.post(url, json.dumps({'token': 'x'}), content_type='application/json')
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual(self.client.post(url, 'não é json', content_type='application/json').status_code, 400)
+
+        lote = reverse('evento-check-in-lote', args=[self.evento.pk])
+        resp = self.client.post(lote, json.dumps({'leituras': [
+            {'token': self.inscricoes[1].token, 'momento': '2025-08-01T19:03:00'},
+        ]}), content_type='application/json')
+        self.assertEqual(resp.json()['resultados'][0]['status'], OK)
+        with override_settings(CHECK_IN_LOTE_MAXIMO=1):
+            resp = self.client.post(lote, json.dumps({'leituras': [{'token': 'a'}, {'token': 'b'}]}),
+                                    content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+    def test_check_in_exige_login(self):
+        resp = self.client.post(reverse('evento-check-in', args=[self.evento.pk]))
+        self.assertEqual(resp.status_code, 302)
+
+    def test_ingresso_mostra_qr_code(self):
+        resp = self.client.get(reverse('ingresso-detail', args=[self.token]))
+        self.assertContains(resp, '<svg')
@@ -0,0 +1,149 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.comunicados import enviar_comunicado, processar_comunicados
+from eventos.models import Comunicado, Evento, Inscricao, Participante
+
+User = get_user_model()
+
+
+class BackendContador(EmailBackend):
+    chamadas = []
+
+    def send_messages(self, messages):
+        BackendContador.chamadas.append(len(messages))
+        return super().send_messages(messages)
+
+
+class BackendFalhaNoSegundoLote(EmailBackend):
+    chamadas = 0
+
+    def send_messages(self, messages):
+        BackendFalhaNoSegundoLote.chamadas += 1
+        if BackendFalhaNoSegundoLote.chamadas == 2:
+            raise OSError("conexão perdida")
+        return super().send_messages(messages)
+
+
+class ComunicadoTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra BI",
+            tipo="PALESTRA",
+            data=timezone.now(),
+            local="Auditório",
+            descricao="Tendências",
+            capacidade=50,
+        )
+        for n in range(5):
+            p = Participante.objects.create(
+                nome=f"Pessoa <{n}>", email=f"p{n}@example.com", telefone="1", assistencia="NENHUMA"
+            )
+            Inscricao.objects.create(evento=self.evento, participante=p)
+        BackendContador.chamadas = []
+
+    def test_envia_em_lotes_personalizados_por_uma_conexao(self):
+        comunicado = Comunicado.objects.create(
+            evento=self.evento, assunto="Aviso para {nome}", mensagem="Olá, {nome}! Sala mudou."
+        )
+        comunicado = enviar_comunicado(comunicado, lote=2, taxa=0, connection=BackendContador())
+
+        self.assertEqual(BackendContador.chamadas, [2, 2, 1])
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(comunicado.status, 'CONCLUIDO')
+        self.assertEqual((comunicado.total, comunicado.enviados, comunicado.falhas), (5, 5, 0))
+        self.assertEqual(comunicado.progresso, 100)
+
+        msg = mail.outbox[0]
+        self.assertEqual(msg.subject, "Aviso para Pessoa <0>")
+        self.assertIn("Olá, Pessoa <0>!", msg.body)
+        html = msg.alternatives[0][0]
+        self.assertIn("Pessoa &lt;0&gt;", html)
+        self.assertIn("p0@example.com", html)
+
+    def test_retoma_envio_interrompido(self):
+        comunicado = Comunicado.objects.create(evento=self.evento, assunto="Aviso", mensagem="Texto")
+        terceira = self.evento.inscricoes.order_by('pk')[2]
+        comunicado.status = 'ENVIANDO'
+        comunicado.total = 5
+        comunicado.enviados = 3
+        comunicado.ultima_inscricao_id = terceira.pk
+        comunicado.save()
+
+        comunicado = enviar_comunicado(comunicado, taxa=0)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(comunicado.enviados, 5)
+
+    def test_lote_que_falha_nao_avanca_cursor(self):
+        BackendFalhaNoSegundoLote.chamadas = 0
+        comunicado = Comunicado.objects.create(evento=self.evento, assunto="Aviso", mensagem="Texto")
+        comunicado = enviar_comunicado(comunicado, lote=2, taxa=0, connection=BackendFalhaNoSegundoLote())
+
+        segunda = self.evento.inscricoes.order_by('pk')[1]
+        self.assertEqual(comunicado.status, 'ENVIANDO')
+        self.assertEqual(comunicado.ultima_inscricao_id, segunda.pk)
+        self.assertEqual((comunicado.enviados, comunicado.falhas), (2, 0))
+        self.assertEqual(comunicado.ultimo_erro, "conexão perdida")
+
+        # Reserva ainda válida: nenhum outro worker pega o comunicado.
+        self.assertEqual(processar_comunicados(taxa=0), [])
+
+        Comunicado.objects.filter(pk=comunicado.pk).update(reservado_ate=timezone.now() - timedelta(seconds=1))
+        mail.outbox = []
+        [comunicado] = processar_comunicados(taxa=0)
+        self.assertEqual(comunicado.status, 'CONCLUIDO')
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual((comunicado.total, comunicado.enviados, comunicado.falhas), (5, 5, 0))
+
+    def test_retoma_comunicado_abandonado_pelo_worker(self):
+        terceira = self.evento.inscricoes.order_by('pk')[2]
+        comunicado = Comunicado.objects.create(
+            evento=self.evento, assunto="Aviso", mensagem="Texto", status='ENVIANDO', total=5,
+            enviados=3, ultima_inscricao_id=terceira.pk, reservado_ate=timezone.now() - timedelta(minutes=1),
+        )
+        [retomado] = processar_comunicados(taxa=0)
+        self.assertEqual(retomado.pk, comunicado.pk)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual((retomado.status, retomado.enviados, retomado.reservado_ate), ('CONCLUIDO', 5, None))
+
+    def test_organizador_agenda_e_comando_envia(self):
+        user = User.objects.create_user(username='org', password='x')
+        self.client.force_login(user)
+
+        url = reverse('evento-comunicado', args=[self.evento.pk])
+        resp = self.client.post(url, {'assunto': 'Lembrete', 'mensagem': 'Até amanhã, {nome}.'})
+        self.assertRedirects(resp, reverse('evento-inscritos', args=[self.evento.pk]))
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command('enviar_comunicados', taxa=0, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 5)
+
+        resp = self.client.get(reverse('evento-inscritos', args=[self.evento.pk]))
+        self.assertContains(resp, "Lembrete")
+        self.assertContains(resp, "5/5 enviados")
+
+    def test_comando_com_evento_cria_o_comunicado_reservado(self):
+        concorrentes = []
+
+        def enviar(comunicado, **kwargs):
+            # Um worker --continuo rodando agora não pode pegar o mesmo comunicado.
+            concorrentes.extend(processar_comunicados(taxa=0))
+            return enviar_comunicado(comunicado, **kwargs)
+
+        with mock.patch('eventos.management.commands.enviar_comunicados.enviar_comunicado', side_effect=enviar):
+            call_command(
+                'enviar_comunicados', evento=self.evento.pk, assunto="Aviso", mensagem="Oi, {nome}",
+                taxa=0, stdout=StringIO(),
+            )
+        self.assertEqual(concorrentes, [])
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(Comunicado.objects.get().status, 'CONCLUIDO')
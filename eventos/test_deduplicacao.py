@@ -0,0 +1,115 @@
+import importlib
+from io import StringIO
+
+from django.apps import apps
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import estatisticas
+from eventos.deduplicacao import grupos_duplicados
+from eventos.models import Evento, Inscricao, Participante
+
+migracao_0016 = importlib.import_module('eventos.migrations.0016_participante_email_normalizado')
+
+
+class DeduplicacaoTests(TestCase):
+    def setUp(self):
+        self.palestra = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=10,
+        )
+        self.oficina = Evento.objects.create(
+            titulo="Oficina", tipo="WORKSHOP", data=timezone.now(), local="Sala 2",
+            descricao="Tema", capacidade=10,
+        )
+
+    def criar_duplicado(self, nome, email):
+        # Simula cadastros antigos, anteriores à coluna normalizada e única.
+        participante = Participante.objects.create(nome=nome, email=f"tmp-{nome}@example.com", telefone="1")
+        Participante.objects.filter(pk=participante.pk).update(email=email, email_normalizado=None)
+        return participante
+
+    def test_email_normalizado_e_unico(self):
+        Participante.objects.create(nome="Ana", email=" Ana@Example.com ", telefone="1")
+        self.assertTrue(Participante.objects.filter(email_normalizado="ana@example.com").exists())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Participante.objects.create(nome="Ana 2", email="ANA@example.com", telefone="1")
+
+    def test_mescla_inscricoes_e_remove_duplicados(self):
+        ana = Participante.objects.create(nome="Ana", email="ana@example.com", telefone="1")
+        copia = self.criar_duplicado("Ana2", "ANA@Example.com ")
+        outra = self.criar_duplicado("Ana3", "Ana@example.com")
+        Inscricao.objects.create(evento=self.palestra, participante=ana)
+        Inscricao.objects.create(evento=self.palestra, participante=copia)  # conflito
+        Inscricao.objects.create(evento=self.oficina, participante=outra)
+
+        self.assertEqual(grupos_duplicados(), [("ana@example.com", ana.pk, 3)])
+        saida = StringIO()
+        call_command('mesclar_participantes', stdout=saida)
+        self.assertIn("1 grupo(s) mesclado(s), 2 participante(s) removido(s)", saida.getvalue())
+
+        self.assertEqual(list(Participante.objects.values_list('pk', flat=True)), [ana.pk])
+        self.assertEqual(
+            set(Inscricao.objects.values_list('evento_id', 'participante_id')),
+            {(self.palestra.pk, ana.pk), (self.oficina.pk, ana.pk)},
+        )
+        self.palestra.refresh_from_db()
+        self.assertEqual(self.palestra.vagas_ocupadas, 1)
+        resumo = estatisticas.resumo()
+        self.assertEqual((resumo['total_participantes'], resumo['total_inscricoes']), (1, 2))
+
+    def test_simular_nao_altera(self):
+        Participante.objects.create(nome="Bia", email="bia@example.com", telefone="1")
+        self.criar_duplicado("Bia2", "BIA@example.com")
+        saida = StringIO()
+        call_command('mesclar_participantes', '--simular', stdout=saida)
+        self.assertIn("bia@example.com: 2 cadastros", saida.getvalue())
+        self.assertEqual(Participante.objects.count(), 2)
+
+    def test_inscricao_reaproveita_participante_com_outra_caixa(self):
+        ana = Participante.objects.create(nome="Ana", email="ana@example.com", telefone="1")
+        self.client.post(reverse('evento-inscricao', args=[self.palestra.pk]), {
+            'nome': "Ana Souza", 'email': " ANA@example.com", 'telefone': "2", 'assistencia': "NENHUMA",
+        })
+        self.assertEqual(Participante.objects.count(), 1)
+        self.assertTrue(Inscricao.objects.filter(evento=self.palestra, participante=ana).exists())
+        ana.refresh_from_db()
+        self.assertEqual(ana.nome, "Ana Souza")
+
+    def test_busca_continua_indexada_apos_migracao(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("Gatilhos FTS só existem no SQLite.")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'eventos_participante'"
+            )
+            gatilhos = {nome for (nome,) in cursor.fetchall()}
+        self.assertEqual(
+            gatilhos,
+            {'eventos_participante_busca_ai', 'eventos_participante_busca_ad', 'eventos_participante_busca_au'},
+        )
+
+    def test_agrupa_como_o_save_fora_do_ascii(self):
+        elis = Participante.objects.create(nome="Élis", email="Élis@example.com", telefone="1")
+        self.criar_duplicado("Elis2", " ÉLIS@EXAMPLE.COM")
+        self.assertEqual(grupos_duplicados(), [(elis.email_normalizado, elis.pk, 2)])
+
+    def test_migracao_mescla_e_preenche_com_a_mesma_normalizacao(self):
+        elis = self.criar_duplicado("Elis", "Élis@example.com")
+        copia = self.criar_duplicado("Elis2", "ÉLIS@example.com ")
+        bia = self.criar_duplicado("Bia", "Bia@example.com")
+        Inscricao.objects.create(evento=self.palestra, participante=elis)
+        Inscricao.objects.create(evento=self.oficina, participante=copia)
+
+        migracao_0016.mesclar_e_preencher(apps, None)
+
+        self.assertEqual(
+            dict(Participante.objects.values_list('pk', 'email_normalizado')),
+            {elis.pk: "élis@example.com", bia.pk: "bia@example.com"},
+        )
+        self.assertEqual(set(Inscricao.objects.values_list('participante_id', flat=True)), {elis.pk})
+        self.assertEqual(estatisticas.resumo()['total_participantes'], 1)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from eventos import emails
+from eventos.emails import enfileirar_email, html_ingresso, processar_fila
+from eventos.models import EmailPendente, Evento, Inscricao, Participante
+
+
+class BackendInstavel(EmailBackend):
+    """Falha no envio para um destinatário específico."""
+
+    aberturas = 0
+
+    def open(self):
+        BackendInstavel.aberturas += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        for m in messages:
+            if 'falha@example.com' in m.to:
+                raise ConnectionError("SMTP indisponível")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_FILA_MAX_TENTATIVAS=3, EMAIL_FILA_BACKOFF_SEGUNDOS=10)
+class FilaEmailTests(TestCase):
+    def test_lote_usa_uma_unica_conexao(self):
+        for n in range(5):
+            enfileirar_email('Assunto', 'Corpo', [f'p{n}@example.com'])
+
+        BackendInstavel.aberturas = 0
+        enviados, falhas = processar_fila(lote=10, connection=BackendInstavel())
+
+        self.assertEqual((enviados, falhas), (5, 0))
+        self.assertEqual(BackendInstavel.aberturas, 1)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(EmailPendente.objects.filter(status='ENVIADO').count(), 5)
+
+    def test_respeita_tamanho_do_lote(self):
+        for n in range(3):
+            enfileirar_email('Assunto', 'Corpo', [f'p{n}@example.com'])
+        self.assertEqual(processar_fila(lote=2), (2, 0))
+        self.assertEqual(processar_fila(lote=2), (1, 0))
+        self.assertEqual(processar_fila(lote=2), (0, 0))
+
+    def test_falha_reagenda_com_backoff_e_desiste(self):
+        pendente = enfileirar_email('Assunto', 'Corpo', ['falha@example.com'])
+
+        self.assertEqual(processar_fila(connection=BackendInstavel()), (0, 1))
+        pendente.refresh_from_db()
+        self.assertEqual(pendente.status, 'PENDENTE')
+        self.assertEqual(pendente.tentativas, 1)
+        self.assertIn("SMTP indisponível", pendente.ultimo_erro)
+        self.assertGreater(pendente.proxima_tentativa, timezone.now() + timedelta(seconds=5))
+
+        # Ainda não venceu: não é reprocessado.
+        self.assertEqual(processar_fila(connection=BackendInstavel()), (0, 0))
+
+        futuro = timezone.now() + timedelta(days=1)
+        for tentativa in (2, 3):
+            with mock.patch('eventos.emails.timezone.now', return_value=futuro):
+                processar_fila(connection=BackendInstavel())
+            futuro += timedelta(days=1)
+
+        pendente.refresh_from_db()
+        self.assertEqual(pendente.tentativas, 3)
+        self.assertEqual(pendente.status, 'FALHOU')
+
+
+class HtmlIngressoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema & <debate>", capacidade=10,
+        )
+
+    def inscrever(self, nome, email):
+        participante = Participante.objects.create(nome=nome, email=email, telefone="11 99999-0000")
+        return Inscricao.objects.create(evento=self.evento, participante=participante)
+
+    def test_igual_ao_template_renderizado_por_participante(self):
+        inscricao = self.inscrever("Ana <b>", "ana@example.com")
+        esperado = render_to_string('eventos/ingresso_email.html', {
+            'evento': self.evento,
+            'participante': inscricao.participante,
+            'url_ingresso': 'https://exemplo.com/ingresso/x/?a=1&b=2',
+        })
+        self.assertEqual(html_ingresso(inscricao, 'https://exemplo.com/ingresso/x/?a=1&b=2'), esperado)
+
+    def test_parte_do_evento_renderizada_uma_vez(self):
+        primeira = self.inscrever("Ana", "ana@example.com")
+        segunda = self.inscrever("[[email]]", "bia@example.com")
+        with mock.patch.object(emails, 'render_to_string', wraps=render_to_string) as render:
+            html_ingresso(primeira, '/a/')
+            html = html_ingresso(segunda, '/b/')
+        self.assertEqual(render.call_count, 1)
+        self.assertIn("<strong>[[email]]</strong>", html)
+        self.assertIn("bia@example.com", html)
+
+        self.evento.local = "Sala 2"
+        with mock.patch.object(emails, 'render_to_string', wraps=render_to_string) as render:
+            html = html_ingresso(primeira, '/a/')
+        self.assertEqual(render.call_count, 1)
+        self.assertIn("Sala 2", html)
+
+    def test_texto_do_evento_nao_recebe_dados_do_participante(self):
+        self.evento.titulo = "Oficina [[nome]]"
+        self.evento.descricao = "Veja [[url_ingresso]] e [[email]]"
+        inscricao = self.inscrever("Ana", "ana@example.com")
+        html = html_ingresso(inscricao, '/ingresso/x/')
+        self.assertIn("Oficina [[nome]]", html)
+        self.assertIn("Veja [[url_ingresso]] e [[email]]", html)
+        self.assertIn("ana@example.com", html)
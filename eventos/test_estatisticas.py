@@ -0,0 +1,116 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import estatisticas
+from eventos.models import Contador, Evento, Inscricao, Participante
+from eventos.vagas import liberar_vaga, reservar_vaga
+
+
+def snapshot():
+    return {(c.escopo, c.chave): c.valor for c in Contador.objects.exclude(valor=0)}
+
+
+class EstatisticasTests(TestCase):
+    def criar_evento(self, titulo, tipo='PALESTRA', capacidade=10):
+        return Evento.objects.create(
+            titulo=titulo, tipo=tipo, data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=capacidade,
+        )
+
+    def criar_participante(self, n, assistencia='NENHUMA'):
+        return Participante.objects.create(
+            nome=f"P{n}", email=f"p{n}@example.com", telefone="1", assistencia=assistencia
+        )
+
+    def test_contadores_incrementais_batem_com_a_reconstrucao(self):
+        palestra = self.criar_evento("Palestra")
+        oficina = self.criar_evento("Oficina", tipo='WORKSHOP', capacidade=5)
+        ana = self.criar_participante(1, 'LOCOMOCAO')
+        bia = self.criar_participante(2)
+        reservar_vaga(palestra, ana)
+        reservar_vaga(oficina, ana)
+        Inscricao.objects.create(evento=palestra, participante=bia)
+
+        resumo = estatisticas.resumo()
+        self.assertEqual(resumo['total_eventos'], 2)
+        self.assertEqual(resumo['total_inscricoes'], 3)
+        self.assertEqual(resumo['total_participantes'], 2)
+        self.assertEqual(resumo['taxa_ocupacao'], 20)
+        self.assertEqual(dict(resumo['por_tipo'])['Workshop'], 1)
+        self.assertEqual(resumo['serie_diaria'][-1], (timezone.localdate(), 3))
+
+        # Alterações que movem totais entre chaves.
+        oficina = Evento.objects.get(pk=oficina.pk)
+        oficina.tipo = 'MINICURSO'
+        oficina.capacidade = 8
+        oficina.save()
+        bia = Participante.objects.get(pk=bia.pk)
+        bia.assistencia = 'AUDIOVISUAL'
+        bia.save()
+        liberar_vaga(Inscricao.objects.get(evento=palestra, participante=ana))
+        palestra.delete()
+
+        incremental = snapshot()
+        call_command('reconstruir_estatisticas', stdout=StringIO())
+        self.assertEqual(incremental, snapshot())
+        self.assertEqual(incremental[estatisticas.GLOBAL, 'participantes'], 1)
+        self.assertEqual(incremental[estatisticas.ASSISTENCIA, 'LOCOMOCAO'], 1)
+        self.assertNotIn((estatisticas.ASSISTENCIA, 'AUDIOVISUAL'), incremental)
+
+    def test_exclusao_de_eventos_desconta_a_cascata_em_lote(self):
+        palestra = self.criar_evento("Palestra")
+        oficina = self.criar_evento("Oficina", tipo='WORKSHOP')
+        minicurso = self.criar_evento("Minicurso", tipo='MINICURSO')
+        ana = self.criar_participante(1, 'LOCOMOCAO')
+        bia = self.criar_participante(2)
+        caio = self.criar_participante(3, 'AUDIOVISUAL')
+        for evento, participante in [(palestra, ana), (palestra, bia), (oficina, bia), (oficina, caio),
+                                     (minicurso, caio)]:
+            reservar_vaga(evento, participante)
+
+        palestra.delete()
+        self.assertEqual(snapshot()[estatisticas.GLOBAL, 'participantes'], 2)
+        # bia só estava na palestra e na oficina: as duas saem no mesmo delete().
+        Evento.objects.filter(pk__in=[oficina.pk]).delete()
+
+        incremental = snapshot()
+        estatisticas.reconstruir()
+        self.assertEqual(incremental, snapshot())
+        self.assertEqual(incremental[estatisticas.GLOBAL, 'participantes'], 1)
+        self.assertEqual(incremental[estatisticas.ASSISTENCIA, 'AUDIOVISUAL'], 1)
+
+    def test_exclusao_de_evento_nao_consulta_por_inscricao(self):
+        poucas, muitas = self.criar_evento("Poucas"), self.criar_evento("Muitas")
+        for n in range(2):
+            reservar_vaga(poucas, self.criar_participante(n))
+        for n in range(2, 12):
+            reservar_vaga(muitas, self.criar_participante(n))
+        with CaptureQueriesContext(connection) as com_poucas:
+            poucas.delete()
+        with CaptureQueriesContext(connection) as com_muitas:
+            muitas.delete()
+        self.assertEqual(len(com_poucas), len(com_muitas))
+
+    def test_reconstruir_corrige_vagas_ocupadas(self):
+        evento = self.criar_evento("Palestra")
+        Inscricao.objects.bulk_create(
+            [Inscricao(evento=evento, participante=self.criar_participante(n)) for n in range(3)]
+        )
+        estatisticas.reconstruir()
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 3)
+        self.assertEqual(estatisticas.resumo()['total_inscricoes'], 3)
+
+    def test_dashboard_le_os_contadores(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        reservar_vaga(self.criar_evento("Palestra"), self.criar_participante(1))
+        with self.assertNumQueries(4):
+            resp = self.client.get(reverse('dashboard'))
+        self.assertEqual(resp.context['total_inscricoes'], 1)
@@ -0,0 +1,140 @@
+import csv
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.exportacao import processar_exportacoes
+from eventos.models import Evento, Exportacao, Inscricao, Participante
+
+User = get_user_model()
+
+
+class ExportacaoSegundoPlanoTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.raiz = tempfile.mkdtemp()
+        cls.settings_override = override_settings(EXPORTACOES_ROOT=cls.raiz)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.raiz, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='org', password='x')
+        self.client.force_login(self.user)
+        self.evento = Evento.objects.create(
+            titulo="Workshop SQL",
+            tipo="WORKSHOP",
+            data=timezone.now(),
+            local="Lab 3",
+            descricao="Consultas",
+            capacidade=10,
+        )
+        for nome in ("Ana", "Bruno"):
+            p = Participante.objects.create(
+                nome=nome, email=f"{nome.lower()}@example.com", telefone="1", assistencia="NENHUMA"
+            )
+            Inscricao.objects.create(evento=self.evento, participante=p)
+
+    def solicitar(self, formato):
+        resp = self.client.post(reverse('inscricoes-exportar-job'), {'formato': formato, 'evento': self.evento.pk})
+        exportacao = Exportacao.objects.latest('pk')
+        self.assertRedirects(resp, reverse('exportacao-detail', args=[exportacao.pk]))
+        return exportacao
+
+    def baixar(self, exportacao):
+        resp = self.client.get(reverse('exportacao-baixar', args=[exportacao.pk]))
+        self.assertEqual(resp.status_code, 200)
+        return b''.join(resp.streaming_content)
+
+    def test_fluxo_csv_status_e_download(self):
+        exportacao = self.solicitar('CSV')
+        status = self.client.get(reverse('exportacao-status', args=[exportacao.pk])).json()
+        self.assertEqual(status['status'], 'PENDENTE')
+        self.assertIsNone(status['download'])
+        self.assertEqual(self.client.get(reverse('exportacao-baixar', args=[exportacao.pk])).status_code, 404)
+
+        processar_exportacoes()
+
+        status = self.client.get(reverse('exportacao-status', args=[exportacao.pk])).json()
+        self.assertEqual(status['status'], 'CONCLUIDO')
+        self.assertEqual(status['total_linhas'], 2)
+        linhas = list(csv.reader(io.StringIO(self.baixar(exportacao).decode('utf-8'))))
+        self.assertEqual(linhas[0][0], 'Evento')
+        self.assertEqual(len(linhas), 3)
+
+        exportacao.refresh_from_db()
+        self.assertEqual(os.path.dirname(exportacao.arquivo.path), os.path.abspath(self.raiz))
+        self.assertIn(os.path.basename(exportacao.arquivo.name), os.listdir(self.raiz))
+
+    def test_csv_gz_e_xlsx(self):
+        gz = self.solicitar('CSV_GZ')
+        xlsx = self.solicitar('XLSX')
+        processar_exportacoes()
+
+        texto = gzip.decompress(self.baixar(gz)).decode('utf-8')
+        self.assertIn("Ana", texto)
+
+        with zipfile.ZipFile(io.BytesIO(self.baixar(xlsx))) as zf:
+            planilha = zf.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        self.assertEqual(planilha.count('<row>'), 3)
+        self.assertIn("Bruno", planilha)
+
+    def test_reaproveita_arquivo_enquanto_dados_nao_mudam(self):
+        primeira = self.solicitar('CSV')
+        self.assertEqual(self.solicitar('CSV').pk, primeira.pk)  # ainda na fila
+        processar_exportacoes()
+
+        self.assertEqual(self.solicitar('CSV').pk, primeira.pk)  # pronta e atual
+
+        p = Participante.objects.create(nome="Carla", email="carla@example.com", telefone="1")
+        Inscricao.objects.create(evento=self.evento, participante=p)
+        self.assertNotEqual(self.solicitar('CSV').pk, primeira.pk)
+
+    def test_edicao_de_participante_ou_evento_invalida_o_arquivo(self):
+        primeira = self.solicitar('CSV')
+        processar_exportacoes()
+
+        participante = Inscricao.objects.filter(evento=self.evento).first().participante
+        participante.nome = "Outro nome"
+        participante.save()
+        segunda = self.solicitar('CSV')
+        self.assertNotEqual(segunda.pk, primeira.pk)
+        processar_exportacoes()
+        self.assertIn("Outro nome", self.baixar(segunda).decode('utf-8'))
+
+        self.assertEqual(self.solicitar('CSV').pk, segunda.pk)
+        evento = Evento.objects.get(pk=self.evento.pk)
+        evento.titulo = "Título novo"
+        evento.save()
+        self.assertNotEqual(self.solicitar('CSV').pk, segunda.pk)
+
+    def test_filtros_invalidos_devolvem_400(self):
+        url = reverse('inscricoes-exportar-job')
+        for dados in ({'evento': 'abc'}, {'evento': 999999}, {'formato': 'PDF'}, {'q': 'x' * 101}):
+            with self.subTest(dados=dados):
+                self.assertEqual(self.client.post(url, dados).status_code, 400)
+        self.assertFalse(Exportacao.objects.exists())
+
+    def test_retoma_exportacao_abandonada_pelo_worker(self):
+        exportacao = self.solicitar('CSV')
+        Exportacao.objects.filter(pk=exportacao.pk).update(status='PROCESSANDO', iniciado_em=timezone.now())
+        self.assertEqual(processar_exportacoes(), [])  # outro worker ainda está nela
+
+        Exportacao.objects.filter(pk=exportacao.pk).update(iniciado_em=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.solicitar('CSV').pk, exportacao.pk)
+        [retomada] = processar_exportacoes()
+        self.assertEqual((retomada.pk, retomada.status, retomada.total_linhas), (exportacao.pk, 'CONCLUIDO', 2))
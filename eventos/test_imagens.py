@@ -0,0 +1,212 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from eventos import imagens
+from eventos.imagens import processar_imagens, receber_upload
+from eventos.models import Evento
+
+User = get_user_model()
+
+
+def arquivo_jpeg(nome='capa.jpg', tamanho=(2000, 1000), cor='navy'):
+    saida = io.BytesIO()
+    Image.new('RGB', tamanho, cor).save(saida, 'JPEG')
+    return SimpleUploadedFile(nome, saida.getvalue(), content_type='image/jpeg')
+
+
+class PipelineImagensTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.raiz = tempfile.mkdtemp()
+        cls.publicadas = os.path.join(cls.raiz, 'publicadas')
+        cls.settings_override = override_settings(
+            IMAGENS_STAGING_ROOT=os.path.join(cls.raiz, 'staging'),
+            STORAGES={**settings.STORAGES, 'imagens': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': cls.publicadas, 'base_url': '/media/imagens/'},
+            }},
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.raiz, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        for pasta in ('staging', 'publicadas'):
+            self.addCleanup(shutil.rmtree, os.path.join(self.raiz, pasta), ignore_errors=True)
+        self.user = User.objects.create_user(username='org', password='x')
+        self.client.force_login(self.user)
+        self.evento = Evento.objects.create(
+            titulo="Meetup Python",
+            tipo="PALESTRA",
+            data=timezone.now() + timezone.timedelta(days=1),
+            local="Auditório",
+            descricao="Palestras",
+            capacidade=10,
+        )
+
+    def editar(self, **extra):
+        dados = {
+            'titulo': self.evento.titulo, 'tipo': self.evento.tipo,
+            'data': timezone.localtime(self.evento.data).strftime('%d/%m/%Y %H:%M'),
+            'local': self.evento.local, 'descricao': self.evento.descricao, 'capacidade': 10,
+        }
+        dados.update(extra)
+        return self.client.post(reverse('evento-update', args=[self.evento.pk]), dados)
+
+    def arquivos_publicados(self):
+        pasta = os.path.join(self.publicadas, 'eventos', str(self.evento.pk))
+        return sorted(os.listdir(pasta)) if os.path.isdir(pasta) else []
+
+    def test_upload_fica_em_staging_ate_o_worker(self):
+        resp = self.editar(imagem=arquivo_jpeg())
+        self.assertRedirects(resp, reverse('evento-list'))
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.imagem_status, 'PENDENTE')
+        self.assertTrue(imagens.storage_staging().exists(self.evento.imagem_pendente))
+        self.assertEqual(self.arquivos_publicados(), [])
+        self.assertFalse(self.evento.tem_imagem)
+
+    def test_worker_gera_variantes_e_guarda_urls(self):
+        receber_upload(self.evento, arquivo_jpeg())
+        pendente = Evento.objects.get(pk=self.evento.pk).imagem_pendente
+
+        processados = processar_imagens()
+
+        self.assertEqual([e.imagem_status for e in processados], ['PRONTA'])
+        evento = processados[0]
+        self.assertEqual(set(evento.imagem_variantes), {'400', '800', '1200', 'completa'})
+        self.assertFalse(imagens.storage_staging().exists(pendente))
+        self.assertEqual(len(self.arquivos_publicados()), 4)
+        storage = imagens.storage_imagens()
+        with storage.open(evento.imagem_variantes['800']['nome']) as arquivo:
+            self.assertEqual(Image.open(arquivo).size, (800, 450))
+        with storage.open(evento.imagem_variantes['completa']['nome']) as arquivo:
+            self.assertEqual(Image.open(arquivo).size, (1600, 800))
+        self.assertTrue(evento.url_imagem.startswith(f'/media/imagens/eventos/{evento.pk}/'))
+
+    def test_renderizacao_nao_consulta_o_storage(self):
+        receber_upload(self.evento, arquivo_jpeg())
+        processar_imagens()
+        evento = Evento.objects.get(pk=self.evento.pk)
+
+        with mock.patch.object(FileSystemStorage, 'url', side_effect=AssertionError("chamada ao storage")), \
+                mock.patch.object(FileSystemStorage, 'exists', side_effect=AssertionError("chamada ao storage")):
+            resp = self.client.get(reverse('evento-list'))
+        self.assertContains(resp, f"{evento.imagem_variantes['800']['url']} 800w")
+        self.assertContains(resp, 'loading="lazy"')
+
+    def test_nova_imagem_substitui_e_apaga_as_variantes_antigas(self):
+        receber_upload(self.evento, arquivo_jpeg(cor='red'))
+        processar_imagens()
+        antigas = self.arquivos_publicados()
+
+        receber_upload(self.evento, arquivo_jpeg(cor='green'))
+        # Até o worker rodar, a imagem anterior continua no ar.
+        self.assertTrue(Evento.objects.get(pk=self.evento.pk).tem_imagem)
+        processar_imagens()
+
+        novas = self.arquivos_publicados()
+        self.assertEqual(len(novas), 4)
+        self.assertFalse(set(antigas) & set(novas))
+
+    def test_upload_durante_o_processamento_descarta_o_resultado_antigo(self):
+        receber_upload(self.evento, arquivo_jpeg(cor='red'))
+        publicar = imagens.publicar
+
+        def publicar_com_novo_upload(evento_id, nome):
+            variantes = publicar(evento_id, nome)
+            receber_upload(self.evento, arquivo_jpeg(cor='green'))
+            return variantes
+
+        with mock.patch.object(imagens, 'publicar', publicar_com_novo_upload):
+            processar_imagens()
+        evento = Evento.objects.get(pk=self.evento.pk)
+        self.assertEqual(evento.imagem_status, 'PENDENTE')
+        self.assertEqual(evento.imagem_variantes, {})
+        self.assertEqual(self.arquivos_publicados(), [])
+
+        processar_imagens()
+        self.assertEqual(Evento.objects.get(pk=self.evento.pk).imagem_status, 'PRONTA')
+
+    def test_arquivo_corrompido_marca_falha(self):
+        receber_upload(self.evento, SimpleUploadedFile('capa.jpg', b'nao e uma imagem'))
+        processar_imagens()
+        evento = Evento.objects.get(pk=self.evento.pk)
+        self.assertEqual(evento.imagem_status, 'FALHOU')
+        self.assertTrue(evento.imagem_erro)
+        self.assertEqual(self.arquivos_publicados(), [])
+
+    def test_formulario_rejeita_arquivo_que_nao_e_imagem(self):
+        resp = self.editar(imagem=SimpleUploadedFile('capa.jpg', b'nao e uma imagem'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Evento.objects.get(pk=self.evento.pk).imagem_status, '')
+
+    def test_edicao_nao_sobrescreve_variantes_publicadas_pelo_worker(self):
+        aberto = Evento.objects.get(pk=self.evento.pk)
+        receber_upload(self.evento, arquivo_jpeg())
+        processar_imagens()
+
+        aberto.titulo = "Meetup Python (novo título)"
+        aberto.save()
+
+        evento = Evento.objects.get(pk=self.evento.pk)
+        self.assertEqual(evento.titulo, "Meetup Python (novo título)")
+        self.assertEqual(evento.imagem_status, 'PRONTA')
+        self.assertTrue(evento.imagem_variantes)
+
+    def test_remover_imagem(self):
+        receber_upload(self.evento, arquivo_jpeg())
+        processar_imagens()
+
+        self.editar(remover_imagem='on')
+
+        evento = Evento.objects.get(pk=self.evento.pk)
+        self.assertFalse(evento.tem_imagem)
+        self.assertEqual(evento.url_imagem, '')
+        self.assertEqual(self.arquivos_publicados(), [])
+
+    def test_retoma_imagem_abandonada_pelo_worker(self):
+        receber_upload(self.evento, arquivo_jpeg())
+        Evento.objects.filter(pk=self.evento.pk).update(
+            imagem_status='PROCESSANDO', imagem_processando_desde=timezone.now(),
+        )
+        self.assertEqual(processar_imagens(), [])  # outro worker ainda está nela
+
+        Evento.objects.filter(pk=self.evento.pk).update(
+            imagem_processando_desde=timezone.now() - timedelta(hours=1),
+        )
+        [evento] = processar_imagens()
+        self.assertEqual(evento.imagem_status, 'PRONTA')
+        self.assertEqual(len(self.arquivos_publicados()), 4)
+
+    def test_comando_exige_cache_compartilhado(self):
+        with self.assertRaisesMessage(CommandError, "LocMemCache"):
+            call_command('processar_imagens', stdout=io.StringIO())
+
+        receber_upload(self.evento, arquivo_jpeg())
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(self.raiz, 'cache'),
+        }}):
+            call_command('processar_imagens', stdout=io.StringIO())
+        self.assertEqual(Evento.objects.get(pk=self.evento.pk).imagem_status, 'PRONTA')
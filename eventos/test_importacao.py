@@ -0,0 +1,104 @@
+import io
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import estatisticas
+from eventos.importacao import importar_inscricoes
+from eventos.models import Contador, Evento, Inscricao, Participante
+
+CSV = """Nome,Email,Telefone,Assistencia,Assistencia_detalhes
+Ana,ana@example.com,(11) 91111-1111,,
+Bia,BIA@example.com,11 92222-2222,LOCOMOCAO,
+Sem email,,11 93333-3333,,
+Outra,outra@example.com,1,OUTRA,
+Ana de novo,Ana@Example.com,1,,
+Caio,caio@example.com,1,,
+Duda,duda@example.com,1,,
+"""
+
+
+def snapshot():
+    return {(c.escopo, c.chave): c.valor for c in Contador.objects.exclude(valor=0)}
+
+
+class ImportacaoTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=4,
+        )
+        # Bia já existe (com outro caso no e-mail) e Caio já está inscrito.
+        self.bia = Participante.objects.create(nome="Bia", email="bia@example.com", telefone="1")
+        caio = Participante.objects.create(nome="Caio", email="caio@example.com", telefone="1")
+        Inscricao.objects.create(evento=self.evento, participante=caio)
+
+    def test_importa_valida_e_relata_erros(self):
+        resultado = importar_inscricoes(self.evento, io.StringIO(CSV), lote=3)
+
+        self.assertEqual(resultado.linhas, 7)
+        self.assertEqual(resultado.inscricoes_criadas, 3)  # Ana, Bia e Duda
+        self.assertEqual(resultado.participantes_criados, 2)
+        self.assertEqual(resultado.ja_inscritos, 1)
+        self.assertEqual([linha for linha, _ in resultado.erros], [4, 5, 6])
+        self.assertIn("email", resultado.erros[0][1])
+        self.assertIn("linha 2", resultado.erros[2][1])
+
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 4)
+        self.assertTrue(Inscricao.objects.filter(evento=self.evento, participante=self.bia).exists())
+        self.assertEqual(Participante.objects.get(email='ana@example.com').telefone_digitos, '11911111111')
+
+    def test_respeita_a_capacidade(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+        resultado = importar_inscricoes(self.evento, io.StringIO(CSV))
+        self.assertEqual(resultado.inscricoes_criadas, 1)
+        self.assertEqual(resultado.erros[-1][1], "Evento esgotado.")
+
+    def test_estatisticas_batem_com_a_reconstrucao(self):
+        importar_inscricoes(self.evento, io.StringIO(CSV))
+        antes = snapshot()
+        estatisticas.reconstruir()
+        self.assertEqual(antes, snapshot())
+        self.assertEqual(antes[estatisticas.GLOBAL, 'participantes'], 4)
+
+    def test_coluna_obrigatoria_ausente(self):
+        with self.assertRaisesMessage(ValueError, "telefone"):
+            importar_inscricoes(self.evento, io.StringIO("nome,email\nAna,ana@example.com\n"))
+
+    def test_comando(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8') as arquivo:
+            arquivo.write(CSV)
+            arquivo.flush()
+            saida, erros = StringIO(), StringIO()
+            call_command('importar_inscricoes', self.evento.pk, arquivo.name, stdout=saida, stderr=erros)
+        self.assertIn("3 inscrição(ões) criada(s)", saida.getvalue())
+        self.assertIn("4,", erros.getvalue())
+
+    def test_csv_malformado(self):
+        quebrado = "nome,email,telefone\n\"" + "x" * 200_000 + "\",a@example.com,1\n"
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        arquivo = SimpleUploadedFile('lista.csv', quebrado.encode(), content_type='text/csv')
+        resp = self.client.post(reverse('evento-importar', args=[self.evento.pk]), {'arquivo': arquivo})
+        self.assertEqual(resp.status_code, 200)
+        self.assertFormError(resp.context['form'], 'arquivo', "CSV inválido: field larger than field limit (131072).")
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8') as destino:
+            destino.write(quebrado)
+            destino.flush()
+            with self.assertRaisesMessage(CommandError, "CSV inválido"):
+                call_command('importar_inscricoes', self.evento.pk, destino.name, stdout=StringIO())
+
+    def test_upload(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        arquivo = SimpleUploadedFile('lista.csv', CSV.encode('utf-8-sig'), content_type='text/csv')
+        resp = self.client.post(reverse('evento-importar', args=[self.evento.pk]), {'arquivo': arquivo})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.context['resultado'].inscricoes_criadas, 3)
+        self.assertContains(resp, "E-mail repetido no arquivo")
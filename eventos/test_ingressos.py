@@ -0,0 +1,67 @@
+from django.core import signing
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.ingressos import SALT, ler_token
+from eventos.models import Evento, Inscricao, ListaEspera, Participante
+from eventos.vagas import entrar_na_espera, reservar_vaga
+
+
+class IngressoTokenTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Oficina", tipo="WORKSHOP", data=timezone.now(), local="Sala 3",
+            descricao="Prática", capacidade=1,
+        )
+        self.ana = Participante.objects.create(nome="Ana", email="ana@example.com", telefone="1")
+        self.inscricao = reservar_vaga(self.evento, self.ana)
+        self.url = reverse('ingresso-detail', args=[self.inscricao.token])
+
+    def test_token_leva_inscricao_e_evento(self):
+        self.assertEqual(ler_token(self.inscricao.token), (self.inscricao.pk, self.evento.pk))
+        self.assertIsNone(ler_token(self.inscricao.token + 'x'))
+        self.assertIsNone(ler_token(signing.dumps([self.inscricao.pk, self.evento.pk], salt='outro')))
+        self.assertIsNone(ler_token(signing.dumps('texto', salt=SALT)))
+
+    def test_id_sequencial_nao_abre_ingresso(self):
+        self.assertEqual(self.client.get(f'/ingresso/{self.inscricao.pk}/').status_code, 404)
+
+    def test_token_adulterado_recusado_sem_consultar_o_banco(self):
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse('ingresso-detail', args=[self.inscricao.token[:-2] + 'zz']))
+        self.assertEqual(resp.status_code, 404)
+
+    def test_ingresso_fica_no_cache_por_token(self):
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.url)
+        self.assertContains(resp, "Ana")
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_cancelar_libera_a_vaga_e_promove_a_espera(self):
+        bia = Participante.objects.create(nome="Bia", email="bia@example.com", telefone="1")
+        entrar_na_espera(self.evento, bia)
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse('ingresso-cancelar', args=[self.inscricao.token]))
+        self.assertRedirects(resp, reverse('evento-list'), fetch_redirect_response=False)
+
+        self.assertFalse(Inscricao.objects.filter(participante=self.ana).exists())
+        self.assertTrue(Inscricao.objects.filter(evento=self.evento, participante=bia).exists())
+        self.assertFalse(ListaEspera.objects.exists())
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+        # O ingresso cancelado sai do cache junto com a versão do evento.
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_cancelar_duas_vezes_nao_devolve_vaga_em_dobro(self):
+        url = reverse('ingresso-cancelar', args=[self.inscricao.token])
+        self.assertEqual(self.client.post(url).status_code, 302)
+        self.assertEqual(self.client.post(url).status_code, 404)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 0)
+
+    def test_cancelar_exige_post(self):
+        self.assertEqual(self.client.get(reverse('ingresso-cancelar', args=[self.inscricao.token])).status_code, 405)
@@ -0,0 +1,160 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import EmailPendente, Evento, Inscricao, ListaEspera, Participante
+from eventos.vagas import EventoEsgotado, entrar_na_espera, liberar_vaga, promover_da_espera, reservar_vaga
+
+
+def criar_evento(capacidade):
+    return Evento.objects.create(
+        titulo="Workshop Concorrido", tipo="WORKSHOP", data=timezone.now(), local="Sala 1",
+        descricao="Vagas limitadas", capacidade=capacidade,
+    )
+
+
+def criar_participante(n):
+    return Participante.objects.create(
+        nome=f"Participante {n}", email=f"p{n}@example.com", telefone="11999990000", assistencia="NENHUMA"
+    )
+
+
+def inscritos(evento):
+    return set(Inscricao.objects.filter(evento=evento).values_list('participante_id', flat=True))
+
+
+class ListaEsperaTests(TestCase):
+    def setUp(self):
+        self.evento = criar_evento(capacidade=1)
+        self.ana = criar_participante(1)
+        self.inscricao = reservar_vaga(self.evento, self.ana)
+        self.fila = [criar_participante(n) for n in range(2, 5)]
+        for participante in self.fila:
+            entrar_na_espera(self.evento, participante)
+
+    def test_posicoes_em_ordem_de_chegada(self):
+        esperas = list(ListaEspera.objects.filter(evento=self.evento))
+        self.assertEqual([e.participante for e in esperas], self.fila)
+        self.assertEqual([e.posicao() for e in esperas], [1, 2, 3])
+        self.assertEqual(entrar_na_espera(self.evento, self.fila[0]), esperas[0])
+
+    def test_cancelamento_promove_o_primeiro_da_fila(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            liberar_vaga(self.inscricao)
+
+        self.assertEqual(inscritos(self.evento), {self.fila[0].pk})
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+        self.assertEqual(ListaEspera.objects.filter(evento=self.evento).count(), 2)
+        email = EmailPendente.objects.get(destinatarios=[self.fila[0].email])
+        self.assertIn("Vaga liberada", email.assunto)
+        self.assertIn("lista de espera", email.corpo_html)
+
+    def test_aumento_de_capacidade_promove(self):
+        evento = Evento.objects.get(pk=self.evento.pk)
+        evento.capacidade = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            evento.save()
+
+        self.assertEqual(inscritos(self.evento), {self.ana.pk, self.fila[0].pk, self.fila[1].pk})
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 3)
+
+    def test_inscricao_direta_nao_fura_a_fila(self):
+        # Vaga liberada sem passar pela promoção (ex.: a promoção do on_commit ainda não rodou).
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+        with self.assertRaises(EventoEsgotado):
+            reservar_vaga(self.evento, criar_participante(9))
+
+        promovidas = promover_da_espera(self.evento.pk)
+        self.assertEqual([i.participante_id for i in promovidas], [self.fila[0].pk])
+
+    def test_exclusao_do_evento_nao_promove(self):
+        with mock.patch('eventos.signals.promover_da_espera') as promover:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                Evento.objects.get(pk=self.evento.pk).delete()
+        self.assertEqual(callbacks, [])
+        promover.assert_not_called()
+
+    def test_quem_ja_esta_inscrito_so_sai_da_fila(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+        Inscricao.objects.create(evento=self.evento, participante=self.fila[0])
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=3)
+
+        promovidas = promover_da_espera(self.evento.pk)
+        self.assertEqual([i.participante_id for i in promovidas], [self.fila[1].pk])
+        self.assertEqual(
+            list(ListaEspera.objects.filter(evento=self.evento).values_list('participante_id', flat=True)),
+            [self.fila[2].pk],
+        )
+
+    def test_comando_promove_eventos_com_vaga(self):
+        Evento.objects.filter(pk=self.evento.pk).update(capacidade=2)
+        saida = StringIO()
+        call_command('promover_lista_espera', stdout=saida)
+        self.assertIn("1 inscrição(ões) promovida(s)", saida.getvalue())
+
+    def test_edicao_nao_sobrescreve_vagas_ocupadas(self):
+        evento = Evento.objects.get(pk=self.evento.pk)
+        Evento.objects.filter(pk=evento.pk).update(vagas_ocupadas=0)
+        evento.titulo = "Outro título"
+        evento.save()
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, 0)
+
+    def test_inscricao_em_evento_esgotado_entra_na_fila(self):
+        resp = self.client.post(reverse('evento-inscricao', args=[self.evento.pk]), {
+            'nome': "Nova", 'email': "nova@example.com", 'telefone': "1", 'assistencia': "NENHUMA",
+        })
+        self.assertContains(resp, "Evento esgotado. Você entrou na lista de espera.")
+        self.assertContains(resp, "posição 4 da lista de espera")
+        espera = ListaEspera.objects.get(participante__email="nova@example.com")
+        self.assertEqual(espera.evento, self.evento)
+
+
+class PromocaoConcorrenteTests(TransactionTestCase):
+    CAPACIDADE = 20
+    CANCELAMENTOS = 12
+    FILA = 30
+
+    def _cancelar(self, inscricao):
+        try:
+            # O cancelamento já commitado não se repete se a promoção (on_commit) falhar.
+            while inscricao.pk is not None:
+                try:
+                    liberar_vaga(inscricao)
+                except OperationalError:
+                    # SQLite serializa escritores: "database table is locked".
+                    time.sleep(0.001)
+        finally:
+            connection.close()
+
+    def test_cancelamentos_concorrentes_promovem_a_fila_em_ordem(self):
+        evento = criar_evento(capacidade=self.CAPACIDADE)
+        inscricoes = [reservar_vaga(evento, criar_participante(n)) for n in range(self.CAPACIDADE)]
+        fila = [criar_participante(1000 + n) for n in range(self.FILA)]
+        for participante in fila:
+            entrar_na_espera(evento, participante)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(self._cancelar, inscricoes[:self.CANCELAMENTOS]))
+        # Promoções que perderam a disputa pelo banco ficam para a varredura periódica.
+        call_command('promover_lista_espera', stdout=StringIO())
+
+        evento.refresh_from_db()
+        self.assertEqual(evento.vagas_ocupadas, self.CAPACIDADE)
+        self.assertEqual(Inscricao.objects.filter(evento=evento).count(), self.CAPACIDADE)
+        promovidos = {p.pk for p in fila[:self.CANCELAMENTOS]}
+        self.assertLessEqual(promovidos, inscritos(evento))
+        self.assertEqual(
+            list(ListaEspera.objects.filter(evento=evento).values_list('participante_id', flat=True)),
+            [p.pk for p in fila[self.CANCELAMENTOS:]],
+        )
+        self.assertEqual(EmailPendente.objects.filter(assunto__startswith="Vaga liberada").count(), self.CANCELAMENTOS)
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import Evento, Inscricao, Participante
+from eventos.paginacao import codificar_cursor, decodificar_cursor, paginar_por_cursor
+
+
+class PaginacaoCursorTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=100,
+        )
+        agora = timezone.now()
+        for n in range(7):
+            p = Participante.objects.create(nome=f"P{n}", email=f"p{n}@example.com", telefone="1")
+            # Pares com o mesmo horário para exercitar o desempate por id.
+            Inscricao.objects.create(evento=self.evento, participante=p)
+            Inscricao.objects.filter(participante=p).update(data_inscricao=agora - timedelta(minutes=n // 2))
+        self.ordem = list(Inscricao.objects.order_by('-data_inscricao', '-id'))
+
+    def test_percorre_todas_as_paginas_sem_repetir(self):
+        vistos, cursor = [], ''
+        while True:
+            pagina = paginar_por_cursor(Inscricao.objects.all(), cursor, tamanho=3)
+            vistos.extend(pagina.itens)
+            if not pagina.tem_proxima:
+                break
+            cursor = pagina.proximo
+        self.assertEqual(vistos, self.ordem)
+
+    def test_volta_para_a_pagina_anterior(self):
+        primeira = paginar_por_cursor(Inscricao.objects.all(), '', tamanho=3)
+        self.assertFalse(primeira.tem_anterior)
+        segunda = paginar_por_cursor(Inscricao.objects.all(), primeira.proximo, tamanho=3)
+        self.assertEqual(segunda.itens, self.ordem[3:6])
+        de_volta = paginar_por_cursor(Inscricao.objects.all(), segunda.anterior, tamanho=3)
+        self.assertEqual(de_volta.itens, primeira.itens)
+        self.assertFalse(de_volta.tem_anterior)
+        self.assertTrue(de_volta.tem_proxima)
+
+    def test_cursor_invalido_volta_para_a_primeira_pagina(self):
+        self.assertIsNone(decodificar_cursor('lixo!'))
+        pagina = paginar_por_cursor(Inscricao.objects.all(), 'lixo!', tamanho=3)
+        self.assertEqual(pagina.itens, self.ordem[:3])
+
+    def test_cursor_preserva_microssegundos(self):
+        ins = self.ordem[0]
+        data, pk, _ = decodificar_cursor(codificar_cursor(ins, 'p'))
+        self.assertEqual((data, pk), (ins.data_inscricao, ins.pk))
+
+    def test_view_admin_sem_count(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        resp = self.client.get(reverse('inscricoes-admin'))
+        self.assertEqual(resp.context['total'], 7)
+        self.assertEqual(len(resp.context['inscricoes']), 7)
+        self.assertFalse(resp.context['pagina'].tem_proxima)
+
+        resp = self.client.get(reverse('inscricoes-admin'), {'q': 'P1'})
+        self.assertIsNone(resp.context['total'])
+        resp = self.client.get(reverse('inscricoes-admin'), {'q': 'P1', 'contar': '1'})
+        self.assertEqual(resp.context['total'], 1)
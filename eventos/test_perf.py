@@ -0,0 +1,114 @@
+import re
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import perf
+from eventos.emails import enfileirar_email, processar_fila
+from eventos.models import Evento
+
+
+def server_timing(resp):
+    return {
+        nome: float(dur)
+        for nome, dur in re.findall(r'(\w+);dur=([\d.]+)', resp['Server-Timing'])
+    }
+
+
+class InstrumentacaoTests(TestCase):
+    def setUp(self):
+        perf.metricas.limpar()
+        for i in range(3):
+            Evento.objects.create(
+                titulo=f"Evento {i}", tipo="PALESTRA", data=timezone.now() + timezone.timedelta(days=1),
+                local="Auditório", descricao="Descrição", capacidade=10,
+            )
+
+    @override_settings(PERF_SERVER_TIMING=True)
+    def test_server_timing_com_sql_e_templates(self):
+        resp = self.client.get(reverse('evento-list'))
+        tempos = server_timing(resp)
+        self.assertEqual(set(tempos), {'db', 'tpl', 'email', 'total'})
+        self.assertGreater(tempos['tpl'], 0)
+        self.assertGreaterEqual(tempos['total'], tempos['db'] + tempos['tpl'])
+        consultas = int(re.search(r'desc="(\d+) consultas"', resp['Server-Timing']).group(1))
+        self.assertGreater(consultas, 0)
+
+    def test_server_timing_desligado_por_padrao(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('evento-list')))
+
+    @override_settings(PERF_LENTA_MS=0)
+    def test_requisicao_lenta_vai_para_o_log_com_o_sql(self):
+        with self.assertLogs('eventos.perf', 'WARNING') as logs:
+            self.client.get(reverse('evento-list'))
+        self.assertIn('Requisição lenta: GET / (evento-list)', logs.output[0])
+        self.assertIn('"eventos_evento"', logs.output[0])
+
+    def test_sql_repetido_e_agrupado(self):
+        medicao = perf.Medicao()
+        for _ in range(3):
+            medicao.registrar_sql('SELECT 1', 0.001)
+        medicao.registrar_sql('SELECT 2', 0.01)
+        self.assertEqual(
+            [(sql, vezes) for sql, vezes, _ in medicao.consultas_mais_caras()],
+            [('SELECT 2', 1), ('SELECT 1', 3)],
+        )
+
+    def test_cronometro_de_email(self):
+        enfileirar_email("Assunto", "Corpo", ['ana@example.com'])
+        medicao = perf.Medicao()
+        token = perf._medicao.set(medicao)
+        try:
+            processar_fila()
+        finally:
+            perf._medicao.reset(token)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertGreater(medicao.email, 0)
+
+    def test_cronometro_aninhado_conta_uma_vez(self):
+        medicao = perf.Medicao()
+        token = perf._medicao.set(medicao)
+        try:
+            with perf.cronometro('templates'):
+                with perf.cronometro('templates'):
+                    pass
+                externo = medicao.templates
+        finally:
+            perf._medicao.reset(token)
+        self.assertEqual(externo, 0)
+        self.assertGreater(medicao.templates, 0)
+
+    @override_settings(PERF_METRICAS_TOKEN='segredo')
+    def test_metricas_por_rota(self):
+        self.client.get(reverse('evento-list'))
+        self.client.get(reverse('evento-list'))
+        self.client.get('/nao-existe/')
+
+        resp = self.client.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(resp['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        texto = resp.content.decode()
+        self.assertIn('# TYPE eventos_requisicao_segundos histogram', texto)
+        self.assertIn('eventos_requisicao_segundos_bucket{rota="evento-list",metodo="GET",le="+Inf"} 2', texto)
+        self.assertIn('eventos_requisicao_segundos_count{rota="evento-list",metodo="GET"} 2', texto)
+        self.assertIn('rota="nao_encontrada"', texto)
+        self.assertRegex(texto, r'eventos_requisicao_consultas_sql_total\{rota="evento-list",metodo="GET"\} [1-9]')
+
+    @override_settings(PERF_METRICAS_TOKEN='segredo')
+    def test_metricas_com_token(self):
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 401)
+        resp = self.client.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_metricas_sem_token_configurado(self):
+        self.assertEqual(self.client.get(reverse('metricas')).status_code, 404)
+        self.assertEqual(self.client.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer ').status_code, 404)
+
+    @override_settings(PERF_METRICAS_TOKEN='segredo')
+    def test_metodo_desconhecido_nao_cria_serie(self):
+        self.client.generic('XPTO', reverse('evento-list'))
+        self.client.generic('BREW', reverse('evento-list'))
+        texto = self.client.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer segredo').content.decode()
+        self.assertIn('eventos_requisicao_segundos_count{rota="evento-list",metodo="OUTRO"} 2', texto)
+        self.assertNotIn('XPTO', texto)
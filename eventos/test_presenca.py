@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.checkin import registrar_check_in, registrar_lote
+from eventos.ingressos import ler_token
+from eventos.models import Evento, Inscricao, Participante
+from eventos.presenca import hash_nome, montar_lista
+
+
+def ler(resp):
+    return json.loads(gzip.decompress(resp.content))
+
+
+@override_settings(PRESENCA_JANELA_SEGUNDOS=0)
+class ListaPresencaTests(TestCase):
+    def setUp(self):
+        self.evento = Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now(), local="Auditório",
+            descricao="Tema", capacidade=10,
+        )
+        self.ontem = timezone.now() - timedelta(days=1)
+        self.inscricoes = [self.inscrever(n, self.ontem) for n in range(3)]
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        self.url = reverse('evento-presenca', args=[self.evento.pk])
+
+    def inscrever(self, n, quando=None):
+        participante = Participante.objects.create(nome=f"Pessoa {n}", email=f"p{n}@example.com", telefone="1")
+        return Inscricao.objects.create(
+            evento=self.evento, participante=participante, data_inscricao=quando or timezone.now()
+        )
+
+    def test_lista_completa_compactada(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        dados = ler(resp)
+        self.assertEqual(dados['campos'], ['inscricao', 'participante', 'nome_hash', 'token', 'check_in_em'])
+        linhas = {linha[0]: linha for linha in dados['linhas']}
+        self.assertEqual(set(linhas), {i.pk for i in self.inscricoes})
+        primeira = linhas[self.inscricoes[0].pk]
+        self.assertEqual(ler_token(primeira[3]), (self.inscricoes[0].pk, self.evento.pk))
+        self.assertEqual(primeira[2], hash_nome("  pessoa   0 "))
+        self.assertNotIn("Pessoa 0", gzip.decompress(resp.content).decode())
+
+    def test_delta_traz_novas_inscricoes_e_check_ins(self):
+        versao = montar_lista(self.evento.pk)['versao']
+        nova = self.inscrever(9)
+        registrar_check_in(self.evento.pk, self.inscricoes[1].token)
+
+        dados = ler(self.client.get(self.url, {'desde': versao}))
+        self.assertEqual([linha[0] for linha in dados['linhas']], [self.inscricoes[1].pk, nova.pk])
+        self.assertIsNotNone(dados['linhas'][0][4])
+        self.assertGreater(dados['versao'], versao)
+        self.assertEqual(self.client.get(self.url, {'desde': 'x'}).status_code, 400)
+
+    def test_delta_traz_check_in_offline_sincronizado_depois(self):
+        leitura = timezone.now() - timedelta(hours=3)  # outro leitor passou horas offline
+        versao = montar_lista(self.evento.pk)['versao']
+        registrar_lote(self.evento.pk, [(self.inscricoes[2].token, leitura)])
+
+        dados = ler(self.client.get(self.url, {'desde': versao}))
+        self.assertEqual([linha[0] for linha in dados['linhas']], [self.inscricoes[2].pk])
+        self.assertEqual(dados['linhas'][0][4], leitura.isoformat())
+
+    def test_versao_fora_do_intervalo_devolve_400(self):
+        self.assertEqual(self.client.get(self.url, {'desde': 10 ** 20}).status_code, 400)
+        resp = self.client.post(
+            reverse('evento-presenca-sincronizar', args=[self.evento.pk]),
+            json.dumps({'desde': -10 ** 20, 'leituras': []}), content_type='application/json',
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_sincronizar_envia_check_ins_e_recebe_delta(self):
+        versao = montar_lista(self.evento.pk)['versao']
+        nova = self.inscrever(9)
+        corpo = gzip.compress(json.dumps({'desde': versao, 'leituras': [
+            {'token': self.inscricoes[0].token, 'momento': timezone.now().isoformat()},
+            {'token': 'lixo'},
+        ]}).encode())
+        resp = self.client.post(
+            reverse('evento-presenca-sincronizar', args=[self.evento.pk]), corpo,
+            content_type='application/json', HTTP_CONTENT_ENCODING='gzip',
+        )
+        dados = ler(resp)
+        self.assertEqual([r['status'] for r in dados['resultados']], ['ok', 'invalido'])
+        self.assertEqual({linha[0] for linha in dados['linhas']}, {self.inscricoes[0].pk, nova.pk})
+        self.assertIsNotNone(Inscricao.objects.get(pk=self.inscricoes[0].pk).check_in_em)
+
+    def test_exige_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
@@ -0,0 +1,250 @@
+import json
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos import urls
+from eventos.exportacao import processar_exportacoes, solicitar_exportacao
+from eventos.models import Comunicado, Evento, Inscricao, Participante
+from eventos.paginacao import codificar_cursor
+from eventos.testing import OrcamentoConsultasMixin, consumir, orcamento_consultas
+
+User = get_user_model()
+
+
+class OrcamentoConsultasViewsTests(OrcamentoConsultasMixin, TestCase):
+    """
+    Cada rota de eventos/urls.py tem um teste `test_<nome_da_rota>` com orçamento
+    de consultas; o número de consultas não pode crescer com a quantidade de linhas.
+    """
+
+    ROTAS_PUBLICAS = {
+        'test_evento_list',
+        'test_evento_arquivo',
+        'test_evento_inscricao',
+        'test_evento_inscricao_post',
+        'test_ingresso_detail',
+        'test_ingresso_cancelar',
+        'test_login',
+        'test_metricas',
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.raiz = tempfile.mkdtemp()
+        cls.settings_override = override_settings(EXPORTACOES_ROOT=cls.raiz)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.raiz, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='org', password='x')
+        self.evento = self.criar_evento("Evento principal")
+        self.inscricao = Inscricao.objects.create(
+            evento=self.evento, participante=self.criar_participante('base')
+        )
+        self.exportacao = solicitar_exportacao('CSV', evento_id=self.evento.pk)
+        processar_exportacoes()
+        self.exportacao.refresh_from_db()
+        self.assertTrue(self.exportacao.arquivo.path.startswith(self.raiz))
+        self.sequencia = 0
+
+    def criar_evento(self, titulo):
+        return Evento.objects.create(
+            titulo=titulo,
+            tipo="PALESTRA",
+            data=timezone.now() + timezone.timedelta(days=1),
+            local="Auditório",
+            descricao="Descrição",
+            capacidade=1000,
+        )
+
+    def criar_participante(self, sufixo):
+        return Participante.objects.create(
+            nome=f"Participante {sufixo}",
+            email=f"p{sufixo}@example.com",
+            telefone="11999990000",
+            assistencia="NENHUMA",
+        )
+
+    def semear(self, n):
+        # Rotas do organizador: autentica fora da contagem de consultas.
+        if self._testMethodName not in self.ROTAS_PUBLICAS:
+            self.client.force_login(self.user)
+        for i in range(n):
+            self.criar_evento(f"Evento {i}")
+            Inscricao.objects.create(evento=self.evento, participante=self.criar_participante(f"{n}-{i}"))
+            Comunicado.objects.create(evento=self.evento, assunto=f"Aviso {i}", mensagem="Texto")
+
+    def get(self, rota, *args, **params):
+        resp = self.client.get(reverse(rota, args=args), params)
+        consumir(resp)
+        self.assertLess(resp.status_code, 400)
+        return resp
+
+    def post(self, rota, *args, **dados):
+        resp = self.client.post(reverse(rota, args=args), dados)
+        self.assertLess(resp.status_code, 400)
+        return resp
+
+    def post_json(self, rota, *args, **dados):
+        resp = self.client.post(reverse(rota, args=args), json.dumps(dados), content_type='application/json')
+        self.assertLess(resp.status_code, 400)
+        return resp
+
+    def test_todas_as_rotas_tem_orcamento(self):
+        for rota in urls.urlpatterns:
+            metodo = getattr(self, f"test_{rota.name.replace('-', '_')}", None)
+            with self.subTest(rota=rota.name):
+                self.assertIsNotNone(metodo, f"A rota '{rota.name}' não tem teste de orçamento de consultas.")
+                self.assertTrue(hasattr(metodo, 'orcamento_consultas'))
+
+    # Páginas públicas
+
+    @orcamento_consultas(2)
+    def test_evento_list(self):
+        self.get('evento-list')
+
+    @orcamento_consultas(2)
+    def test_evento_arquivo(self):
+        self.get('evento-arquivo')
+
+    @orcamento_consultas(1)
+    def test_evento_inscricao(self):
+        self.get('evento-inscricao', self.evento.pk)
+
+    @orcamento_consultas(16)
+    def test_evento_inscricao_post(self):
+        self.sequencia += 1
+        self.post('evento-inscricao', self.evento.pk, nome='Nova', email=f'nova{self.sequencia}@example.com',
+                  telefone='1', assistencia='NENHUMA')
+
+    @orcamento_consultas(1)
+    def test_ingresso_detail(self):
+        self.get('ingresso-detail', self.inscricao.token)
+
+    @orcamento_consultas(10)
+    def test_ingresso_cancelar(self):
+        self.post('ingresso-cancelar', self.inscricao.token)
+
+    @orcamento_consultas(0)
+    def test_login(self):
+        self.get('login')
+
+    @orcamento_consultas(4)
+    def test_logout(self):
+        self.post('logout')
+
+    # Área do organizador
+
+    @orcamento_consultas(2)
+    def test_evento_create(self):
+        self.get('evento-create')
+
+    @orcamento_consultas(3)
+    def test_evento_update(self):
+        self.get('evento-update', self.evento.pk)
+
+    @orcamento_consultas(3)
+    def test_evento_delete(self):
+        self.get('evento-delete', self.evento.pk)
+
+    @orcamento_consultas(14)
+    def test_evento_delete_post(self):
+        self.post('evento-delete', self.evento.pk)
+
+    @orcamento_consultas(6)
+    def test_evento_inscritos(self):
+        self.get('evento-inscritos', self.evento.pk)
+
+    @orcamento_consultas(6)
+    def test_evento_inscritos_busca(self):
+        self.get('evento-inscritos', self.evento.pk, q='Participante')
+
+    @orcamento_consultas(3)
+    def test_evento_comunicado(self):
+        self.get('evento-comunicado', self.evento.pk)
+
+    @orcamento_consultas(3)
+    def test_evento_importar(self):
+        self.get('evento-importar', self.evento.pk)
+
+    @orcamento_consultas(4)
+    def test_inscricoes_admin(self):
+        self.get('inscricoes-admin')
+
+    @orcamento_consultas(4)
+    def test_inscricoes_admin_filtrada(self):
+        self.get('inscricoes-admin', evento=self.evento.pk, q='Participante')
+
+    @orcamento_consultas(4)
+    def test_inscricoes_admin_cursor(self):
+        self.get('inscricoes-admin', cursor=codificar_cursor(self.inscricao, 'a'))
+
+    @orcamento_consultas(4)
+    def test_evento_inscritos_exportar(self):
+        self.get('evento-inscritos-exportar', self.evento.pk)
+
+    @orcamento_consultas(3)
+    def test_inscricoes_exportar(self):
+        self.get('inscricoes-exportar')
+
+    @orcamento_consultas(7)
+    def test_inscricoes_exportar_job(self):
+        self.post('inscricoes-exportar-job', formato='CSV', evento=self.evento.pk)
+
+    @orcamento_consultas(3)
+    def test_exportacao_detail(self):
+        self.get('exportacao-detail', self.exportacao.pk)
+
+    @orcamento_consultas(3)
+    def test_exportacao_status(self):
+        self.get('exportacao-status', self.exportacao.pk)
+
+    @orcamento_consultas(3)
+    def test_exportacao_baixar(self):
+        self.get('exportacao-baixar', self.exportacao.pk)
+
+    @orcamento_consultas(5)
+    def test_evento_analise(self):
+        self.get('evento-analise', self.evento.pk)
+
+    @orcamento_consultas(3)
+    def test_evento_check_in(self):
+        self.post_json('evento-check-in', self.evento.pk, token=self.inscricao.token)
+
+    @orcamento_consultas(4)
+    def test_evento_check_in_lote(self):
+        self.post_json('evento-check-in-lote', self.evento.pk, leituras=[
+            {'token': self.inscricao.token, 'momento': '2025-08-01T19:03:00-03:00'},
+            {'token': 'invalido', 'momento': None},
+        ])
+
+    @orcamento_consultas(4)
+    def test_evento_presenca(self):
+        self.get('evento-presenca', self.evento.pk)
+
+    @orcamento_consultas(6)
+    def test_evento_presenca_sincronizar(self):
+        self.post_json('evento-presenca-sincronizar', self.evento.pk, desde=0, leituras=[
+            {'token': self.inscricao.token, 'momento': '2025-08-01T19:03:00-03:00'},
+        ])
+
+    @orcamento_consultas(4)
+    def test_dashboard(self):
+        self.get('dashboard')
+
+    @orcamento_consultas(0)
+    @override_settings(PERF_METRICAS_TOKEN='segredo')
+    def test_metricas(self):
+        resp = self.client.get(reverse('metricas'), HTTP_AUTHORIZATION='Bearer segredo')
+        self.assertEqual(resp.status_code, 200)
@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.cache import CHAVE_ALTERADO_EM, marcar_alteracao
+from eventos.models import Evento, Inscricao
+from eventos.replica import RoteadorReplica, _banco, ler_da_replica
+
+
+def banco_de_evento():
+    return Evento.objects.all().db
+
+
+@override_settings(EVENTOS_BANCO_LEITURA='replica', DB_REPLICA_ATRASO=5)
+class RoteadorReplicaTests(TestCase):
+    def setUp(self):
+        cache.set(CHAVE_ALTERADO_EM, timezone.now() - timezone.timedelta(minutes=1), None)
+
+    def test_so_desvia_leituras_de_eventos_dentro_das_views_decoradas(self):
+        self.assertEqual(banco_de_evento(), 'default')
+        self.assertEqual(ler_da_replica(banco_de_evento)(), 'replica')
+        self.assertEqual(ler_da_replica(lambda: User.objects.all().db)(), 'default')
+        self.assertEqual(banco_de_evento(), 'default')
+
+    def test_escritas_vao_para_o_principal(self):
+        roteador = RoteadorReplica()
+        self.assertEqual(roteador.db_for_write(Evento), 'default')
+        self.assertFalse(roteador.allow_migrate('replica', 'eventos'))
+
+    def test_logo_depois_de_uma_alteracao_le_do_principal(self):
+        lista = ler_da_replica(exceto_apos_alteracao=True)(banco_de_evento)
+        marcar_alteracao()
+        self.assertEqual(lista(), 'default')
+        self.assertEqual(ler_da_replica(banco_de_evento)(), 'replica')
+
+        cache.set(CHAVE_ALTERADO_EM, timezone.now() - timezone.timedelta(seconds=6), None)
+        self.assertEqual(lista(), 'replica')
+
+    @override_settings(EVENTOS_BANCO_LEITURA='default')
+    def test_sem_replica_tudo_no_principal(self):
+        self.assertEqual(ler_da_replica(banco_de_evento)(), 'default')
+
+    async def test_views_assincronas(self):
+        @ler_da_replica
+        async def view():
+            return banco_de_evento()
+
+        self.assertEqual(await view(), 'replica')
+        self.assertEqual(banco_de_evento(), 'default')
+
+
+@override_settings(EVENTOS_BANCO_LEITURA='replica')
+class ViewsNaReplicaTests(TestCase):
+    """As consultas rodam no banco de teste; o roteador espião só registra o alias pedido."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        Evento.objects.create(
+            titulo="Palestra", tipo="PALESTRA", data=timezone.now() + timezone.timedelta(days=1),
+            local="Auditório", descricao="Tema", capacidade=10,
+        )
+        cache.clear()
+        cache.set(CHAVE_ALTERADO_EM, timezone.now() - timezone.timedelta(minutes=1), None)
+        self.pedidos = []
+
+        def espiar(roteador, model, **hints):
+            if model._meta.app_label == 'eventos':
+                self.pedidos.append(_banco.get())
+            return None
+
+        espiao = mock.patch.object(RoteadorReplica, 'db_for_read', autospec=True, side_effect=espiar)
+        espiao.start()
+        self.addCleanup(espiao.stop)
+
+    def test_lista_e_dashboard(self):
+        for rota in ('evento-list', 'dashboard'):
+            self.pedidos.clear()
+            with self.subTest(rota=rota):
+                self.assertEqual(self.client.get(reverse(rota)).status_code, 200)
+                self.assertEqual(set(self.pedidos), {'replica'})
+
+    def test_inscricao_continua_no_principal(self):
+        evento = Evento.objects.get()
+        self.client.get(reverse('evento-inscricao', args=[evento.pk]))
+        self.assertEqual(set(self.pedidos), {None})
+
+
+@override_settings(EVENTOS_BANCO_LEITURA='replica')
+class ExportacaoNaReplicaTests(TestCase):
+    def test_exportacao_fixa_o_banco_antes_do_streaming(self):
+        self.client.force_login(User.objects.create_user('org', password='x'))
+        with mock.patch('eventos.exportacao.linhas_inscricoes', return_value=iter([])) as linhas:
+            resp = self.client.get(reverse('inscricoes-exportar'))
+        b''.join(resp.streaming_content)
+        inscricoes = linhas.call_args.args[0]
+        self.assertEqual(inscricoes.model, Inscricao)
+        # Lido fora da view, o queryset continua apontando para a réplica.
+        self.assertEqual(inscricoes.db, 'replica')
@@ -0,0 +1,45 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count, F
+from django.test import TestCase, override_settings
+
+from eventos import estatisticas
+from eventos.models import Evento, Inscricao, Participante
+
+
+class SemearDadosTests(TestCase):
+    def test_comando_cria_dados_consistentes(self):
+        saida = StringIO()
+        call_command('semear_dados', eventos=5, inscricoes=43, passados=0.4, stdout=saida)
+
+        self.assertIn("5 eventos, 9 participantes e 43 inscrições criados.", saida.getvalue())
+        self.assertEqual(Evento.objects.count(), 5)
+        self.assertEqual(Participante.objects.count(), 9)
+        self.assertEqual(Inscricao.objects.count(), 43)
+        # bulk_create não dispara sinais: contador de vagas e estatísticas são reconstruídos.
+        divergentes = Evento.objects.annotate(total=Count('inscricoes')).exclude(vagas_ocupadas=F('total'))
+        self.assertFalse(divergentes.exists())
+        self.assertEqual(estatisticas.resumo()['total_inscricoes'], 43)
+
+    def test_mesma_semente_gera_os_mesmos_dados(self):
+        call_command('semear_dados', eventos=3, inscricoes=10, seed=7, stdout=StringIO())
+        primeira = list(Evento.objects.order_by('pk').values_list('tipo', 'local', 'data__date'))
+        Evento.objects.all().delete()
+        Participante.objects.all().delete()
+
+        call_command('semear_dados', eventos=3, inscricoes=10, seed=7, stdout=StringIO())
+        segunda = list(Evento.objects.order_by('pk').values_list('tipo', 'local', 'data__date'))
+        self.assertEqual(primeira, segunda)
+
+    @override_settings(DEBUG=False)
+    def test_recusa_banco_que_nao_parece_de_teste(self):
+        with mock.patch.dict(connection.settings_dict, {'NAME': 'eventos'}):
+            with self.assertRaisesMessage(CommandError, "--forcar"):
+                call_command('semear_dados', eventos=3, inscricoes=10, stdout=StringIO())
+            self.assertFalse(Evento.objects.exists())
+
+            call_command('semear_dados', eventos=3, inscricoes=10, forcar=True, stdout=StringIO())
+        self.assertEqual(Evento.objects.count(), 3)
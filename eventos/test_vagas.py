@@ -0,0 +1,108 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from eventos.models import Evento, Participante, Inscricao
+from eventos.vagas import EventoEsgotado, InscricaoDuplicada, liberar_vaga, reservar_vaga
+
+
+def criar_evento(capacidade):
+    return Evento.objects.create(
+        titulo="Workshop Concorrido",
+        tipo="WORKSHOP",
+        data=timezone.now(),
+        local="Sala 1",
+        descricao="Vagas limitadas",
+        capacidade=capacidade,
+    )
+
+
+def criar_participante(n):
+    return Participante.objects.create(
+        nome=f"Participante {n}",
+        email=f"p{n}@example.com",
+        telefone="11999990000",
+        assistencia="NENHUMA",
+    )
+
+
+class ReservaVagaTests(TestCase):
+    def setUp(self):
+        self.evento = criar_evento(capacidade=2)
+
+    def test_reserva_incrementa_contador(self):
+        reservar_vaga(self.evento, criar_participante(1))
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+        self.assertEqual(self.evento.vagas_disponiveis, 1)
+
+    def test_evento_esgotado(self):
+        reservar_vaga(self.evento, criar_participante(1))
+        reservar_vaga(self.evento, criar_participante(2))
+        with self.assertRaises(EventoEsgotado):
+            reservar_vaga(self.evento, criar_participante(3))
+        self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 2)
+
+    def test_duplicidade_nao_consome_vaga(self):
+        p = criar_participante(1)
+        reservar_vaga(self.evento, p)
+        with self.assertRaises(InscricaoDuplicada):
+            reservar_vaga(self.evento, p)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+
+    def test_liberar_vaga_devolve_ao_evento(self):
+        inscricao = reservar_vaga(self.evento, criar_participante(1))
+        liberar_vaga(inscricao)
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 0)
+
+    def test_checagem_de_capacidade_em_tempo_constante(self):
+        """A reserva executa o mesmo número de consultas, sem COUNT, com 0 ou 50 inscritos."""
+        evento = criar_evento(capacidade=100)
+        with CaptureQueriesContext(connection) as vazio:
+            reservar_vaga(evento, criar_participante(1000))
+
+        for n in range(50):
+            Inscricao.objects.create(evento=evento, participante=criar_participante(n))
+
+        with CaptureQueriesContext(connection) as cheio:
+            reservar_vaga(evento, criar_participante(1001))
+
+        self.assertEqual(len(vazio), len(cheio))
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in cheio.captured_queries))
+
+
+class ReservaVagaConcorrenteTests(TransactionTestCase):
+    CAPACIDADE = 25
+    TENTATIVAS = 200
+
+    def _inscrever(self, evento, participante):
+        try:
+            while True:
+                try:
+                    reservar_vaga(evento, participante)
+                    return True
+                except EventoEsgotado:
+                    return False
+                except OperationalError:
+                    # SQLite serializa escritores: "database table is locked".
+                    time.sleep(0.001)
+        finally:
+            connection.close()
+
+    def test_rajada_concorrente_nao_vende_alem_da_capacidade(self):
+        evento = criar_evento(capacidade=self.CAPACIDADE)
+        participantes = [criar_participante(n) for n in range(self.TENTATIVAS)]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            resultados = list(pool.map(lambda p: self._inscrever(evento, p), participantes))
+
+        evento.refresh_from_db()
+        self.assertEqual(sum(resultados), self.CAPACIDADE)
+        self.assertEqual(evento.vagas_ocupadas, self.CAPACIDADE)
+        self.assertEqual(Inscricao.objects.filter(evento=evento).count(), self.CAPACIDADE)
@@ -0,0 +1,167 @@
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import include, path, resolve, reverse
+from django.utils import timezone
+
+from eventos import urls, views
+from eventos.emails import processar_fila
+from eventos.models import EmailPendente, Evento, Inscricao, ListaEspera, Participante
+from eventos.testing import OrcamentoConsultasMixin, consumir, orcamento_consultas
+
+# As mesmas rotas de eventos/urls.py com EVENTOS_VIEWS_ASYNC ligado.
+urlpatterns = [path('', include(urls.com_views_assincronas(urls.urlpatterns)))]
+
+
+def criar_evento(titulo="Minicurso Python", capacidade=10, dias=1):
+    return Evento.objects.create(
+        titulo=titulo, tipo="MINICURSO", data=timezone.now() + timezone.timedelta(days=dias),
+        local="Lab 2", descricao="Aulas práticas", capacidade=capacidade,
+    )
+
+
+def dados_inscricao(email='ana@example.com'):
+    return {'nome': 'Ana', 'email': email, 'telefone': '333', 'assistencia': 'NENHUMA', 'assistencia_detalhes': ''}
+
+
+@override_settings(ROOT_URLCONF='eventos.test_views_async')
+class ViewsAssincronasTests(TestCase):
+    def setUp(self):
+        self.evento = criar_evento()
+
+    def test_rotas_usam_as_views_assincronas(self):
+        self.assertIs(resolve(reverse('evento-list')).func, views.evento_list_async)
+        self.assertEqual(resolve(reverse('evento-arquivo')).kwargs, {'arquivo': True})
+        self.assertIs(resolve(reverse('evento-inscricao', args=[1])).func, views.inscricao_async)
+        self.assertIs(resolve(reverse('ingresso-detail', args=['x'])).func, views.ingresso_async)
+        self.assertIs(resolve(reverse('dashboard')).func.view_class, views.DashboardView)
+
+    def test_listagem_pagina_e_filtra(self):
+        for i in range(13):
+            criar_evento(f"Evento {i}", dias=i + 2)
+        criar_evento("Já aconteceu", dias=-3)
+
+        resp = self.client.get(reverse('evento-list'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.context['eventos']), 12)
+        self.assertTrue(resp.context['is_paginated'])
+        self.assertEqual(resp.context['paginator'].count, 14)
+
+        resp = self.client.get(reverse('evento-list'), {'page': 'last'})
+        self.assertEqual(resp.context['page_obj'].number, 2)
+        self.assertEqual(self.client.get(reverse('evento-list'), {'page': 9}).status_code, 404)
+
+        resp = self.client.get(reverse('evento-arquivo'))
+        self.assertEqual([e.titulo for e in resp.context['eventos']], ["Já aconteceu"])
+        self.assertTrue(resp.context['arquivo'])
+
+    def test_listagem_responde_304_com_etag(self):
+        resp = self.client.get(reverse('evento-list'))
+        self.assertIn('ETag', resp)
+        resp = self.client.get(reverse('evento-list'), HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, 304)
+
+    def test_inscricao_enfileira_confirmacao(self):
+        resp = self.client.post(reverse('evento-inscricao', args=[self.evento.pk]), dados_inscricao())
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNotNone(resp.context['inscricao'])
+        self.assertContains(resp, "Inscrição realizada com sucesso")
+        self.assertEqual(EmailPendente.objects.filter(status='PENDENTE').count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        processar_fila()
+        self.assertEqual(mail.outbox[0].to, ['ana@example.com'])
+        self.evento.refresh_from_db()
+        self.assertEqual(self.evento.vagas_ocupadas, 1)
+
+    def test_inscricao_duplicada(self):
+        participante = Participante.objects.create(
+            nome='Ana', email='ana@example.com', telefone='333', assistencia='NENHUMA',
+        )
+        Inscricao.objects.create(evento=self.evento, participante=participante)
+
+        resp = self.client.post(reverse('evento-inscricao', args=[self.evento.pk]), dados_inscricao())
+        self.assertContains(resp, "Você já está inscrito neste evento.")
+        self.assertEqual(Inscricao.objects.count(), 1)
+
+    def test_evento_lotado_vai_para_a_lista_de_espera(self):
+        lotado = criar_evento("Lotado", capacidade=1)
+        self.client.post(reverse('evento-inscricao', args=[lotado.pk]), dados_inscricao('bia@example.com'))
+
+        resp = self.client.post(reverse('evento-inscricao', args=[lotado.pk]), dados_inscricao())
+        self.assertEqual(resp.context['posicao_espera'], 1)
+        self.assertEqual(ListaEspera.objects.filter(evento=lotado).count(), 1)
+
+    def test_formulario_invalido_e_evento_inexistente(self):
+        resp = self.client.post(reverse('evento-inscricao', args=[self.evento.pk]), {'nome': 'Ana'})
+        self.assertContains(resp, "Há erros no formulário.")
+        self.assertEqual(self.client.get(reverse('evento-inscricao', args=[999])).status_code, 404)
+        self.assertEqual(self.client.put(reverse('evento-inscricao', args=[self.evento.pk])).status_code, 405)
+
+    def test_ingresso(self):
+        participante = Participante.objects.create(
+            nome='Ana', email='ana@example.com', telefone='333', assistencia='NENHUMA',
+        )
+        inscricao = Inscricao.objects.create(evento=self.evento, participante=participante)
+
+        resp = self.client.get(reverse('ingresso-detail', args=[inscricao.token]))
+        self.assertContains(resp, "<svg")
+        self.assertEqual(resp.context['inscricao'], inscricao)
+        self.assertEqual(self.client.get(reverse('ingresso-detail', args=['invalido'])).status_code, 404)
+
+        inscricao.delete()
+        self.assertEqual(self.client.get(reverse('ingresso-detail', args=[inscricao.token])).status_code, 404)
+
+    @override_settings(PERF_SERVER_TIMING=True)
+    async def test_pilha_assincrona_com_instrumentacao(self):
+        resp = await self.async_client.get(reverse('evento-list'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('total;dur=', resp['Server-Timing'])
+        self.assertRegex(resp['Server-Timing'], r'desc="[1-9]\d* consultas"')
+
+
+@override_settings(ROOT_URLCONF='eventos.test_views_async')
+class OrcamentoConsultasAsyncTests(OrcamentoConsultasMixin, TestCase):
+    """Os orçamentos das rotas assíncronas são os mesmos das views síncronas (test_query_budget)."""
+
+    def setUp(self):
+        self.evento = criar_evento()
+        self.inscricao = Inscricao.objects.create(
+            evento=self.evento,
+            participante=Participante.objects.create(
+                nome='Base', email='base@example.com', telefone='1', assistencia='NENHUMA',
+            ),
+        )
+        self.sequencia = 0
+
+    def semear(self, n):
+        for i in range(n):
+            criar_evento(f"Evento {i}", dias=i + 2)
+            criar_evento(f"Passado {i}", dias=-i - 1)
+
+    def get(self, rota, *args):
+        resp = self.client.get(reverse(rota, args=args))
+        consumir(resp)
+        self.assertEqual(resp.status_code, 200)
+
+    @orcamento_consultas(2)
+    def test_evento_list(self):
+        self.get('evento-list')
+
+    @orcamento_consultas(2)
+    def test_evento_arquivo(self):
+        self.get('evento-arquivo')
+
+    @orcamento_consultas(1)
+    def test_evento_inscricao(self):
+        self.get('evento-inscricao', self.evento.pk)
+
+    @orcamento_consultas(16)
+    def test_evento_inscricao_post(self):
+        self.sequencia += 1
+        resp = self.client.post(reverse('evento-inscricao', args=[self.evento.pk]),
+                                dados_inscricao(f'nova{self.sequencia}@example.com'))
+        self.assertIsNotNone(resp.context['inscricao'])
+
+    @orcamento_consultas(1)
+    def test_ingresso_detail(self):
+        self.get('ingresso-detail', self.inscricao.token)
@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from eventos.models import Evento
+
+
+class EventoListViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        agora = timezone.now()
+        self.passado = self.criar("Workshop antigo", agora - timezone.timedelta(days=3))
+        for n in range(14):
+            self.criar(f"Próximo {n:02d}", agora + timezone.timedelta(days=n + 1))
+
+    def criar(self, titulo, data, **kwargs):
+        return Evento.objects.create(
+            titulo=titulo, tipo="PALESTRA", data=data, local="Auditório",
+            descricao="Tema", capacidade=10, **kwargs,
+        )
+
+    def test_lista_apenas_proximos_e_pagina(self):
+        resp = self.client.get(reverse('evento-list'))
+        self.assertNotContains(resp, "Workshop antigo")
+        self.assertEqual(len(resp.context['eventos']), 12)
+        self.assertTrue(resp.context['is_paginated'])
+
+        resp = self.client.get(reverse('evento-list'), {'page': 2})
+        self.assertEqual([e.titulo for e in resp.context['eventos']], ["Próximo 12", "Próximo 13"])
+
+    def test_pagina_inexistente(self):
+        self.assertEqual(self.client.get(reverse('evento-list'), {'page': 9}).status_code, 404)
+
+    def test_arquivo_lista_eventos_passados(self):
+        resp = self.client.get(reverse('evento-arquivo'))
+        self.assertContains(resp, "Workshop antigo")
+        self.assertNotContains(resp, "Próximo 00")
+
+    def test_card_usa_miniatura_responsiva(self):
+        self.criar("Com imagem", timezone.now() + timezone.timedelta(hours=1), imagem='eventos/capa.jpg')
+        resp = self.client.get(reverse('evento-list'))
+        self.assertContains(resp, 'loading="lazy"')
+        self.assertContains(resp, 'c_fill,f_auto,g_auto,h_450,q_auto,w_800/v1/eventos/capa.jpg 800w')
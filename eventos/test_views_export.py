@@ -54,7 +54,8 @@ class ExportCsvTests(TestCase):
         resp = self.client.get(url)
         self.assertEqual(resp.status_code, 200)
 
-        content = resp.content.decode('utf-8')
+        self.assertTrue(resp.streaming)
+        content = b''.join(resp.streaming_content).decode('utf-8')
         self.assertIn("Evento,Data/Hora,Participante,Email,Telefone,Observações,Data inscrição", content)
         self.assertIn("Minicurso Python", content)
         self.assertIn("Ana", content)
@@ -71,9 +72,28 @@ class ExportCsvTests(TestCase):
         resp = self.client.get(url, {'evento': self.evento.pk})
         self.assertEqual(resp.status_code, 200)
 
-        content = resp.content.decode('utf-8')
+        self.assertTrue(resp.streaming)
+        content = b''.join(resp.streaming_content).decode('utf-8')
         self.assertIn("Evento,Data/Hora,Participante,Email,Telefone,Observações,Data inscrição", content)
         self.assertIn("Minicurso Python", content)
         self.assertIn("Ana", content)
         self.assertIn("Bruno", content)
         self.assertIn("Precisa de tomada próxima", content)
+
+    def test_exportacao_varios_eventos_formata_cada_evento(self):
+        outro = Evento.objects.create(
+            titulo="Workshop SQL",
+            tipo="WORKSHOP",
+            data=timezone.now(),
+            local="Lab 3",
+            descricao="Consultas",
+            capacidade=10,
+        )
+        Inscricao.objects.create(evento=outro, participante=self.p1)
+
+        resp = self.client.get(reverse('inscricoes-exportar'))
+        linhas = b''.join(resp.streaming_content).decode('utf-8').strip().splitlines()
+
+        self.assertEqual(len(linhas), 4)
+        self.assertEqual(sum('Workshop SQL' in linha for linha in linhas), 1)
+        self.assertEqual(sum('Minicurso Python' in linha for linha in linhas), 2)
@@ -3,7 +3,8 @@ from django.urls import reverse
 from django.utils import timezone
 from django.core import mail
 
-from eventos.models import Evento, Participante, Inscricao
+from eventos.emails import processar_fila
+from eventos.models import Evento, Participante, Inscricao, EmailPendente
 
 
 class InscricaoViewTests(TestCase):
@@ -19,7 +20,7 @@ class InscricaoViewTests(TestCase):
         self.url_inscricao = reverse('evento-inscricao', args=[self.evento.pk])
 
     def test_inscricao_sucesso_envia_email_html_uma_vez(self):
-        """Primeira inscrição deve criar, renderizar página e enviar 1 e-mail (participante)."""
+        """Primeira inscrição deve criar, renderizar página e enfileirar 1 e-mail (participante)."""
         form_data = {
             'nome': 'Ana',
             'email': 'ana@example.com',
@@ -30,9 +31,14 @@ class InscricaoViewTests(TestCase):
         resp = self.client.post(self.url_inscricao, data=form_data, follow=True)
         self.assertEqual(resp.status_code, 200)
 
-        
+        # A requisição apenas enfileira; o envio acontece no worker.
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailPendente.objects.filter(status='PENDENTE').count(), 1)
+
+        processar_fila()
         self.assertEqual(len(mail.outbox), 1)
         self.assertIn('ana@example.com', mail.outbox[0].to)
+        self.assertEqual(mail.outbox[0].alternatives[0][1], 'text/html')
 
         self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 1)
 
@@ -57,4 +63,5 @@ class InscricaoViewTests(TestCase):
 
         self.assertEqual(Inscricao.objects.filter(evento=self.evento).count(), 1)
 
+        self.assertEqual(EmailPendente.objects.count(), 0)
         self.assertEqual(len(mail.outbox), 0)
@@ -0,0 +1,69 @@
+"""
+Utilitários de teste para orçamento de consultas SQL por página.
+
+    class MinhaViewTests(OrcamentoConsultasMixin, TestCase):
+        def semear(self, n):
+            ...  # cria n linhas que a página vai listar
+
+        @orcamento_consultas(6)
+        def test_lista(self):
+            self.client.get(reverse('minha-view'))
+
+O teste decorado roda uma vez para cada quantidade em `linhas`; em cada rodada
+`semear(n)` é chamado antes e as consultas do corpo do teste são contadas. O
+teste falha se alguma rodada passar do orçamento ou se o número de consultas
+mudar com a quantidade de linhas (sinal de N+1).
+"""
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+def _listar_sql(contexto):
+    return '\n'.join(f"  {i}. {q['sql']}" for i, q in enumerate(contexto.captured_queries, 1))
+
+
+def consumir(response):
+    """Lê o corpo da resposta, inclusive de respostas em streaming (que consultam o banco ao iterar)."""
+    if getattr(response, 'streaming', False):
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+def orcamento_consultas(maximo, linhas=(2, 12)):
+    def decorador(teste):
+        @wraps(teste)
+        def wrapper(self, *args, **kwargs):
+            contagens = {}
+            for n in linhas:
+                cache.clear()
+                ponto = transaction.savepoint()
+                try:
+                    self.semear(n)
+                    with CaptureQueriesContext(connection) as contexto:
+                        teste(self, *args, **kwargs)
+                finally:
+                    transaction.savepoint_rollback(ponto)
+                contagens[n] = len(contexto)
+                self.assertLessEqual(
+                    len(contexto), maximo,
+                    f"{teste.__name__}: {len(contexto)} consultas com {n} linhas "
+                    f"(orçamento: {maximo}):\n{_listar_sql(contexto)}",
+                )
+            self.assertEqual(
+                len(set(contagens.values())), 1,
+                f"{teste.__name__}: o número de consultas cresce com as linhas {contagens}",
+            )
+        wrapper.orcamento_consultas = maximo
+        return wrapper
+    return decorador
+
+
+class OrcamentoConsultasMixin:
+    def semear(self, n):
+        """
+        Cria as `n` linhas que a página lista. Por padrão não cria nada: o teste
+        ainda respeita o orçamento, mas sem linhas variando não detecta N+1.
+        """
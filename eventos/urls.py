@@ -1,32 +1,87 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import URLPattern, path
 from django.contrib.auth.views import LoginView, LogoutView
 
 from .views import (
     EventoListView,
+    EventoArquivoView,
     EventoCreateView,
     EventoUpdateView,
     EventoDeleteView,
     InscricaoCreateView,
     IngressoDetailView,
+    cancelar_ingresso,
     ListaInscritosView,
+    ComunicadoCreateView,
+    ImportacaoInscricoesView,
     InscricoesAdminListView,
     exportar_inscritos_evento_csv,
     exportar_inscricoes_csv,
+    exportar_inscricoes_segundo_plano,
+    ExportacaoDetailView,
+    exportacao_status,
+    baixar_exportacao,
+    analise_inscricoes,
+    check_in,
+    check_in_lote,
+    lista_presenca,
+    sincronizar_presenca,
+    metricas,
     DashboardView,
+    evento_list_async,
+    inscricao_async,
+    ingresso_async,
 )
 
 urlpatterns = [
     path('', EventoListView.as_view(), name='evento-list'),
+    path('arquivo/', EventoArquivoView.as_view(), name='evento-arquivo'),
     path('evento/<int:pk>/inscrever/', InscricaoCreateView.as_view(), name='evento-inscricao'),
-    path('ingresso/<int:pk>/', IngressoDetailView.as_view(), name='ingresso-detail'),
+    path('ingresso/<str:token>/', IngressoDetailView.as_view(), name='ingresso-detail'),
+    path('ingresso/<str:token>/cancelar/', cancelar_ingresso, name='ingresso-cancelar'),
     path('novo/', EventoCreateView.as_view(), name='evento-create'),
     path('editar/<int:pk>/', EventoUpdateView.as_view(), name='evento-update'),
     path('<int:pk>/excluir/', EventoDeleteView.as_view(), name='evento-delete'),
     path('login/', LoginView.as_view(template_name='eventos/login.html'), name='login'),
     path('logout/', LogoutView.as_view(next_page='evento-list'), name='logout'),
     path('evento/<int:pk>/inscritos/', ListaInscritosView.as_view(), name='evento-inscritos'),
+    path('evento/<int:pk>/comunicado/', ComunicadoCreateView.as_view(), name='evento-comunicado'),
+    path('evento/<int:pk>/importar/', ImportacaoInscricoesView.as_view(), name='evento-importar'),
     path('inscricoes/', InscricoesAdminListView.as_view(), name='inscricoes-admin'),
     path('evento/<int:pk>/inscritos/exportar/', exportar_inscritos_evento_csv, name='evento-inscritos-exportar'),
     path('inscricoes/exportar/', exportar_inscricoes_csv, name='inscricoes-exportar'),
+    path('inscricoes/exportar/segundo-plano/', exportar_inscricoes_segundo_plano, name='inscricoes-exportar-job'),
+    path('exportacoes/<int:pk>/', ExportacaoDetailView.as_view(), name='exportacao-detail'),
+    path('exportacoes/<int:pk>/status/', exportacao_status, name='exportacao-status'),
+    path('exportacoes/<int:pk>/baixar/', baixar_exportacao, name='exportacao-baixar'),
+    path('evento/<int:pk>/analise/', analise_inscricoes, name='evento-analise'),
+    path('evento/<int:pk>/check-in/', check_in, name='evento-check-in'),
+    path('evento/<int:pk>/check-in/lote/', check_in_lote, name='evento-check-in-lote'),
+    path('evento/<int:pk>/presenca/', lista_presenca, name='evento-presenca'),
+    path('evento/<int:pk>/presenca/sincronizar/', sincronizar_presenca, name='evento-presenca-sincronizar'),
     path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('metrics', metricas, name='metricas'),
 ]
+
+# Rotas com versão assíncrona (views.py) e os argumentos extras de cada uma.
+ASSINCRONAS = {
+    'evento-list': (evento_list_async, {}),
+    'evento-arquivo': (evento_list_async, {'arquivo': True}),
+    'evento-inscricao': (inscricao_async, {}),
+    'ingresso-detail': (ingresso_async, {}),
+}
+
+
+def com_views_assincronas(padroes):
+    """Troca as views de ASSINCRONAS pelas versões assíncronas, mantendo caminho e nome."""
+    trocados = []
+    for padrao in padroes:
+        if padrao.name in ASSINCRONAS:
+            view, extras = ASSINCRONAS[padrao.name]
+            padrao = URLPattern(padrao.pattern, view, {**padrao.default_args, **extras}, padrao.name)
+        trocados.append(padrao)
+    return trocados
+
+
+if settings.EVENTOS_VIEWS_ASYNC:
+    urlpatterns = com_views_assincronas(urlpatterns)
@@ -0,0 +1,105 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef
+
+from .emails import enfileirar_promocao
+from .models import Evento, Inscricao, ListaEspera
+
+
+class EventoEsgotado(Exception):
+    pass
+
+
+class InscricaoDuplicada(Exception):
+    pass
+
+
+def reservar_vaga(evento, participante, da_espera=False):
+    """
+    Reserva uma vaga no evento e cria a inscrição na mesma transação.
+
+    A checagem de capacidade é um UPDATE condicional sobre o contador
+    `vagas_ocupadas`, então duas requisições concorrentes nunca ocupam a
+    mesma vaga e não há COUNT sobre a tabela de inscrições. Enquanto o evento
+    tiver lista de espera, a vaga liberada é da fila: só promover_da_espera()
+    (`da_espera=True`) a ocupa, e a inscrição direta recebe EventoEsgotado.
+    """
+    disponivel = Evento.objects.filter(pk=evento.pk, vagas_ocupadas__lt=F('capacidade'))
+    if not da_espera:
+        disponivel = disponivel.exclude(Exists(ListaEspera.objects.filter(evento_id=OuterRef('pk'))))
+    with transaction.atomic():
+        reservadas = disponivel.update(vagas_ocupadas=F('vagas_ocupadas') + 1)
+        if not reservadas:
+            raise EventoEsgotado()
+
+        inscricao = Inscricao(evento=evento, participante=participante)
+        inscricao._vaga_reservada = True
+        try:
+            inscricao.save()
+        except IntegrityError:
+            raise InscricaoDuplicada()
+
+    return inscricao
+
+
+def liberar_vaga(inscricao):
+    """Exclui a inscrição; o sinal de post_delete devolve a vaga ao evento."""
+    with transaction.atomic():
+        inscricao.delete()
+
+
+def cancelar_inscricao(inscricao_id):
+    """
+    Cancelamento pelo próprio participante. A linha da inscrição é travada antes
+    da exclusão, então dois cancelamentos simultâneos não devolvem a vaga duas
+    vezes: o segundo não a encontra e recebe None.
+    """
+    with transaction.atomic():
+        inscricao = (
+            Inscricao.objects.select_for_update(of=('self',)).select_related('evento', 'participante')
+            .filter(pk=inscricao_id).first()
+        )
+        if inscricao is not None:
+            liberar_vaga(inscricao)
+    return inscricao
+
+
+def entrar_na_espera(evento, participante):
+    """Coloca o participante no fim da lista de espera do evento (ou devolve a entrada existente)."""
+    espera, _ = ListaEspera.objects.get_or_create(evento=evento, participante=participante)
+    return espera
+
+
+def promover_da_espera(evento_id, limite=None):
+    """
+    Converte entradas da lista de espera em inscrições, em ordem de chegada,
+    enquanto houver vaga. Devolve as inscrições criadas.
+
+    Cada promoção é uma transação que trava a linha do evento, então promoções
+    concorrentes (cancelamentos simultâneos) são serializadas por evento e cada
+    uma lê a cabeça atual da fila. A vaga é ocupada por reservar_vaga(), com o
+    mesmo UPDATE condicional da inscrição direta; quem já se inscreveu por
+    outro caminho apenas sai da fila.
+    """
+    promovidas = []
+    while limite is None or len(promovidas) < limite:
+        with transaction.atomic():
+            evento = Evento.objects.select_for_update().filter(pk=evento_id).first()
+            if evento is None or evento.vagas_ocupadas >= evento.capacidade:
+                break
+            espera = (
+                ListaEspera.objects.select_related('participante')
+                .filter(evento_id=evento_id).order_by('data_entrada', 'id').first()
+            )
+            if espera is None:
+                break
+            try:
+                inscricao = reservar_vaga(evento, espera.participante, da_espera=True)
+            except EventoEsgotado:
+                break
+            except InscricaoDuplicada:
+                espera.delete()
+                continue
+            espera.delete()
+            enfileirar_promocao(inscricao)
+        promovidas.append(inscricao)
+    return promovidas
@@ -1,48 +1,150 @@
+from asgiref.sync import sync_to_async
 from django.views import View 
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, FormView, DetailView, TemplateView
 from django.urls import reverse_lazy, reverse
-from django.contrib import messages
-from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
+from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.template.loader import render_to_string
-from django.db.models import Q, Count
-from django.http import HttpResponse
+from django.db import transaction
 from django.contrib.auth.decorators import login_required
-from django.utils.encoding import smart_str
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.utils import timezone
-from urllib.parse import urljoin
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+from django.views.decorators.http import condition, require_http_methods, require_POST
+from datetime import date, datetime, time, timedelta
 import csv
-
-from .models import Evento, Participante, Inscricao
-from .forms import EventoForm, ParticipanteForm
-
-
+import gzip
+import hmac
+import io
+import json
+
+from .models import Evento, Participante, Inscricao, Comunicado, Exportacao, normalizar_email
+from .cache import (
+    aem_cache, alterado_em, anotar_versoes, chave_lista, em_cache, inicio_janela, janela_listagem, versao_evento,
+    versao_listagem,
+)
+from .busca import filtrar_inscricoes, filtrar_por_participante
+from .emails import enfileirar_confirmacao, url_publica
+from .exportacao import resposta_csv, solicitar_exportacao
+from .importacao import importar_inscricoes
+from .paginacao import paginar_por_cursor
+from .presenca import compactar, ler_versao, montar_lista
+from . import estatisticas, imagens, perf
+from .analise import INTERVALOS, serie_inscricoes
+from .forms import EventoForm, ParticipanteForm, ComunicadoForm, ExportacaoForm, ImportacaoForm
+from .checkin import INVALIDO, NAO_ENCONTRADO, registrar_check_in, registrar_lote
+from .ingressos import ler_token, qr_svg
+from .replica import ler_da_replica
+from .vagas import EventoEsgotado, InscricaoDuplicada, cancelar_inscricao, entrar_na_espera, reservar_vaga
+
+
+def filtrar_por_dia(qs, data_str):
+    # Intervalo [00:00, 00:00 do dia seguinte) no fuso local em vez de data__date,
+    # para a consulta usar o índice em Evento.data.
+    try:
+        dia = date.fromisoformat(data_str)
+    except ValueError:
+        return qs.none()
+    inicio = timezone.make_aware(datetime.combine(dia, time.min))
+    return qs.filter(data__gte=inicio, data__lt=inicio + timedelta(days=1))
+
+
+def _etag_evento_list(request, *args, **kwargs):
+    # Só visitantes anônimos: para o organizador a página muda com a sessão.
+    if request.user.is_authenticated:
+        return None
+    return f"{versao_listagem()}-{janela_listagem()}-{request.GET.urlencode()}"
+
+
+def _last_modified_evento_list(request, *args, **kwargs):
+    if request.user.is_authenticated:
+        return None
+    return max(alterado_em(), inicio_janela())
+
+
+def consulta_eventos(request, arquivo=False):
+    agora = timezone.now()
+    if arquivo:
+        qs = Evento.objects.filter(data__lt=agora).order_by('-data')
+    else:
+        qs = Evento.objects.filter(data__gte=agora).order_by('data')
+    data_str = request.GET.get('data')
+    local = request.GET.get('local')
+    if data_str:
+        qs = filtrar_por_dia(qs, data_str)
+    if local:
+        qs = qs.filter(local__icontains=local.strip())
+    return qs
+
+
+def _chave_pagina_eventos(request, arquivo, numero):
+    return chave_lista(
+        'arquivo' if arquivo else 'proximos', request.GET.get('data'), request.GET.get('local'), str(numero or 1),
+    )
+
+
+def _contexto_lista(request, arquivo):
+    return {
+        'f_data': request.GET.get('data', ''),
+        'f_local': request.GET.get('local', ''),
+        'arquivo': arquivo,
+        'cache_segundos': settings.EVENTOS_CACHE_SEGUNDOS,
+    }
+
+
+@method_decorator(condition(etag_func=_etag_evento_list, last_modified_func=_last_modified_evento_list), name='get')
+@method_decorator(ler_da_replica(exceto_apos_alteracao=True), name='get')
 class EventoListView(ListView):
+    """Próximos eventos; os que já aconteceram ficam em EventoArquivoView."""
     model = Evento
     template_name = 'eventos/evento_list.html'
     context_object_name = 'eventos'
+    paginate_by = 12
+    arquivo = False
 
     def get_queryset(self):
-        qs = super().get_queryset().order_by('data')
-        data_str = self.request.GET.get('data')
-        local = self.request.GET.get('local')
-        if data_str:
-            qs = qs.filter(data__date=data_str)
-        if local:
-            qs = qs.filter(local__icontains=local.strip())
-        return qs
+        return consulta_eventos(self.request, self.arquivo)
+
+    def paginate_queryset(self, queryset, page_size):
+        # Cada página (com filtros) fica no cache; o queryset só é avaliado quando ela não está lá.
+        def gerar():
+            paginator, page, itens, _ = super(EventoListView, self).paginate_queryset(queryset, page_size)
+            return {'total': paginator.count, 'numero': page.number, 'itens': list(itens)}
+
+        chave = _chave_pagina_eventos(self.request, self.arquivo, self.request.GET.get(self.page_kwarg))
+        pagina = em_cache(chave, gerar)
+        paginator = self.get_paginator(range(pagina['total']), page_size)
+        page = Page(anotar_versoes(pagina['itens']), pagina['numero'], paginator)
+        return paginator, page, page.object_list, page.has_other_pages()
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx['f_data'] = self.request.GET.get('data', '')
-        ctx['f_local'] = self.request.GET.get('local', '')
+        ctx.update(_contexto_lista(self.request, self.arquivo))
         return ctx
 
 
-class EventoCreateView(LoginRequiredMixin, CreateView):
+class EventoArquivoView(EventoListView):
+    arquivo = True
+
+
+class ImagemEventoMixin:
+    """Depois de salvar o evento, entrega a imagem ao pipeline em vez de enviá-la durante a requisição."""
+
+    def form_valid(self, form):
+        resposta = super().form_valid(form)
+        if form.cleaned_data.get('imagem'):
+            imagens.receber_upload(self.object, form.cleaned_data['imagem'])
+        elif form.cleaned_data.get('remover_imagem'):
+            imagens.remover_imagem(self.object)
+        return resposta
+
+
+class EventoCreateView(LoginRequiredMixin, ImagemEventoMixin, CreateView):
     model = Evento
     form_class = EventoForm
     template_name = 'eventos/evento_form.html'
@@ -54,7 +156,7 @@ class EventoCreateView(LoginRequiredMixin, CreateView):
         return super().form_invalid(form)
 
 
-class EventoUpdateView(LoginRequiredMixin, UpdateView):
+class EventoUpdateView(LoginRequiredMixin, ImagemEventoMixin, UpdateView):
     model = Evento
     form_class = EventoForm
     template_name = 'eventos/evento_form.html'
@@ -73,6 +175,53 @@ class EventoDeleteView(LoginRequiredMixin, DeleteView):
     login_url = 'login'
 
 
+def inscrever(request, evento, cd):
+    """
+    Grava (ou atualiza) o participante e reserva a vaga numa transação; com o
+    evento esgotado, coloca-o na lista de espera. Devolve (inscricao, posicao_espera),
+    com um dos dois None. Levanta InscricaoDuplicada se já estiver inscrito.
+    """
+    email = (cd.get('email') or '').strip()
+    email_normalizado = normalizar_email(email)
+
+    if Inscricao.objects.filter(evento=evento, participante__email_normalizado=email_normalizado).exists():
+        raise InscricaoDuplicada()
+
+    dados = {
+        'nome': cd.get('nome'),
+        'telefone': cd.get('telefone'),
+        'assistencia': cd.get('assistencia'),
+        'assistencia_detalhes': cd.get('assistencia_detalhes'),
+    }
+    with transaction.atomic():
+        participante, criado = Participante.objects.get_or_create(
+            email_normalizado=email_normalizado, defaults={'email': email, **dados},
+        )
+        if not criado:
+            for campo, valor in dados.items():
+                setattr(participante, campo, valor)
+            participante.save()
+
+        try:
+            inscricao = reservar_vaga(evento, participante)
+        except EventoEsgotado:
+            # O participante continua gravado; só a vaga não foi reservada.
+            espera = entrar_na_espera(evento, participante)
+        else:
+            url_ingresso = url_publica(reverse('ingresso-detail', args=[inscricao.token]), request)
+            enfileirar_confirmacao(inscricao, url_ingresso)
+            return inscricao, None
+
+    return None, espera.posicao()
+
+
+def _mensagem_inscricao(request, posicao_espera):
+    if posicao_espera is not None:
+        messages.warning(request, "Evento esgotado. Você entrou na lista de espera.")
+    else:
+        messages.success(request, "Inscrição realizada com sucesso! Verifique seu e-mail.")
+
+
 class InscricaoCreateView(FormView):
     template_name = 'eventos/inscricao_form.html'
     form_class = ParticipanteForm
@@ -86,66 +235,12 @@ class InscricaoCreateView(FormView):
         return super().form_invalid(form)
 
     def form_valid(self, form):
-        cd = form.cleaned_data
-        email = (cd.get('email') or '').strip()
-
-        if Inscricao.objects.filter(evento=self.evento, participante__email__iexact=email).exists():
+        try:
+            self.inscricao, self.posicao_espera = inscrever(self.request, self.evento, form.cleaned_data)
+        except InscricaoDuplicada:
             messages.warning(self.request, "Você já está inscrito neste evento.")
-            return self.render_to_response(self.get_context_data(form=form))
-
-        if self.evento.inscricoes.count() >= self.evento.capacidade:
-            messages.error(self.request, "Evento esgotado.")
-            return self.render_to_response(self.get_context_data(form=form))
-
-        participante = Participante.objects.filter(email__iexact=email).first()
-        if not participante:
-            participante = Participante(email=email)
-
-        participante.nome = cd.get('nome')
-        participante.telefone = cd.get('telefone')
-        participante.assistencia = cd.get('assistencia')
-        participante.assistencia_detalhes = cd.get('assistencia_detalhes')
-        participante.save()
-
-        inscricao = Inscricao.objects.create(evento=self.evento, participante=participante)
-
-        ingresso_path = reverse('ingresso-detail', args=[inscricao.pk])
-
-        base_url = (getattr(settings, 'PUBLIC_APP_URL', '') or '').strip()
-        if base_url:
-            base = base_url.rstrip('/') + '/'
         else:
-            base = self.request.build_absolute_uri('/')
-
-        url_ingresso = urljoin(base, ingresso_path.lstrip('/'))
-
-        contexto_email = {
-            'inscricao': inscricao,
-            'evento': self.evento,
-            'url_ingresso': url_ingresso,
-        }
-        html_content = render_to_string('eventos/ingresso_email.html', contexto_email)
-
-        email_msg = EmailMultiAlternatives(
-            subject=f'Confirmação de Inscrição: {self.evento.titulo}',
-            body="Sua inscrição foi confirmada.",
-            from_email=settings.EMAIL_HOST_USER,
-            to=[participante.email],
-        )
-        email_msg.attach_alternative(html_content, "text/html")
-        email_msg.send()
-
-        if getattr(settings, 'SEND_ORGANIZER_EMAIL', False):
-            send_mail(
-                subject='Nova Inscrição Recebida',
-                message=f'{participante.nome} se inscreveu no evento "{self.evento.titulo}".',
-                from_email=settings.EMAIL_HOST_USER,
-                recipient_list=[settings.EMAIL_HOST_USER],
-                fail_silently=False,
-            )
-
-        messages.success(self.request, "Inscrição realizada com sucesso! Verifique seu e-mail.")
-        self.inscricao = inscricao
+            _mensagem_inscricao(self.request, self.posicao_espera)
         return self.render_to_response(self.get_context_data(form=form))
 
     def get_success_url(self):
@@ -155,14 +250,152 @@ class InscricaoCreateView(FormView):
         context = super().get_context_data(**kwargs)
         context['evento'] = self.evento
         context['inscricao'] = getattr(self, 'inscricao', None)
+        context['posicao_espera'] = getattr(self, 'posicao_espera', None)
         return context
 
 
+def _chave_ingresso(inscricao_id, evento_id):
+    return f'eventos:ingresso:{inscricao_id}:{versao_evento(evento_id)}'
+
+
 class IngressoDetailView(DetailView):
+    """
+    Ingresso pelo token assinado. A inscrição (com evento e participante) fica
+    no cache por token, na versão do evento; cancelar ou alterar o evento muda
+    a versão, e um token inválido é recusado antes de qualquer consulta.
+    """
     model = Inscricao
     template_name = 'eventos/ingresso.html'
     context_object_name = 'inscricao'
 
+    def get_object(self, queryset=None):
+        ids = ler_token(self.kwargs['token'])
+        if ids is None:
+            raise Http404("Ingresso não encontrado.")
+        inscricao_id, evento_id = ids
+
+        def carregar():
+            inscricao = (
+                Inscricao.objects.select_related('evento', 'participante')
+                .filter(pk=inscricao_id, evento_id=evento_id).first()
+            )
+            if inscricao is None:
+                raise Http404("Ingresso não encontrado.")
+            return inscricao
+
+        return em_cache(_chave_ingresso(inscricao_id, evento_id), carregar)
+
+    def get_context_data(self, **kwargs):
+        ctx = super().get_context_data(**kwargs)
+        ctx['qr_svg'] = mark_safe(qr_svg(self.kwargs['token']))
+        return ctx
+
+
+@require_POST
+def cancelar_ingresso(request, token):
+    ids = ler_token(token)
+    if ids is None:
+        raise Http404("Ingresso não encontrado.")
+    inscricao = cancelar_inscricao(ids[0])
+    if inscricao is None:
+        raise Http404("Ingresso não encontrado.")
+    messages.success(request, f"Inscrição em {inscricao.evento.titulo} cancelada. A vaga foi liberada.")
+    return redirect('evento-list')
+
+
+# Versões assíncronas das páginas públicas mais acessadas. Sob ASGI (config/asgi.py)
+# eventos/urls.py as usa no lugar das views acima, com os mesmos nomes de rota.
+# O ORM assíncrono não tem transações, então a reserva da vaga roda em
+# sync_to_async(inscrever); templates também são renderizados fora do event loop,
+# porque o context processor de mensagens pode ler a sessão no banco.
+
+_render_async = sync_to_async(render)
+
+
+@ler_da_replica(exceto_apos_alteracao=True)
+async def evento_list_async(request, arquivo=False):
+    # Resolve o usuário sem bloquear; o ETag e o template leem request.user.
+    request.user = await request.auser()
+    return await _pagina_eventos_async(request, arquivo=arquivo)
+
+
+@condition(etag_func=_etag_evento_list, last_modified_func=_last_modified_evento_list)
+async def _pagina_eventos_async(request, arquivo=False):
+    por_pagina = EventoListView.paginate_by
+    numero = request.GET.get('page')
+
+    async def gerar():
+        qs = consulta_eventos(request, arquivo)
+        paginator = Paginator(range(await qs.acount()), por_pagina)
+        try:
+            page = paginator.page(paginator.num_pages if numero == 'last' else numero or 1)
+        except InvalidPage as erro:
+            raise Http404(f"Página inválida ({erro}).")
+        inicio = (page.number - 1) * por_pagina
+        itens = [evento async for evento in qs[inicio:inicio + por_pagina]]
+        return {'total': paginator.count, 'numero': page.number, 'itens': itens}
+
+    pagina = await aem_cache(_chave_pagina_eventos(request, arquivo, numero), gerar)
+    paginator = Paginator(range(pagina['total']), por_pagina)
+    page = Page(anotar_versoes(pagina['itens']), pagina['numero'], paginator)
+    contexto = {
+        'paginator': paginator,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'object_list': page.object_list,
+        'eventos': page.object_list,
+        **_contexto_lista(request, arquivo),
+    }
+    return await _render_async(request, 'eventos/evento_list.html', contexto)
+
+
+@require_http_methods(['GET', 'POST'])
+async def inscricao_async(request, pk):
+    try:
+        evento = await Evento.objects.aget(pk=pk)
+    except Evento.DoesNotExist:
+        raise Http404("Evento não encontrado.")
+
+    inscricao = posicao_espera = None
+    if request.method == 'POST':
+        form = ParticipanteForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, "Há erros no formulário. Verifique os campos e tente novamente.")
+        else:
+            try:
+                inscricao, posicao_espera = await sync_to_async(inscrever)(request, evento, form.cleaned_data)
+            except InscricaoDuplicada:
+                messages.warning(request, "Você já está inscrito neste evento.")
+            else:
+                _mensagem_inscricao(request, posicao_espera)
+    else:
+        form = ParticipanteForm()
+
+    return await _render_async(request, 'eventos/inscricao_form.html', {
+        'form': form, 'evento': evento, 'inscricao': inscricao, 'posicao_espera': posicao_espera,
+    })
+
+
+async def ingresso_async(request, token):
+    ids = ler_token(token)
+    if ids is None:
+        raise Http404("Ingresso não encontrado.")
+    inscricao_id, evento_id = ids
+
+    async def carregar():
+        inscricao = await (
+            Inscricao.objects.select_related('evento', 'participante')
+            .filter(pk=inscricao_id, evento_id=evento_id).afirst()
+        )
+        if inscricao is None:
+            raise Http404("Ingresso não encontrado.")
+        return inscricao
+
+    inscricao = await aem_cache(_chave_ingresso(inscricao_id, evento_id), carregar)
+    return await _render_async(request, 'eventos/ingresso.html', {
+        'inscricao': inscricao, 'object': inscricao, 'qr_svg': mark_safe(qr_svg(token)),
+    })
+
 
 class ListaInscritosView(LoginRequiredMixin, DetailView):
     model = Evento
@@ -173,109 +406,306 @@ class ListaInscritosView(LoginRequiredMixin, DetailView):
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         q = self.request.GET.get('q', '')
-        inscricoes = self.object.inscricoes.select_related('participante').all()
-        if q:
-            inscricoes = inscricoes.filter(
-                Q(participante__nome__icontains=q) |
-                Q(participante__email__icontains=q) |
-                Q(participante__telefone__icontains=q)
-            )
+        inscricoes = filtrar_por_participante(self.object.inscricoes.select_related('participante').all(), q)
         ctx['q'] = q
         ctx['inscricoes'] = inscricoes
+        ctx['comunicados'] = self.object.comunicados.all()[:5]
+        ctx['lista_espera'] = self.object.lista_espera.select_related('participante')
         return ctx
 
 
+class ComunicadoCreateView(LoginRequiredMixin, CreateView):
+    model = Comunicado
+    form_class = ComunicadoForm
+    template_name = 'eventos/comunicado_form.html'
+    login_url = 'login'
+
+    def dispatch(self, request, *args, **kwargs):
+        self.evento = get_object_or_404(Evento, pk=self.kwargs['pk'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        form.instance.evento = self.evento
+        messages.success(self.request, "Comunicado agendado. O envio aos inscritos começará em instantes.")
+        return super().form_valid(form)
+
+    def form_invalid(self, form):
+        messages.error(self.request, "Há erros no formulário. Por favor, corrija os campos destacados.")
+        return super().form_invalid(form)
+
+    def get_success_url(self):
+        return reverse('evento-inscritos', args=[self.evento.pk])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['evento'] = self.evento
+        return context
+
+
+class ImportacaoInscricoesView(LoginRequiredMixin, FormView):
+    form_class = ImportacaoForm
+    template_name = 'eventos/importacao_form.html'
+    login_url = 'login'
+    erros_exibidos = 200
+
+    def dispatch(self, request, *args, **kwargs):
+        self.evento = get_object_or_404(Evento, pk=self.kwargs['pk'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        arquivo = io.TextIOWrapper(form.cleaned_data['arquivo'].file, encoding='utf-8-sig', newline='')
+        try:
+            resultado = importar_inscricoes(self.evento, arquivo)
+        except UnicodeDecodeError:
+            form.add_error('arquivo', "O arquivo deve estar em UTF-8.")
+            return self.form_invalid(form)
+        except csv.Error as exc:
+            form.add_error('arquivo', f"CSV inválido: {exc}.")
+            return self.form_invalid(form)
+        except ValueError as exc:
+            form.add_error('arquivo', str(exc))
+            return self.form_invalid(form)
+        messages.success(
+            self.request,
+            f"{resultado.inscricoes_criadas} inscrição(ões) importada(s) de {resultado.linhas} linha(s).",
+        )
+        self.evento.refresh_from_db()
+        return self.render_to_response(self.get_context_data(form=form, resultado=resultado))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['evento'] = self.evento
+        context['erros_exibidos'] = self.erros_exibidos
+        return context
+
+
 class InscricoesAdminListView(LoginRequiredMixin, ListView):
     model = Inscricao
     template_name = 'eventos/inscricoes_admin_list.html'
     context_object_name = 'inscricoes'
-    paginate_by = 20
+    itens_por_pagina = 20
     login_url = 'login'
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related('evento', 'participante').order_by('-data_inscricao')
-        evento_id = self.request.GET.get('evento')
-        q = self.request.GET.get('q')
-
-        if evento_id:
-            qs = qs.filter(evento_id=evento_id)
-        if q:
-            qs = qs.filter(
-                Q(participante__nome__icontains=q) |
-                Q(participante__email__icontains=q) |
-                Q(participante__telefone__icontains=q)
-            )
-        return qs
+        qs = super().get_queryset().select_related('evento', 'participante')
+        return filtrar_inscricoes(qs, self.request.GET.get('evento'), self.request.GET.get('q'))
 
     def get_context_data(self, **kwargs):
-        ctx = super().get_context_data(**kwargs)
-        ctx['eventos'] = Evento.objects.annotate(total=Count('inscricoes')).order_by('data')
+        # Paginação por cursor: sem COUNT(*) e sem OFFSET (ver eventos/paginacao.py).
+        pagina = paginar_por_cursor(self.object_list, self.request.GET.get('cursor', ''), self.itens_por_pagina)
+        ctx = super().get_context_data(object_list=pagina.itens, **kwargs)
+        ctx['pagina'] = pagina
+        ctx['eventos'] = list(Evento.objects.order_by('data'))
         ctx['selected_evento'] = self.request.GET.get('evento') or ''
         ctx['q'] = self.request.GET.get('q', '')
+        ctx['total'] = self.get_total(ctx['eventos'], ctx['selected_evento'], ctx['q'])
+        ctx['formatos_exportacao'] = Exportacao.FORMATO_CHOICES
         return ctx
 
+    def get_total(self, eventos, evento_id, q):
+        """
+        Total de resultados sem COUNT(*) sempre que possível: sem busca, o
+        contador desnormalizado dos eventos já carregados basta. Com busca, só
+        conta quando pedido (?contar=1).
+        """
+        if q.strip():
+            return self.object_list.count() if self.request.GET.get('contar') else None
+        if evento_id:
+            return next((ev.vagas_ocupadas for ev in eventos if str(ev.pk) == evento_id), 0)
+        return sum(ev.vagas_ocupadas for ev in eventos)
+
 
 @login_required(login_url='login')
+@ler_da_replica
 def exportar_inscritos_evento_csv(request, pk):
     evento = get_object_or_404(Evento, pk=pk)
-    inscricoes = evento.inscricoes.select_related('participante').order_by('data_inscricao')
-
-    response = HttpResponse(content_type='text/csv')
+    inscricoes = evento.inscricoes.order_by('data_inscricao')
     filename = f'inscritos_{evento.titulo}_{evento.data.strftime("%Y%m%d_%H%M")}.csv'
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return resposta_csv(inscricoes, filename)
+
+
+@login_required(login_url='login')
+@ler_da_replica
+def exportar_inscricoes_csv(request):
+    qs = filtrar_inscricoes(
+        Inscricao.objects.order_by('-data_inscricao'), request.GET.get('evento'), request.GET.get('q')
+    )
+    return resposta_csv(qs, 'inscricoes_filtradas.csv')
 
-    writer = csv.writer(response)
-    writer.writerow(['Evento', 'Data/Hora', 'Participante', 'Email', 'Telefone', 'Observações', 'Data inscrição'])
 
-    for ins in inscricoes:
-        p = ins.participante
-        writer.writerow([
-            smart_str(evento.titulo),
-            evento.data.strftime('%d/%m/%Y %H:%M'),
-            smart_str(p.nome),
-            p.email,
-            smart_str(p.telefone),
-            smart_str(getattr(p, 'assistencia_detalhes', '') or ''),
-            ins.data_inscricao.strftime('%d/%m/%Y %H:%M'),
-        ])
+@login_required(login_url='login')
+@require_POST
+def exportar_inscricoes_segundo_plano(request):
+    form = ExportacaoForm(request.POST)
+    if not form.is_valid():
+        return HttpResponseBadRequest("Filtros de exportação inválidos.")
+    evento = form.cleaned_data['evento']
+    exportacao = solicitar_exportacao(
+        form.cleaned_data['formato'],
+        evento_id=evento.pk if evento else None,
+        q=form.cleaned_data['q'],
+        usuario=request.user,
+    )
+    if exportacao.pronta:
+        messages.info(request, "Os dados não mudaram desde a última exportação; o arquivo já está pronto.")
+    return redirect('exportacao-detail', pk=exportacao.pk)
+
+
+class ExportacaoDetailView(LoginRequiredMixin, DetailView):
+    model = Exportacao
+    template_name = 'eventos/exportacao_detail.html'
+    context_object_name = 'exportacao'
+    login_url = 'login'
 
-    return response
+    def get_queryset(self):
+        return super().get_queryset().select_related('evento')
 
 
 @login_required(login_url='login')
-def exportar_inscricoes_csv(request):
-    qs = Inscricao.objects.select_related('evento', 'participante').order_by('-data_inscricao')
-    evento_id = request.GET.get('evento')
-    q = request.GET.get('q')
-
-    if evento_id:
-        qs = qs.filter(evento_id=evento_id)
-    if q:
-        qs = qs.filter(
-            Q(participante__nome__icontains=q) |
-            Q(participante__email__icontains=q) |
-            Q(participante__telefone__icontains=q)
-        )
+def exportacao_status(request, pk):
+    exportacao = get_object_or_404(Exportacao, pk=pk)
+    return JsonResponse({
+        'id': exportacao.pk,
+        'status': exportacao.status,
+        'total_linhas': exportacao.total_linhas,
+        'erro': exportacao.erro,
+        'download': reverse('exportacao-baixar', args=[exportacao.pk]) if exportacao.pronta else None,
+    })
+
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="inscricoes_filtradas.csv"'
+@login_required(login_url='login')
+def baixar_exportacao(request, pk):
+    exportacao = get_object_or_404(Exportacao, pk=pk)
+    if not exportacao.pronta:
+        raise Http404("Exportação ainda não está pronta.")
+    nome = exportacao.arquivo.name.rsplit('/', 1)[-1]
+    return FileResponse(exportacao.arquivo.open('rb'), as_attachment=True, filename=nome)
+
+
+@login_required(login_url='login')
+def analise_inscricoes(request, pk):
+    evento = get_object_or_404(Evento.objects.only('titulo', 'capacidade'), pk=pk)
+    intervalo = request.GET.get('intervalo', 'hora')
+    if intervalo not in INTERVALOS:
+        intervalo = 'hora'
+    return JsonResponse({
+        'evento': evento.titulo,
+        'capacidade': evento.capacidade,
+        'intervalo': intervalo,
+        'pontos': [
+            {'inicio': inicio.isoformat(), 'total': total, 'acumulado': acumulado}
+            for inicio, total, acumulado in serie_inscricoes(evento, intervalo)
+        ],
+    })
+
+
+def _json_check_in(status, inscricao_id, check_in_em):
+    return {
+        'status': status,
+        'inscricao': inscricao_id,
+        'check_in_em': check_in_em.isoformat() if check_in_em else None,
+    }
+
+
+@login_required(login_url='login')
+@require_POST
+def check_in(request, pk):
+    """Marca a presença de um ingresso lido na entrada: {"token": "..."}."""
+    try:
+        token = json.loads(request.body).get('token')
+    except (ValueError, AttributeError):
+        return JsonResponse({'erro': "JSON inválido."}, status=400)
+    status, inscricao_id, check_in_em = registrar_check_in(pk, token)
+    codigo = 404 if status in (INVALIDO, NAO_ENCONTRADO) else 200
+    return JsonResponse(_json_check_in(status, inscricao_id, check_in_em), status=codigo)
+
+
+def _corpo_json(request):
+    """JSON do corpo da requisição; leitores podem enviá-lo compactado (Content-Encoding: gzip)."""
+    corpo = request.body
+    if request.headers.get('Content-Encoding') == 'gzip':
+        try:
+            corpo = gzip.decompress(corpo)
+        except (OSError, EOFError) as erro:
+            raise ValueError(erro)
+    return json.loads(corpo)
+
+
+def _ler_leituras(itens):
+    """[{"token": ..., "momento": ISO 8601 opcional}] -> [(token, datetime ou None)]; ValueError se inválido."""
+    if len(itens) > settings.CHECK_IN_LOTE_MAXIMO:
+        raise ValueError(f"Envie no máximo {settings.CHECK_IN_LOTE_MAXIMO} leituras por lote.")
+    leituras = []
+    for item in itens:
+        momento = parse_datetime(item.get('momento') or '')
+        if momento is not None and not timezone.is_aware(momento):
+            momento = timezone.make_aware(momento)
+        leituras.append((item.get('token'), momento))
+    return leituras
 
-    writer = csv.writer(response)
-    writer.writerow(['Evento', 'Data/Hora', 'Participante', 'Email', 'Telefone', 'Observações', 'Data inscrição'])
 
-    for ins in qs:
-        p = ins.participante
-        writer.writerow([
-            smart_str(ins.evento.titulo),
-            ins.evento.data.strftime('%d/%m/%Y %H:%M'),
-            smart_str(p.nome),
-            p.email,
-            smart_str(p.telefone),
-            smart_str(getattr(p, 'assistencia_detalhes', '') or ''),
-            ins.data_inscricao.strftime('%d/%m/%Y %H:%M'),
-        ])
+@login_required(login_url='login')
+@require_POST
+def check_in_lote(request, pk):
+    """
+    Sincroniza leituras feitas offline:
+    {"leituras": [{"token": "...", "momento": "2025-08-01T19:03:00-03:00"}, ...]}.
+    """
+    try:
+        leituras = _ler_leituras(_corpo_json(request)['leituras'])
+    except (ValueError, KeyError, TypeError, AttributeError) as erro:
+        return JsonResponse({'erro': str(erro) if isinstance(erro, ValueError) else "JSON inválido."}, status=400)
+    resultado = registrar_lote(pk, leituras)
+    return JsonResponse({'resultados': [_json_check_in(*item) for item in resultado]})
+
+
+def _resposta_presenca(dados):
+    resposta = HttpResponse(compactar(dados), content_type='application/json')
+    resposta['Content-Encoding'] = 'gzip'
+    resposta['Cache-Control'] = 'private, no-store'
+    return resposta
+
 
-    return response
+@login_required(login_url='login')
+def lista_presenca(request, pk):
+    """Lista de presença compactada para leitores offline; ?desde=<versão> devolve só o delta."""
+    evento = get_object_or_404(Evento.objects.only('pk'), pk=pk)
+    try:
+        desde = ler_versao(request.GET['desde']) if request.GET.get('desde') else None
+    except ValueError:
+        return JsonResponse({'erro': "Versão inválida."}, status=400)
+    return _resposta_presenca(montar_lista(evento.pk, desde))
+
+
+@login_required(login_url='login')
+@require_POST
+def sincronizar_presenca(request, pk):
+    """
+    Envia os check-ins feitos offline e recebe o delta da lista numa só ida:
+    {"desde": <versão>, "leituras": [{"token": ..., "momento": ...}]}.
+    """
+    evento = get_object_or_404(Evento.objects.only('pk'), pk=pk)
+    try:
+        corpo = _corpo_json(request)
+        desde = ler_versao(corpo['desde']) if corpo.get('desde') is not None else None
+        leituras = _ler_leituras(corpo.get('leituras') or [])
+    except (ValueError, KeyError, TypeError, AttributeError) as erro:
+        return JsonResponse({'erro': str(erro) if isinstance(erro, ValueError) else "JSON inválido."}, status=400)
+    resultado = registrar_lote(evento.pk, leituras)
+    dados = montar_lista(evento.pk, desde)
+    dados['resultados'] = [_json_check_in(*item) for item in resultado]
+    return _resposta_presenca(dados)
+
+
+def metricas(request):
+    """Histogramas de latência por rota no formato texto do Prometheus (eventos.perf)."""
+    token = settings.PERF_METRICAS_TOKEN
+    if not token:
+        # Sem token configurado a rota não existe: expor métricas tem de ser uma escolha explícita.
+        raise Http404
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=401)
+    return HttpResponse(perf.metricas.texto(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 
 class OrganizadorLoginView(LoginView):
@@ -286,18 +716,13 @@ class OrganizadorLogoutView(LogoutView):
     next_page = reverse_lazy('evento-list')
 
 
+@method_decorator(ler_da_replica, name='dispatch')
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = 'eventos/dashboard.html'
     login_url = 'login'
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx['total_eventos'] = Evento.objects.count()
-        ctx['total_inscricoes'] = Inscricao.objects.count()
-        ctx['total_participantes'] = Inscricao.objects.values('participante_id').distinct().count()
-        ctx['proximos_eventos'] = (
-            Evento.objects.filter(data__gte=timezone.now())
-            .annotate(total=Count('inscricoes'))
-            .order_by('data')[:5]
-        )
+        ctx.update(estatisticas.resumo())
+        ctx['proximos_eventos'] = Evento.objects.filter(data__gte=timezone.now()).order_by('data')[:5]
         return ctx